@@ -0,0 +1,69 @@
+"""Benchmark du parsing de dates : dateutil « fuzzy » (ancien) vs utils.dates.
+
+    python -m benchmarks.bench_dates [--n 2000] [--repeat 5]
+
+Le corpus reprend les formats réellement rencontrés : API JSON, valeur stockée
+en base (str(datetime)), flux RSS et page évènement CTFtime.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser
+
+from src.discord_ctftime.utils.dates import _parse_cached, parse_datetime
+
+
+def corpus(n: int) -> list[str]:
+    rnd = random.Random(42)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    out = []
+    for _ in range(n):
+        dt = base + timedelta(hours=rnd.randrange(24 * 365))
+        out.append(rnd.choice([
+            dt.isoformat(),                          # API JSON
+            str(dt),                                 # colonne start en base
+            dt.strftime("%Y%m%dT%H%M%S"),            # flux RSS
+            dt.strftime("%a, %d %b. %Y, %H:%M UTC"),  # page évènement
+        ]))
+    return out
+
+
+def _legacy(raw: str):
+    return parser.parse(raw, dayfirst=True, fuzzy=True)
+
+
+def _bench(label: str, fn, data: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for raw in data:
+            fn(raw)
+    per_call = (time.perf_counter() - start) / (repeat * len(data)) * 1e6
+    print(f"{label:<26} {per_call:9.2f} µs/date")
+    return per_call
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    data = corpus(args.n)
+    before = _bench("dateutil fuzzy", _legacy, data, args.repeat)
+
+    def cold(raw: str):
+        _parse_cached.cache_clear()
+        return parse_datetime(raw)
+
+    fast = _bench("formats exacts (sans cache)", cold, data, 1)
+    _parse_cached.cache_clear()
+    warm = _bench("formats exacts + cache", parse_datetime, data, args.repeat)
+    print(f"gain sans cache x{before / fast:.1f}  •  avec cache x{before / warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Suite de benchmarks d'``Engine`` sur des bases SQLite synthétiques.
+
+    python -m benchmarks.bench_engine [--sizes 1000,100000] [--participants 20]
+                                      [--ops 500] [--out bench_engine.json]
+
+Pour chaque taille, une base est générée (évènements étalés sur ±2 ans,
+*participants* inscrits et autant de « peut-être » par évènement en moyenne), puis
+chaque opération est chronométrée appel par appel. Le résultat (débit, p50,
+p99) est écrit en JSON pour comparer les commits entre eux.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from src.discord_ctftime.event import Engine
+
+NOW = datetime.now(timezone.utc)
+# ids Discord factices (ordre de grandeur réel : 18-19 chiffres)
+USER_BASE = 300_000_000_000_000_000
+BENCH_USER = 900_000_000_000_000_000
+
+
+def generate(db_path: Path, n_events: int, participants: int, seed: int = 42) -> None:
+    """Remplit *db_path* avec *n_events* évènements et ~2×*participants* inscrits chacun."""
+    Engine.DB_PATH = db_path
+    Engine.migrate()
+    rnd = random.Random(seed)
+    span = int(timedelta(days=730).total_seconds())
+
+    events = []
+    for i in range(n_events):
+        start = NOW + timedelta(seconds=rnd.randrange(-span, span))
+        end = start + timedelta(hours=rnd.choice((24, 36, 48)))
+        events.append(
+            Engine._event_params(i, 10_000_000 + i, f"CTF {i}", f"https://ctftime.org/event/{i}",
+                                 start, end, "")
+        )
+
+    with Engine._connection() as conn:
+        conn.executemany(Engine._UPSERT_EVENT, events)
+        for table in (Engine._TABLE_PARTICIPANTS, Engine._TABLE_MAYBE):
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {table} (ctftime_id, user_id) VALUES (?, ?)",
+                (
+                    (str(i), USER_BASE + rnd.randrange(participants * 50))
+                    for i in range(n_events)
+                    for _ in range(rnd.randrange(participants * 2 + 1))
+                ),
+            )
+    Engine.load_index()
+
+
+def measure(fn: Callable[[int], Any], ops: int) -> Dict[str, float]:
+    lat: List[int] = []
+    for i in range(ops):
+        t0 = time.perf_counter_ns()
+        try:
+            fn(i)
+        except LookupError:
+            pass
+        lat.append(time.perf_counter_ns() - t0)
+    lat.sort()
+    total_s = sum(lat) / 1e9
+    return {
+        "n": ops,
+        "ops_per_sec": round(ops / total_s, 1),
+        "p50_us": round(statistics.median(lat) / 1e3, 1),
+        "p99_us": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] / 1e3, 1),
+    }
+
+
+def run_dataset(n_events: int, participants: int, ops: int, tmp: Path) -> List[Dict[str, Any]]:
+    db_path = tmp / f"bench_{n_events}.sqlite"
+    t0 = time.perf_counter()
+    generate(db_path, n_events, participants)
+    gen_s = time.perf_counter() - t0
+
+    with Engine._connection() as conn:
+        n_parts = conn.execute(
+            f"SELECT (SELECT COUNT(*) FROM {Engine._TABLE_PARTICIPANTS}) + "
+            f"(SELECT COUNT(*) FROM {Engine._TABLE_MAYBE})"
+        ).fetchone()[0]
+    print(f"▶ {n_events:,} évènements, {n_parts:,} inscriptions (générés en {gen_s:.1f}s)")
+
+    rnd = random.Random(7)
+    ids = [rnd.randrange(n_events) for _ in range(ops)]
+    msg = [10_000_000 + i for i in ids]
+
+    cases: Dict[str, Callable[[int], Any]] = {
+        "existe": lambda i: Engine.existe(msg[i]),
+        "add_participant": lambda i: Engine.add_participant(msg[i], BENCH_USER + i),
+        "remove_participant": lambda i: Engine.remove_participant(msg[i], BENCH_USER + i),
+        "get_event_info": lambda i: Engine.get_event_info(ids[i]),
+        "next_event": lambda i: Engine.next_event(),
+        "calendar_next_30_days": lambda i: Engine.calendar_next_30_days(),
+        "new_event": lambda i: Engine.new_event(
+            n_events + i, 20_000_000 + n_events + i, f"New {i}", "https://ctftime.org",
+            NOW + timedelta(days=i % 60), NOW + timedelta(days=i % 60, hours=48),
+        ),
+    }
+
+    results = []
+    for name, fn in cases.items():
+        res = {"dataset_events": n_events, "dataset_rows": n_parts, "op": name, **measure(fn, ops)}
+        print(f"  {name:<24} {res['ops_per_sec']:>10,.0f} ops/s  "
+              f"p50 {res['p50_us']:>8.1f} µs  p99 {res['p99_us']:>8.1f} µs")
+        results.append(res)
+
+    Engine.close()
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1000,100000", help="tailles de base (nb d'évènements)")
+    ap.add_argument("--participants", type=int, default=20, help="inscrits moyens par liste et par évènement")
+    ap.add_argument("--ops", type=int, default=500, help="appels chronométrés par opération")
+    ap.add_argument("--out", type=Path, default=Path("bench_engine.json"))
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            r
+            for size in (int(s) for s in args.sizes.split(","))
+            for r in run_dataset(size, args.participants, args.ops, Path(tmp))
+        ]
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "participants": args.participants,
+            "ops": args.ops,
+        },
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, indent=2))
+    print(f"→ {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark : double analyse HTML (ancien solo()+online()) vs extracteur unique.
+
+    python -m benchmarks.bench_extract [--pages DOSSIER] [--runs 200]
+
+``--pages`` pointe vers des pages https://ctftime.org/event/<id> sauvegardées
+(``*.html``) ; sans lui, une page synthétique reprenant la structure CTFtime est utilisée.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.discord_ctftime.ctftime.extract import PARSER, extract_attributes
+
+SOLO_TEXT = "This event is limited to individual participation! No global rating points."
+
+
+def _synthetic_page() -> str:
+    filler = "".join(
+        f'<tr><td>{i}</td><td><a href="/team/{i}">team {i}</a></td><td>{i * 3.7:.2f}</td></tr>'
+        for i in range(400)
+    )
+    return f"""<html><head><title>Sample CTF 2025</title></head><body>
+    <div class="container"><div class="page-header"><h2>Sample CTF 2025</h2></div>
+    <div class="row"><div class="span10">
+      <p>Sat, 04 Oct. 2025, 10:00 UTC &mdash; Sun, 05 Oct. 2025, 10:00 UTC</p>
+      <p><b>On-line</b></p>
+      <p>Format: Jeopardy</p>
+      <p>Official URL: <a href="https://sample.example" rel="nofollow">https://sample.example</a></p>
+      <p>Rating weight: 24.50 &nbsp;</p>
+      <p>Event organizers</p>
+    </div></div>
+    <table class="table">{filler}</table>
+    </div></body></html>"""
+
+
+def _legacy(html: str) -> tuple[bool, bool]:
+    # reproduit CTFtime.solo() puis CTFtime.online() : deux analyses complètes
+    def scan(target: str) -> bool:
+        soup = BeautifulSoup(html, "html.parser")
+        for p in soup.find_all("p"):
+            b = p.find("b")
+            if b and target in b.get_text(strip=True):
+                return True
+        return False
+
+    return scan(SOLO_TEXT), scan("On-line")
+
+
+def _bench(label: str, fn, pages: list[str], runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        for html in pages:
+            fn(html)
+    per_page = (time.perf_counter() - start) / (runs * len(pages)) * 1e3
+    print(f"{label:<28} {per_page:8.3f} ms/page")
+    return per_page
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=Path)
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = [p.read_text(encoding="utf-8") for p in sorted(args.pages.glob("*.html"))]
+    else:
+        pages = [_synthetic_page()]
+    if not pages:
+        raise SystemExit("Aucune page *.html trouvée.")
+
+    before = _bench("avant (2 x html.parser)", _legacy, pages, args.runs)
+    after = _bench(f"extracteur ({PARSER})", extract_attributes, pages, args.runs)
+    print(f"gain                         x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark : connexion SQLite par appel (ancien comportement) vs pool.
+
+Lancement depuis la racine du dépôt :
+
+    python -m benchmarks.bench_pool [--ops 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.discord_ctftime.event import Engine
+
+
+def _legacy_connection(db_path: Path) -> sqlite3.Connection:
+    # reproduit l'ancien Engine._connection : une connexion neuve à chaque appel
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _run(label: str, connect, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        with connect() as conn:
+            conn.execute(
+                "SELECT 1 FROM events WHERE ctftime_id = ? OR msg_id = ? LIMIT 1",
+                (str(i % 100), str(i % 100)),
+            ).fetchone()
+        with connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO participants (ctftime_id, user_id) VALUES (?, ?)",
+                (str(i % 100), i),
+            )
+            conn.commit()
+    elapsed = time.perf_counter() - start
+    rate = 2 * ops / elapsed
+    print(f"{label:<12} {rate:>12,.0f} ops/s  ({elapsed:.2f}s)")
+    return rate
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--ops", type=int, default=5000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Engine.DB_PATH = Path(tmp) / "bench.sqlite"
+        Engine.migrate()
+        for i in range(100):
+            Engine.new_event(i, 10_000 + i, f"CTF {i}", "https://ctftime.org")
+
+        before = _run("avant", lambda: _legacy_connection(Engine.DB_PATH), args.ops)
+        after = _run("pool", lambda: Engine._connection(), args.ops)
+        Engine.close()
+
+    print(f"gain         x{after / before:.1f}")
+
+
+if __name__ == "__main__":
+    main()
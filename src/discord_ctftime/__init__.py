@@ -0,0 +1,5 @@
+# Chargement unique du fichier .env, avant que les modules ne lisent leurs
+# constantes (os.getenv au niveau module). Ne fait rien si .env est absent.
+from dotenv import load_dotenv
+
+load_dotenv()
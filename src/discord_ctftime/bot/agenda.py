@@ -0,0 +1,132 @@
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import discord
+from discord import Colour, Embed
+
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.utils.dates import TZ_PARIS
+
+import os
+AGENDA_PAGE_SIZE = 10
+AGENDA_PAGE_CACHE = 5                                              # pages gardées par vue
+AGENDA_TIMEOUT = float(os.getenv("AGENDA_TIMEOUT", 300))            # secondes sans clic
+
+Cursor = Tuple[int, str]            # (start_ts, ctftime_id) du dernier évènement vu
+
+
+class AgendaView(discord.ui.View):
+    """Agenda paginé (◀️ / ▶️), chargé page par page à la demande.
+
+    Chaque page est lue par clé (``Engine.agenda_page``) depuis le curseur
+    de fin de la page précédente ; la vue ne garde que les curseurs de
+    début de page et les ``AGENDA_PAGE_CACHE`` dernières pages consultées.
+    Au bout de ``timeout`` secondes sans clic, les boutons sont désactivés.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        span_days: int = 30,
+        *,
+        author_id: int | None = None,
+        now: datetime | None = None,
+        page_size: int = AGENDA_PAGE_SIZE,
+        timeout: float = AGENDA_TIMEOUT,
+    ):
+        super().__init__(timeout=timeout)
+        now = now or datetime.now(tz=TZ_PARIS)
+        self.engine = engine
+        self.span_days = span_days
+        self.author_id = author_id
+        self.page_size = page_size
+        self.until_ts = int((now + timedelta(days=span_days)).timestamp())
+        self.message: discord.Message | None = None
+
+        self.index = 0
+        # curseur de départ de chaque page visitée : (start_ts, "") = tout à partir de now
+        self._cursors: List[Cursor] = [(int(now.timestamp()), "")]
+        self._pages: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._has_next: Dict[int, bool] = {}
+
+    # ------------------------------------------------------------------ données
+    async def _page(self, index: int) -> List[Dict[str, Any]]:
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+
+        # une ligne de plus : sait s'il existe une page suivante sans requête en plus
+        rows = await self.engine.agenda_page(self._cursors[index], self.until_ts, self.page_size + 1)
+        page, self._has_next[index] = rows[: self.page_size], len(rows) > self.page_size
+        if self._has_next[index] and len(self._cursors) == index + 1:
+            last = page[-1]
+            self._cursors.append((last["start_ts"], last["ctftime_id"]))
+
+        self._pages[index] = page
+        if len(self._pages) > AGENDA_PAGE_CACHE:
+            self._pages.popitem(last=False)
+        return page
+
+    # ------------------------------------------------------------------ rendu
+    def _embed(self, page: List[Dict[str, Any]]) -> Embed:
+        embed = Embed(title=f"📅 Calendrier des évènements (≤ {self.span_days} jours)", colour=Colour.blurple())
+        if not page:
+            embed.description = "Aucun évènement avec des inscrits sur cette période."
+            return embed
+
+        for ev in page:
+            ts = ev["start_ts"]
+            when = f"<t:{ts}:f>  •  <t:{ts}:R>"
+            embed.add_field(
+                name=f"**{ev['title']}**",
+                value=(
+                    f"{when}\n"
+                    f"👥 {ev['n_participants']} participant(s)  •  "
+                    f"❔ {ev['n_maybe']} peut-être"
+                ),
+                inline=False,
+            )
+        embed.set_footer(text=f"Page {self.index + 1}")
+        return embed
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = not self._has_next.get(self.index, False)
+
+    async def render(self) -> Embed:
+        """Embed de la page courante (chargée si besoin), boutons à jour."""
+        page = await self._page(self.index)
+        self._update_buttons()
+        return self._embed(page)
+
+    # ------------------------------------------------------------------ boutons
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is None or interaction.user.id == self.author_id:
+            return True
+        await interaction.response.send_message("❌ Cet agenda n'est pas le tien, lance `/agenda`.", ephemeral=True)
+        return False
+
+    async def _go(self, interaction: discord.Interaction, step: int) -> None:
+        self.index = max(0, self.index + step)
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, -1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, +1)
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+        self._pages.clear()
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass                                      # message supprimé ou jeton d'interaction expiré
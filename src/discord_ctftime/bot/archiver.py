@@ -0,0 +1,84 @@
+import asyncio
+from functools import partial
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord.ext import commands, tasks
+
+from src.discord_ctftime.bot.group import delete_group
+from src.discord_ctftime.bot.scheduler import scheduler
+from src.discord_ctftime.event import AsyncEngine
+
+import os
+SERVER_ID           = int(os.getenv("SERVER_ID", 0))
+ARCHIVE_AFTER_DAYS  = int(os.getenv("ARCHIVE_AFTER_DAYS", 7))     # jours après la fin du CTF
+ARCHIVE_EVERY       = int(os.getenv("ARCHIVE_EVERY", 6))          # heures
+ARCHIVE_CATEGORY_ID = int(os.getenv("ARCHIVE_CATEGORY_ID", 0))    # 0 = salons supprimés
+
+GC_BATCH = 5            # groupes supprimés par lot (2 appels REST chacun)
+GC_PAUSE = 5.0          # secondes entre deux lots : on reste loin des limites Discord
+GC_PER_RUN = 50         # groupes traités au plus par passage
+
+
+class Archiver(commands.Cog):
+    """Sort les évènements terminés des tables chaudes et supprime leurs
+    rôles / salons Discord par petits lots."""
+
+    def __init__(self, bot: commands.Bot, engine: AsyncEngine):
+        self.bot    = bot
+        self.engine = engine
+        self.archive_loop.start()
+
+    def cog_unload(self):
+        self.archive_loop.cancel()
+
+    @tasks.loop(hours=ARCHIVE_EVERY)
+    async def archive_loop(self):
+        before = datetime.now(timezone.utc) - timedelta(days=ARCHIVE_AFTER_DAYS)
+        try:
+            archived = await self.engine.archive_ended(before)
+        except Exception as exc:
+            print(f"⚠️  Archivage KO : {exc!r}")
+            return
+        if archived:
+            print(f"🗄️ {archived} évènement(s) archivé(s)")
+        await self.clean_groups()
+
+    @archive_loop.before_loop
+    async def _wait_bot(self):
+        await self.bot.wait_until_ready()
+
+    async def clean_groups(self) -> int:
+        """Supprime les groupes des évènements archivés ; les échecs sont retentés au passage suivant."""
+        guild = self.bot.get_guild(SERVER_ID)
+        if guild is None:
+            return 0
+
+        pending = await self.engine.groups_to_clean(GC_PER_RUN)
+        cleaned = 0
+        for i in range(0, len(pending), GC_BATCH):
+            if i:
+                await asyncio.sleep(GC_PAUSE)
+            done = []
+            for ev in pending[i : i + GC_BATCH]:
+                try:
+                    await scheduler.submit(f"guild:{guild.id}", partial(
+                        delete_group, guild, ev["title"], ARCHIVE_CATEGORY_ID, ev["role_id"], ev["channel_id"]
+                    ))
+                except discord.RateLimited:
+                    # attente trop longue : on arrête là et on reprendra plus tard
+                    await self.engine.mark_groups_cleaned(done)
+                    return cleaned + len(done)
+                except discord.HTTPException as exc:
+                    print(f"⚠️  Suppression du groupe {ev['title']!r} KO : {exc!r}")
+                    continue
+                done.append(ev["ctftime_id"])
+            await self.engine.mark_groups_cleaned(done)
+            cleaned += len(done)
+        if cleaned:
+            print(f"🧹 {cleaned} groupe(s) d'évènements terminés supprimé(s)")
+        return cleaned
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Archiver(bot, bot.engine))
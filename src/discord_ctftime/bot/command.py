@@ -5,30 +5,30 @@
 from discord.ext import commands
 from typing import Any, Dict, List
 from functools import partial
+import asyncio
+import re
 
-from src.discord_ctftime.event import Engine
-from src.discord_ctftime.ctftime import CTFtime
-from src.discord_ctftime.utils.utils import _to_datetime
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.ctftime import CTFtime, CircuitOpenError, fetch_many, fetch_one
+from src.discord_ctftime.bot.agenda import AgendaView
 from src.discord_ctftime.bot.group import Group
+from src.discord_ctftime.bot.members import named, resolve_names
+from src.discord_ctftime.bot.scheduler import scheduler
 
 
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
 
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 
 DISCORD_TOKEN  = os.getenv("DISCORD_TOKEN")
-CHANNEL_ID     = int(os.getenv("CHANNEL_ID"))
+CHANNEL_ID     = int(os.getenv("CHANNEL_ID", 0))
 RSS_URL        = os.getenv("RSS_URL")
 CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", 30))
-SERVER_ID = int(os.getenv("SERVER_ID", None))  
+SERVER_ID = int(os.getenv("SERVER_ID", 0))  
 DEEP_EVENT = int(os.getenv("DEEP_EVENT", 15))
-CATE_ID = int(os.getenv("CATEGORY_ID_FOR_CTFCHANNEL", None)) 
+CATE_ID = int(os.getenv("CATEGORY_ID_FOR_CTFCHANNEL", 0)) 
 
 OK_EMOJI = os.getenv("OK_EMOJI")
 MAYBE_EMOJI = os.getenv("MAYBE_EMOJI")
@@ -36,8 +36,6 @@
 
 
 
-engine = Engine()
-
 
 async def _send(target: commands.Context | Interaction, content: str | None = None, **kwargs):
     try:
@@ -54,7 +52,43 @@ async def _send(target: commands.Context | Interaction, content: str | None = No
         print(f"⚠️ Erreur HTTP lors de l'envoi du message : {e}")
 
 
-def setup_commands(bot: commands.Bot, engine: Engine, channel:TextChannel) -> None:
+def _event_embed(ctf: CTFtime, event: Any) -> discord.Embed:
+    """Embed d'annonce d'un évènement (réactions d'inscription)."""
+    team_text   = "🚶‍♂️ Individuel" if ctf.solo() else "👥 Équipe"
+    online_text = "🛜 En ligne"     if ctf.online() else "🏘️ Présentiel"
+
+    embed = discord.Embed(
+        title=f"🔒 {event.title}",
+        url=event.url,
+        description=(
+            f"{OK_EMOJI} **Je participe**   •   {MAYBE_EMOJI} **Peut-être**\n"
+            "—\n"
+            "Clique sur une réaction pour t’inscrire !"
+        ),
+        colour=discord.Colour.blurple(),
+    )
+
+    embed.add_field(name="📆 Début",  value=f"**{event.start}**", inline=True)
+    embed.add_field(name="⏰ Fin",    value=f"**{event.finish}**", inline=True)
+    embed.add_field(name="\u200b",   value="\u200b",              inline=True)
+    embed.add_field(name="🏅 Weight", value=f"**{event.weight}** pts", inline=True)
+    embed.add_field(name="",         value=team_text,             inline=True)
+    embed.add_field(name="",         value=online_text,           inline=True)
+    embed.add_field(
+        name="🗓️ Calendrier",
+        value=f"[Ajouter à mon agenda](https://ctftime.org/event/{event.id}.ics)",
+        inline=False,
+    )
+    embed.set_footer(text=f"ID de l’évènement : {event.id}")
+    return embed
+
+
+def _parse_ids(raw: str) -> List[str]:
+    """« 123, 456 789 » → ["123", "456", "789"] (doublons retirés, ordre conservé)."""
+    return list(dict.fromkeys(t for t in re.split(r"[\s,;]+", raw) if t))
+
+
+def setup_commands(bot: commands.Bot, engine: AsyncEngine, channel: discord.TextChannel) -> None:
 
 
     @bot.hybrid_command(
@@ -125,7 +159,7 @@ async def participants_cmd(ctx: commands.Context, ctftime_id: str):
             await ctx.interaction.response.defer(ephemeral=True)
 
         #try:
-        ev: Dict[str, Any] = engine.get_event_info(ctftime_id)
+        ev: Dict[str, Any] = await engine.get_event_info(ctftime_id)
         #except KeyError:
         #    await _send(ctx, f"❌ Aucun évènement avec l'ID `{ctftime_id}`.", ephemeral=True)
         #    return
@@ -135,14 +169,17 @@ async def participants_cmd(ctx: commands.Context, ctftime_id: str):
             colour=Colour.red(),
         )
 
-        participants = ev.get("participants", [])
+        # pseudos résolus en un lot au moment de l'affichage
+        names = await resolve_names(ctx.guild, ev["participants"] + ev["maybe_participants"])
+
+        participants = named(ev["participants"], names)
         embed.add_field(
             name="👥 Participants",
             value="\n".join(participants) if participants else "Aucun inscrit…",
             inline=False,
         )
 
-        maybe = ev.get("maybe_participants", [])
+        maybe = named(ev["maybe_participants"], names)
         embed.add_field(
             name="❓ Peut-être ?",
             value="\n".join(maybe) if maybe else "X",
@@ -161,7 +198,7 @@ async def participants_cmd(ctx: commands.Context, ctftime_id: str):
     async def next_event_cmd( ctx: commands.Context):
 
         try:
-            ev: Dict[str, Any] = engine.next_event()
+            ev: Dict[str, Any] = await engine.next_event()
         except LookupError as exc:
             await _send(ctx, f"❌ {exc}")
             return
@@ -178,14 +215,17 @@ async def next_event_cmd( ctx: commands.Context):
             inline=False,
         )
 
-        participants = ev.get("participants", [])
+        # pseudos résolus en un lot au moment de l'affichage
+        names = await resolve_names(ctx.guild, ev["participants"] + ev["maybe_participants"])
+
+        participants = named(ev["participants"], names)
         embed.add_field(
             name="👥 Participants",
             value="\n".join(participants) if participants else "Aucun inscrit…",
             inline=False,
         )
 
-        maybe = ev.get("maybe_participants", [])
+        maybe = named(ev["maybe_participants"], names)
         embed.add_field(
             name="❓ Peut-être ?",
             value="\n".join(maybe) if maybe else "X",
@@ -194,11 +234,6 @@ async def next_event_cmd( ctx: commands.Context):
 
         await _send(ctx, embed=embed, ephemeral=True)
 
-    # fonction pour du jolie , du beau, du magnifique 
-    def _chunks(seq: List[Any], n: int) -> List[List[Any]]:
-        return [seq[i : i + n] for i in range(0, len(seq), n)]
-
-
     @bot.hybrid_command(
         name="agenda",
         aliases=["cal", "calendar"],
@@ -206,55 +241,13 @@ def _chunks(seq: List[Any], n: int) -> List[List[Any]]:
         with_app_command=True,
     )
     async def agenda_cmd(
-        ctx: commands.Context | Interaction,
+        ctx: commands.Context,
         jours: int = 30,
     ):
-
-        if isinstance(ctx, Interaction):
-            if not ctx.response.is_done():
-                send = ctx.response.send_message
-            else:
-                send = ctx.followup.send
-        else:
-            send = partial(_send, ctx)
-
-        try:
-            events: List[Dict[str, Any]] = engine.calendar_next_30_days(span_days=jours)
-        except LookupError as exc:
-            await send(f"❌ {exc}", ephemeral=True)
-            return
-
-        title = f"📅 Calendrier des évènements (≤ {jours} jours)"
-        colour = Colour.blurple()
-
-        pages = _chunks(events, 25)
-
-        for index, page in enumerate(pages, start=1):
-            embed = Embed(title=title, colour=colour)
-            if len(pages) > 1:
-                embed.set_footer(text=f"Page {index}/{len(pages)}")
-
-            tz_paris = ZoneInfo("Europe/Paris")
-
-            for ev in page:
-                dt = _to_datetime(ev.get("start"), tz_paris)
-                if dt is None:
-                    continue
-
-                ts = int(dt.timestamp())
-                when = f"<t:{ts}:f>  •  <t:{ts}:R>"
-
-                participants = ev.get("participants", [])
-                maybe = ev.get("maybe_participants", [])
-
-                value = (
-                    f"{when}\n"
-                    f"👥 {len(participants)} participant(s)  •  "
-                    f"❔ {len(maybe)} peut-être"
-                )
-                embed.add_field(name=f"**{ev['title']}**", value=value, inline=False)
-
-            await send(embed=embed, ephemeral=True)
+        # une seule réponse, paginée : les pages suivantes sont lues au clic
+        view = AgendaView(engine, span_days=max(1, jours), author_id=ctx.author.id)
+        embed = await view.render()
+        view.message = await ctx.send(embed=embed, view=view, ephemeral=True)
 
 
 
@@ -273,54 +266,27 @@ async def add_event(ctx: commands.Context | Interaction, ctftime_id: str):
         if isinstance(ctx, Interaction) and not ctx.response.is_done():
             await ctx.response.defer(thinking=True, ephemeral=True)
 
-        ctf = CTFtime(ctftime_id)
-
-
-        try:
-            event = await ctf.fetch()
-        except Exception:
+        result = await fetch_one(ctftime_id)
+        if isinstance(result.error, CircuitOpenError):
+            await _send(ctx, f"❌ {result.error}", ephemeral=True)
+            return
+        if not result.ok:
             await _send(ctx, "❌ L'évènement n'existe pas avec cet ID.", ephemeral=True)
             return
+        ctf, event = result.ctf, result.event
 
  
 
-        if engine.existe(event.id):
+        if await engine.existe(event.id):
             await _send(ctx, "ℹ️ L'évènement est déjà enregistré.", ephemeral=True)
             return
 
-        team_text   = "🚶‍♂️ Individuel" if ctf.solo() else "👥 Équipe"
-        online_text = "🛜 En ligne"     if ctf.online() else "🏘️ Présentiel"
-
-
-
-        embed = discord.Embed(
-            title=f"🔒 {event.title}",
-            url=event.url,
-            description=(
-                f"{OK_EMOJI} **Je participe**   •   {MAYBE_EMOJI} **Peut-être**\n"
-                "—\n"
-                "Clique sur une réaction pour t’inscrire !"
-            ),
-            colour=discord.Colour.blurple(),
-        )
-
-        embed.add_field(name="📆 Début",  value=f"**{event.start}**", inline=True)
-        embed.add_field(name="⏰ Fin",    value=f"**{event.finish}**", inline=True)
-        embed.add_field(name="\u200b",   value="\u200b",              inline=True)
-        embed.add_field(name="🏅 Weight", value=f"**{event.weight}** pts", inline=True)
-        embed.add_field(name="",         value=team_text,             inline=True)
-        embed.add_field(name="",         value=online_text,           inline=True)
-        embed.add_field(
-            name="🗓️ Calendrier",
-            value=f"[Ajouter à mon agenda](https://ctftime.org/event/{event.id}.ics)",
-            inline=False,
-        )
-        embed.set_footer(text=f"ID de l’évènement : {event.id}")
+        embed = _event_embed(ctf, event)
 
         msg = await channel.send(embed=embed)
         await bot.add_default_reactions(msg)
 
-        engine.new_event(
+        await engine.new_event(
             ctftime_id=event.id,
             msg_id=msg.id,
             title=event.title,
@@ -333,7 +299,10 @@ async def add_event(ctx: commands.Context | Interaction, ctftime_id: str):
         grp = Group(ctx.interaction, CATE_ID)
         # création du groupe discord 
         try :
-            await grp.new_group(event.title)
+            role_id, channel_id = await scheduler.submit(
+                f"guild:{grp.guild.id}", partial(grp.new_group, event.title)
+            )
+            await engine.set_group(event.id, role_id, channel_id)
         except:
             print("error creation role")
 
@@ -342,4 +311,136 @@ async def add_event(ctx: commands.Context | Interaction, ctftime_id: str):
             ctx,
             f"✅ Évènement **{event.title}** créé et publié dans {channel.mention} !",
             ephemeral=True,
-        )
\ No newline at end of file
+        )
+
+
+    # Créer plusieurs événements d'un coup
+    @bot.hybrid_command(
+        name="new_events",
+        aliases=["news"],
+        description="Créé plusieurs events CTF à partir d'une liste d'ID CTFtime",
+        with_app_command=True,
+    )
+    @app_commands.describe(
+        ctftime_ids="IDs CTFtime séparés par des espaces ou des virgules"
+    )
+    async def add_events(ctx: commands.Context, *, ctftime_ids: str):
+
+        if ctx.interaction and not ctx.interaction.response.is_done():
+            await ctx.interaction.response.defer(thinking=True, ephemeral=True)
+
+        ids = _parse_ids(ctftime_ids)
+        if not ids:
+            await _send(ctx, "❌ Aucun ID fourni.", ephemeral=True)
+            return
+
+        # 1) une seule requête pour écarter ceux déjà en base
+        known = await engine.existing_ids(ids)
+        report: Dict[str, str] = {cid: "ℹ️ déjà enregistré" for cid in ids if cid in known}
+        todo = [cid for cid in ids if cid not in known]
+
+        progress = await ctx.send(f"⏳ 0/{len(todo)} récupéré(s)…", ephemeral=True)
+
+        # 2) récupération concurrente (limiteur + disjoncteur), au fil de l'eau
+        fetched = []
+        async for done, result in _enumerate_async(fetch_many(todo), start=1):
+            if result.ok:
+                fetched.append(result)
+            else:
+                report[str(result.ctftime_id)] = f"❌ {result.error.__class__.__name__}"
+            if progress is not None and (done % 5 == 0 or done == len(todo)):
+                try:
+                    await progress.edit(content=f"⏳ {done}/{len(todo)} récupéré(s)…")
+                except discord.HTTPException:
+                    pass
+
+        # 3) annonces via le scheduler, puis toutes les lignes en une transaction
+        rows = await _publish_events(bot, engine, channel, fetched, report)
+
+        # 4) rôles + salons privés
+        if ctx.interaction is not None:
+            grp = Group(ctx.interaction, CATE_ID)
+            for row in rows:
+                try:
+                    role_id, channel_id = await scheduler.submit(
+                        f"guild:{grp.guild.id}", partial(grp.new_group, row["title"], notify=False)
+                    )
+                    await engine.set_group(row["ctftime_id"], role_id, channel_id)
+                except Exception as exc:
+                    # l'évènement est publié et enregistré : on passe au suivant
+                    print(f"error creation role {row['title']} : {exc!r}")
+
+        lines = [f"`{cid}` {report.get(cid, '❓')}" for cid in ids]
+        summary = f"{len(rows)}/{len(ids)} évènement(s) publié(s) dans {channel.mention}\n" + "\n".join(lines)
+        await _send(ctx, summary[:2000], ephemeral=True)
+
+
+async def _publish_events(
+    bot: commands.Bot,
+    engine: AsyncEngine,
+    channel: discord.TextChannel,
+    fetched: List[Any],
+    report: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    """Publie les annonces dans l'ordre chronologique et retourne les lignes enregistrées.
+
+    Les envois passent par le ``scheduler`` (route du salon, donc dans
+    l'ordre) ; un envoi en échec est noté dans *report* et le lot continue.
+    Toutes les lignes sont ensuite écrites en **une** transaction : si elle
+    échoue, les annonces postées sont retirées pour ne pas laisser de message
+    sans ligne en base (donc sans réactions prises en compte).
+    """
+    route = f"messages:{channel.id}"
+    ordered = sorted(fetched, key=lambda r: r.event.start)
+    futures = [
+        scheduler.submit(route, partial(channel.send, embed=_event_embed(result.ctf, result.event)))
+        for result in ordered
+    ]
+
+    posted: List[tuple[discord.Message, Dict[str, Any]]] = []
+    for result, future in zip(ordered, futures):
+        event = result.event
+        try:
+            msg = await future
+        except Exception as exc:
+            report[str(result.ctftime_id)] = f"❌ publication : {_error_detail(exc)}"
+            continue
+        posted.append((msg, dict(
+            ctftime_id=event.id,
+            msg_id=msg.id,
+            title=event.title,
+            url=str(event.ctftime_url),
+            start=event.start,
+            end=event.finish,
+            description=event.description,
+        )))
+
+    rows = [row for _, row in posted]
+    if not rows:
+        return []
+    try:
+        await engine.new_events(rows)
+    except Exception as exc:
+        # annonces postées mais pas enregistrées : on les retire
+        await asyncio.gather(
+            *(scheduler.submit(route, msg.delete) for msg, _ in posted), return_exceptions=True
+        )
+        for row in rows:
+            report[str(row["ctftime_id"])] = f"❌ publication : {_error_detail(exc)}"
+        return []
+
+    for msg, row in posted:
+        await bot.add_default_reactions(msg)
+        report[str(row["ctftime_id"])] = f"✅ {row['title']}"
+    return rows
+
+
+def _error_detail(exc: Exception) -> str:
+    return str(exc.status) if isinstance(exc, discord.HTTPException) else exc.__class__.__name__
+
+
+async def _enumerate_async(aiter, start: int = 0):
+    index = start
+    async for item in aiter:
+        yield index, item
+        index += 1
@@ -1,24 +1,79 @@
 import discord, datetime as dt, asyncio
+import hashlib, json, time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
 from discord.ext import commands, tasks
 
-from src.discord_ctftime.event import Engine
+from src.discord_ctftime.bot.members import named, resolve_names
+from src.discord_ctftime.event import AsyncEngine, Engine
+from src.discord_ctftime.utils.dates import TZ_PARIS
 
 import os
 CHANNEL_ID_DASH = int(os.getenv("DASH_CHANNEL_ID", 0))
 
-REFRESH_EVERY   = 20               # seconde
+REFRESH_EVERY   = 5                # seconde : simple test du drapeau « dirty »
+HEARTBEAT_EVERY = 600              # seconde : rafraîchissement forcé (fenêtre glissante)
 SPAN_DAYS       = 30               # fenêtre du calendrier
+EVENTS_PER_SHARD = 10              # évènements max par message (une semaine peut en faire plusieurs)
+
+# limites Discord (https://discord.com/developers/docs/resources/message#embed-object-embed-limits)
+EMBED_MAX_CHARS  = 6000
+EMBED_MAX_FIELDS = 25
+FIELD_NAME_MAX   = 256
+FIELD_VALUE_MAX  = 1024
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+ShardKey = Tuple[int, int, int]     # (année ISO, semaine ISO, n° de morceau)
+
+
+@dataclass
+class Shard:
+    """Un message du dashboard, sa clé (semaine) et le hash du dernier contenu envoyé."""
+    message: discord.PartialMessage
+    key: ShardKey | None = None
+    digest: str | None = None
+
+
+def _week_key(start_ts: int) -> Tuple[int, int]:
+    year, week, _ = dt.datetime.fromtimestamp(start_ts, TZ_PARIS).isocalendar()
+    return year, week
+
 
 class Dashboard(commands.Cog):
+    """Calendrier découpé en plusieurs messages (« shards »), un par semaine
+    ISO : un évènement ajouté ne change que le message de sa semaine, et
+    seuls les messages dont le contenu a changé sont édités."""
 
-    def __init__(self, bot: commands.Bot, engine: Engine):
+    def __init__(self, bot: commands.Bot, engine: AsyncEngine):
         self.bot     = bot
         self.engine  = engine
-        self.msg_id: int | None = None
+        self._channel: discord.abc.Messageable | None = None
+        self._shards: List[Shard] = []
+        self._last_render = 0.0
+        self._dirty = True
+
+        # toute écriture Engine marque le dashboard à rafraîchir
+        Engine.on_change(self._mark_dirty)
         self.refresh_loop.start()
 
+    def cog_unload(self):
+        self.refresh_loop.cancel()
+        if self._mark_dirty in Engine._listeners:
+            Engine._listeners.remove(self._mark_dirty)
+
+    def _mark_dirty(self) -> None:
+        # appelé depuis le thread écrivain : on se contente de lever le drapeau
+        self._dirty = True
+
+
+    async def _ensure_channel(self):
+        if self._channel is not None:
+            return self._channel
 
-    async def _ensure_message(self) -> discord.Message:
         channel = self.bot.get_channel(CHANNEL_ID_DASH)
 
         # si rien en cache ⇒ on tente l’API REST
@@ -29,20 +84,28 @@ async def _ensure_message(self) -> discord.Message:
                 raise RuntimeError(
                     f"Salon {CHANNEL_ID_DASH} introuvable ou inaccessible pour le bot."
                 )
+        self._channel = channel
+        return channel
 
-        if self.msg_id:
-            try:
-                return await channel.fetch_message(self.msg_id)
-            except discord.NotFound:
-                self.msg_id = None
-
-        msg = await channel.send(embed=discord.Embed(description="Initialisation…"))
-        self.msg_id = msg.id
-        return msg
+    @staticmethod
+    def _event_field(ev: Dict[str, Any], names: Dict[int, str]) -> tuple[str, str]:
+        p = ", ".join(named(ev["participants"], names)) or "—"
+        m = ", ".join(named(ev["maybe_participants"], names)) or "—"
+        field_val = (
+            f"**Début :** {ev['start']}\n"
+            f"**Fin :** {ev['end']}\n"
+            f"**Inscrits :** {p}\n"
+            f"**Peut-être :** {m}"
+        )
+        return (
+            _truncate(f"🔗 [{ev['title']}]({ev['url']})", FIELD_NAME_MAX),
+            _truncate(field_val, FIELD_VALUE_MAX),
+        )
 
-    def _make_calendar_embed(self) -> discord.Embed:
+    async def _make_calendar_embeds(self) -> List[Tuple[ShardKey, discord.Embed]]:
+        """Construit les embeds du calendrier, un par semaine, clés comprises."""
         try:
-            events = self.engine.calendar_next_30_days(span_days=SPAN_DAYS)
+            events = await self.engine.calendar_next_30_days(span_days=SPAN_DAYS)
         except LookupError:
             embed = discord.Embed(
                 title="📅 Aucun évènement à venir",
@@ -50,44 +113,145 @@ def _make_calendar_embed(self) -> discord.Embed:
                             f"{SPAN_DAYS} prochains jours.",
                 colour=discord.Colour.orange(),
             )
-            return embed
+            return [((0, 0, 0), embed)]
 
-        embed = discord.Embed(
-            title=f"📅 Les {len(events)} prochains évènements (≤{SPAN_DAYS} j)",
-            colour=discord.Colour.blue(),
-            timestamp=dt.datetime.now(),
+        # tous les pseudos du calendrier en un seul lot
+        channel = await self._ensure_channel()
+        names = await resolve_names(
+            getattr(channel, "guild", None),
+            (uid for ev in events for uid in ev["participants"] + ev["maybe_participants"]),
         )
+        return self._week_embeds(events, names)
+
+    @classmethod
+    def _week_embeds(cls, events: List[Dict[str, Any]], names: Dict[int, str]) -> List[Tuple[ShardKey, discord.Embed]]:
+        """Un embed par semaine ISO (découpé si les limites Discord l'imposent).
+
+        Le contenu d'un embed ne dépend que des évènements de sa semaine : pas
+        de compteur global ni de « page i/n » qui changeraient partout.
+        """
+        shards: List[Tuple[ShardKey, discord.Embed]] = []
+        embed: discord.Embed | None = None
+        week: Tuple[int, int] | None = None
+        part = 0
         for ev in events:
-            p = ", ".join(ev["participants"]) or "—"
-            m = ", ".join(ev["maybe_participants"]) or "—"
-            field_val = (
-                f"**Début :** {ev['start']}\n"
-                f"**Fin :** {ev['end']}\n"
-                f"**Inscrits :** {p}\n"
-                f"**Peut-être :** {m}"
-            )
-            embed.add_field(
-                name=f"🔗 [{ev['title']}]({ev['url']})",
-                value=field_val,
-                inline=False,
-            )
-        embed.set_footer(text="Mise à jour auto")
-        return embed
+            name, value = cls._event_field(ev, names)
+            ev_week = _week_key(ev["start_ts"])
+            if ev_week != week:
+                week, part, embed = ev_week, 0, None
+            if (
+                embed is None
+                or len(embed.fields) >= min(EVENTS_PER_SHARD, EMBED_MAX_FIELDS)
+                or len(embed) + len(name) + len(value) > EMBED_MAX_CHARS - 100  # marge pied de page
+            ):
+                if embed is not None:
+                    part += 1
+                monday = dt.date.fromisocalendar(week[0], week[1], 1)
+                embed = discord.Embed(
+                    title=f"📅 Semaine du {monday:%d/%m}" if part == 0 else None,
+                    colour=discord.Colour.blue(),
+                )
+                embed.set_footer(text="Mise à jour auto")
+                shards.append(((week[0], week[1], part), embed))
+            embed.add_field(name=name, value=value, inline=False)
+        return shards
+
+    @staticmethod
+    def _hash(embed: discord.Embed) -> str:
+        return hashlib.sha1(
+            json.dumps(embed.to_dict(), sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()
+
+    async def _send_shard(self, embed: discord.Embed) -> Shard:
+        channel = await self._ensure_channel()
+        msg = await channel.send(embed=embed)
+        return Shard(channel.get_partial_message(msg.id))
+
+    async def refresh(self, force: bool = False) -> int:
+        """Re-génère le calendrier et n'édite que les messages dont le contenu a changé.
+
+        Les messages sont rattachés à leur semaine : une semaine disparue
+        (passée) est supprimée sans décaler les suivantes, une nouvelle
+        semaine en fin de fenêtre est ajoutée en bas. Retourne le nombre
+        d'appels Discord (éditions, envois, suppressions).
+        """
+        self._dirty = False
+        self._last_render = time.monotonic()
+
+        shards = await self._make_calendar_embeds()
+        wanted = {key for key, _ in shards}
+        calls = 0
+
+        # semaines disparues : suppression, l'ordre des autres messages est conservé
+        for shard in [s for s in self._shards if s.key not in wanted]:
+            self._shards.remove(shard)
+            try:
+                await shard.message.delete()
+            except discord.NotFound:
+                pass
+            calls += 1
+
+        for index, (key, embed) in enumerate(shards):
+            digest = self._hash(embed)
+            if (
+                index < len(self._shards)
+                and self._shards[index].key == key
+                and self._shards[index].digest == digest
+                and not force
+            ):
+                continue
+
+            # horodatage ajouté après le hash : il ne doit pas provoquer d'édition
+            embed.timestamp = dt.datetime.now()
+
+            if index < len(self._shards):
+                # même semaine, ou semaine insérée au milieu : les messages
+                # suivants glissent d'un cran (rare, l'ordre du salon l'impose)
+                try:
+                    await self._shards[index].message.edit(embed=embed)
+                except discord.NotFound:
+                    # message supprimé : on repart de zéro pour garder l'ordre
+                    await self._reset()
+                    return await self.refresh(force=True)
+            else:
+                self._shards.append(await self._send_shard(embed))
+            self._shards[index].key = key
+            self._shards[index].digest = digest
+            calls += 1
+
+        # moins de shards qu'avant : on supprime les messages en trop
+        while len(self._shards) > len(shards):
+            shard = self._shards.pop()
+            try:
+                await shard.message.delete()
+            except discord.NotFound:
+                pass
+            calls += 1
+
+        return calls
+
+    async def _reset(self) -> None:
+        for shard in self._shards:
+            try:
+                await shard.message.delete()
+            except discord.NotFound:
+                pass
+        self._shards = []
 
     @commands.hybrid_command(
         name="dashboard_refresh", description="Ré-affiche le calendrier des 30 prochains jours."
     )
     async def dashboard_cmd(self, ctx: commands.Context):
-        msg = await self._ensure_message()
-        await msg.edit(embed=self._make_calendar_embed())
+        await self.refresh(force=True)
         await ctx.reply("✅ Dashboard rafraîchi !", ephemeral=True)
 
     @tasks.loop(seconds=REFRESH_EVERY)
     async def refresh_loop(self):
         if not self.bot.is_ready():
             return
-        msg = await self._ensure_message()
-        await msg.edit(embed=self._make_calendar_embed())
+        stale = time.monotonic() - self._last_render >= HEARTBEAT_EVERY
+        if self._dirty or stale:
+            await self.refresh()
 
     @refresh_loop.before_loop
     async def _wait_bot(self):
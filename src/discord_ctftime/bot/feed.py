@@ -0,0 +1,70 @@
+import discord
+from discord.ext import commands, tasks
+
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.rss import poll_feed
+
+import os
+RSS_URL        = os.getenv("RSS_URL", "https://ctftime.org/event/list/upcoming/rss/")
+CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", 30))   # minutes
+DEEP_EVENT     = int(os.getenv("DEEP_EVENT", 15))       # nb d'évènements affichés
+
+
+class Feed(commands.Cog):
+    """Ingestion périodique du flux CTFtime « upcoming » dans la base locale."""
+
+    def __init__(self, bot: commands.Bot, engine: AsyncEngine):
+        self.bot    = bot
+        self.engine = engine
+        self.poll_loop.start()
+
+    def cog_unload(self):
+        self.poll_loop.cancel()
+
+    @tasks.loop(minutes=CHECK_INTERVAL)
+    async def poll_loop(self):
+        try:
+            added = await poll_feed(RSS_URL, self.engine)
+        except Exception as exc:
+            print(f"⚠️  Flux RSS KO : {exc!r}")
+            return
+        if added:
+            print(f"📰 {added} nouvel(s) évènement(s) CTFtime ingéré(s)")
+
+    @poll_loop.before_loop
+    async def _wait_bot(self):
+        await self.bot.wait_until_ready()
+
+    @commands.hybrid_command(
+        name="upcoming",
+        aliases=["up", "u"],
+        description="Affiche les prochains CTF annoncés sur CTFtime.",
+        with_app_command=True,
+    )
+    async def upcoming_cmd(self, ctx: commands.Context):
+        # lecture du miroir local : pas d'appel réseau
+        events = await self.engine.upcoming(limit=DEEP_EVENT)
+        if not events:
+            await ctx.reply("❌ Aucun évènement à venir dans le miroir local.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"🗓️ Les {len(events)} prochains CTF sur CTFtime",
+            colour=discord.Colour.blurple(),
+        )
+        for ev in events:
+            when = f"<t:{ev['start_ts']}:f>  •  <t:{ev['start_ts']}:R>"
+            infos = " • ".join(
+                filter(None, [ev["format"], "🏘️ Présentiel" if ev["onsite"] else "🛜 En ligne"])
+            )
+            embed.add_field(
+                name=f"{ev['title']} (ID {ev['ctftime_id']})"[:256],
+                value=f"{when}\n{infos}\n[CTFtime]({ev['url']})",
+                inline=False,
+            )
+        embed.set_footer(text="/new_event <ID> pour l'annoncer à l'équipe")
+        await ctx.reply(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Feed(bot, bot.engine))
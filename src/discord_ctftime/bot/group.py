@@ -1,7 +1,55 @@
 import discord
+from functools import partial
+from typing import Dict, Tuple
+
+from src.discord_ctftime.bot.scheduler import scheduler
+from src.discord_ctftime.event import EventRef
 from src.discord_ctftime.utils.utils import normalize_channel_name
 
 
+class GuildIndex:
+    """Index nom → id des rôles et salons texte de la guilde.
+
+    Chargé une fois (``load``) puis tenu à jour par les évènements
+    ``on_guild_role_*`` / ``on_guild_channel_*`` : plus de parcours
+    linéaire de ``guild.roles`` à chaque réaction.
+    """
+
+    def __init__(self):
+        self.roles: Dict[str, int] = {}
+        self.channels: Dict[str, int] = {}
+
+    def load(self, guild: discord.Guild) -> None:
+        self.roles = {r.name: r.id for r in guild.roles}
+        self.channels = {c.name: c.id for c in guild.text_channels}
+
+    def add_role(self, role: discord.Role) -> None:
+        self.roles[role.name] = role.id
+
+    def remove_role(self, role: discord.Role) -> None:
+        if self.roles.get(role.name) == role.id:
+            del self.roles[role.name]
+
+    def add_channel(self, channel: discord.abc.GuildChannel) -> None:
+        if isinstance(channel, discord.TextChannel):
+            self.channels[channel.name] = channel.id
+
+    def remove_channel(self, channel: discord.abc.GuildChannel) -> None:
+        if self.channels.get(channel.name) == channel.id:
+            del self.channels[channel.name]
+
+    def role(self, guild: discord.Guild, name: str) -> discord.Role | None:
+        role_id = self.roles.get(name)
+        return guild.get_role(role_id) if role_id else None
+
+    def channel(self, guild: discord.Guild, name: str) -> discord.TextChannel | None:
+        channel_id = self.channels.get(normalize_channel_name(name))
+        return guild.get_channel(channel_id) if channel_id else None
+
+
+index = GuildIndex()
+
+
 class Group():
     def __init__(self, interaction: discord.Interaction,CATEGORY_ID:int):
         self.interaction = interaction
@@ -9,9 +57,10 @@ def __init__(self, interaction: discord.Interaction,CATEGORY_ID:int):
         self.guild = interaction.guild
         return
 
-    async def new_group(self, nom: str):
+    async def new_group(self, nom: str, notify: bool = True) -> Tuple[int, int]:
+        """Crée (si besoin) le rôle et le salon privé de l'évènement ; retourne leurs ids."""
         # Vérifie si le rôle existe déjà
-        role = discord.utils.get(self.interaction.guild.roles, name=nom)
+        role = index.role(self.guild, nom)
 
         if role is None:
             # Crée un rôle avec couleur grise
@@ -20,6 +69,7 @@ async def new_group(self, nom: str):
                 colour=discord.Colour.greyple(),
                 reason=f"Création par bot : {self.interaction.user}, pour l'event : {nom}"
             )
+            index.add_role(role)
 
         # met les perms seulement sur le salon
         overwrites = {
@@ -28,10 +78,10 @@ async def new_group(self, nom: str):
             self.interaction.user: discord.PermissionOverwrite(view_channel=True, send_messages=True)
         }
 
-        # verifie si le saloon existe : 
-        existing_channel = discord.utils.get(self.guild.text_channels, name=normalize_channel_name(nom))
+        # verifie si le saloon existe :
+        channel = index.channel(self.guild, nom)
 
-        if existing_channel is None:
+        if channel is None:
             # Crée le salon texte privé
             channel = await self.guild.create_text_channel(
                 name=normalize_channel_name(nom),
@@ -39,48 +89,81 @@ async def new_group(self, nom: str):
                 category=self.category,
                 reason=f"Salon privé pour le groupe {nom}"
             )
+            index.add_channel(channel)
 
-            await self.interaction.response.send_message(
-                f"✅ Groupe **{nom}** créé avec succès !\nSalon : {channel.mention}",
-                ephemeral=False
-            )
+            if notify:
+                await self.interaction.response.send_message(
+                    f"✅ Groupe **{nom}** créé avec succès !\nSalon : {channel.mention}",
+                    ephemeral=False
+                )
 
-        else:
+        elif notify:
             await self.interaction.response.send_message(
-                f"ℹ️ Le salon **{existing_channel.mention}** existe déjà pour le groupe **{nom}**.",
+                f"ℹ️ Le salon **{channel.mention}** existe déjà pour le groupe **{nom}**.",
                 ephemeral=True
             )
 
+        return role.id, channel.id
+
+    async def clean_group(self, nom: str, archive_category_id: int = 0) -> None:
+        await delete_group(self.guild, nom, archive_category_id)
+
+
+async def delete_group(
+    guild: discord.Guild,
+    nom: str,
+    archive_category_id: int = 0,
+    role_id: int | None = None,
+    channel_id: int | None = None,
+) -> None:
+    """Supprime le rôle et le salon privé d'un évènement terminé.
+
+    Les ids mémorisés en base sont prioritaires, le nom sert pour les anciens
+    évènements. Si *archive_category_id* est fourni, le salon est déplacé dans
+    cette catégorie (permissions alignées sur elle) au lieu d'être supprimé.
+    """
+    role = guild.get_role(role_id) if role_id else index.role(guild, nom)
+    channel = guild.get_channel(channel_id) if channel_id else index.channel(guild, nom)
+    reason = f"Archivage de l'event : {nom}"
+
+    if channel is not None:
+        archive = guild.get_channel(archive_category_id) if archive_category_id else None
+        if isinstance(archive, discord.CategoryChannel):
+            await channel.edit(category=archive, sync_permissions=True, reason=reason)
+        else:
+            await channel.delete(reason=reason)
+
+    if role is not None:
+        await role.delete(reason=reason)
 
-    #TODO: faire un garbage collector des vieux groupes
-    async def clean_group(self):
-        return
+
+def _notify(channel: discord.TextChannel, text: str) -> None:
+    scheduler.submit(f"messages:{channel.id}", partial(channel.send, text, delete_after=30))
 
 
-async def add_member(guild: discord.Guild, member: discord.Member, role_name: str, channel: discord.TextChannel):
-    role = discord.utils.get(guild.roles, name=role_name)
+def event_role(guild: discord.Guild, ref: EventRef) -> discord.Role | None:
+    # id mémorisé : O(1) et insensible aux renommages ; sinon index par nom
+    if ref.role_id:
+        return guild.get_role(ref.role_id)
+    return index.role(guild, ref.title)
+
+
+async def add_member(guild: discord.Guild, member: discord.Member, ref: EventRef, channel: discord.TextChannel):
+    role = event_role(guild, ref)
 
     if role is None:
-        await channel.send(f"❌ Le rôle **{role_name}** n’existe pas.", delete_after=30)
+        _notify(channel, f"❌ Le rôle **{ref.title}** n’existe pas.")
         return
 
-    try:
-        await member.add_roles(role)
-        #await channel.send(f"✅ {member.display_name} a été ajouté au rôle **{role_name}** !", delete_after=30)
-    except discord.Forbidden:
-        await channel.send("❌ Erreur perms BOT. Veuillez Contacter @lululufr", delete_after=30)
+    # regroupé avec les autres changements du membre, appliqué en tâche de fond
+    scheduler.set_role(member, role, add=True, channel=channel)
 
 
-async def remove_member(guild: discord.Guild, member: discord.Member, role_name: str, channel: discord.TextChannel):
-    role = discord.utils.get(guild.roles, name=role_name)
+async def remove_member(guild: discord.Guild, member: discord.Member, ref: EventRef, channel: discord.TextChannel):
+    role = event_role(guild, ref)
 
     if role is None:
-        await channel.send(f"❌ Le rôle **{role_name}** n’existe pas.", delete_after=30)
+        _notify(channel, f"❌ Le rôle **{ref.title}** n’existe pas.")
         return
 
-    try:
-        await member.remove_roles(role)
-        #await channel.send(f"➖ {member.display_name} a été retiré du rôle **{role_name}**.", delete_after=30)
-    except discord.Forbidden:
-        await channel.send("❌ Erreur perms BOT. Veuillez Contacter @lululufr", delete_after=30)
-
+    scheduler.set_role(member, role, add=False, channel=channel)
@@ -1,28 +1,25 @@
 import discord
 from discord.ext import commands
 import asyncio
-import feedparser
-from src.discord_ctftime.event import Engine
-#from src.discord_ctftime.ctftime import CTFtime
-from src.discord_ctftime.bot.group import add_member, remove_member
+import time
+from contextlib import contextmanager
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.ctftime import open_client, close_client
+from src.discord_ctftime.bot.group import add_member, remove_member, index
+from src.discord_ctftime.bot.scheduler import scheduler
+from src.discord_ctftime.bot.sync import sync_if_changed
+from src.discord_ctftime.metrics import REACTION_LATENCY, STARTUP
 
 
 from src.discord_ctftime.bot.command import setup_commands
-import src.discord_ctftime.bot.group
-
-
-import src.discord_ctftime.bot.dashboard
 
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 DISCORD_TOKEN  = os.getenv("DISCORD_TOKEN")
-CHANNEL_ID     = int(os.getenv("CHANNEL_ID"))
+CHANNEL_ID     = int(os.getenv("CHANNEL_ID", 0))
 RSS_URL        = os.getenv("RSS_URL")
 CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", 30))
-SERVER_ID = int(os.getenv("SERVER_ID", None))  
+SERVER_ID = int(os.getenv("SERVER_ID", 0))  
 DEEP_EVENT = int(os.getenv("DEEP_EVENT", 15)) 
 
 #DEFINE EMOJI REACTION
@@ -32,96 +29,179 @@
 
 ALLOWED_EMOJIS = {OK_EMOJI, MAYBE_EMOJI}
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+EXTENSIONS = (
+    "src.discord_ctftime.bot.dashboard",   # dashboard
+    "src.discord_ctftime.bot.feed",        # miroir local du flux RSS CTFtime (/upcoming)
+    "src.discord_ctftime.bot.archiver",    # archivage des évènements terminés + ménage des rôles / salons
+    "src.discord_ctftime.bot.reconcile",   # rattrapage des réactions manquées hors ligne
+    "src.discord_ctftime.bot.stats",       # métriques (/stats + endpoint Prometheus local)
+)
 
-dernier_article = None
 
+@contextmanager
+def _phase(name: str):
+    """Chronomètre une phase du démarrage (log + métrique ``bot_startup_seconds``)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STARTUP.set(elapsed, phase=name)
+        print(f"⏱️  {name} : {elapsed * 1000:.0f} ms")
 
 
 class Bot(commands.Bot):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.engine = Engine()        
+        self.started_at = time.perf_counter()
+        self.engine = AsyncEngine()
 
 
     async def setup_hook(self):
 
-        self.channel = self.get_channel(CHANNEL_ID)
-        if self.channel is None:                          
-            self.channel = await self.fetch_channel(CHANNEL_ID)
+        # session HTTP partagée vers ctftime.org
+        open_client()
+
+        with _phase("channel"):
+            self.channel = self.get_channel(CHANNEL_ID)
+            if self.channel is None:
+                self.channel = await self.fetch_channel(CHANNEL_ID)
+
+        # schéma SQLite mis à jour une fois pour toutes avant la première requête
+        with _phase("migrations"):
+            applied = await self.engine.migrate()
+        if applied:
+            print(f"🗄️  {applied} migration(s) de schéma appliquée(s)")
+
+        # index mémoire des messages d'évènements (réactions)
+        with _phase("index"):
+            await self.engine.load_index()
+
+        with _phase("extensions"):
+            # enregistre toutes les commandes
+            setup_commands(self, self.engine, self.channel)
+            for ext in EXTENSIONS:
+                await self.load_extension(ext)
+
+        # sync seulement si l'arbre de commandes a changé depuis le dernier démarrage
+        with _phase("tree_sync"):
+            guild = discord.Object(id=SERVER_ID)
+            self.tree.copy_global_to(guild=guild)
+            synced = await sync_if_changed(self.tree, guild)
+        print("🔄 Commandes synchronisées" if synced else "🔄 Commandes inchangées, pas de sync")
+
+
+    async def close(self):
+        # actions Discord en attente (rôles regroupés…) avant de couper la connexion
+        await scheduler.close()
+        await super().close()
+        await close_client()
+        await self.engine.flush()
+        await asyncio.to_thread(self.engine.close)
 
-        # enregistre toutes les commandes
-        setup_commands(self, self.engine, self.channel)
+    async def on_ready(self):
+        ready = time.perf_counter() - self.started_at
+        STARTUP.set(ready, phase="ready")
+        print(f"✅ Connecté en tant que {self.user} ({ready:.1f} s)")
 
-        #dashbaord
-        await self.load_extension("src.discord_ctftime.bot.dashboard")
+    # index nom → id des rôles / salons, tenu à jour en continu
+    async def on_guild_available(self, guild: discord.Guild):
+        if guild.id == SERVER_ID:
+            index.load(guild)
 
-        guild = discord.Object(id=SERVER_ID)
-        self.tree.copy_global_to(guild=guild)
-        await self.tree.sync(guild=guild)
+    async def on_guild_role_create(self, role: discord.Role):
+        if role.guild.id != SERVER_ID:
+            return
+        index.add_role(role)
 
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if after.guild.id != SERVER_ID:
+            return
+        index.remove_role(before)
+        index.add_role(after)
 
-    async def on_ready(self):
-        print(f"✅ Connecté en tant que {self.user}")
+    async def on_guild_role_delete(self, role: discord.Role):
+        if role.guild.id != SERVER_ID:
+            return
+        index.remove_role(role)
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id != SERVER_ID:
+            return
+        index.add_channel(channel)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after.guild.id != SERVER_ID:
+            return
+        index.remove_channel(before)
+        index.add_channel(after)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id != SERVER_ID:
+            return
+        index.remove_channel(channel)
 
     async def add_default_reactions(self, message: discord.Message) -> None:
-        for emoji in (OK_EMOJI, MAYBE_EMOJI, NOT_EMOJI):
-            try:
-                await message.add_reaction(emoji)
-            except discord.HTTPException:
-                pass
+        # file par salon : rend la main tout de suite, les réactions suivent dans l'ordre
+        scheduler.add_reactions(message, (OK_EMOJI, MAYBE_EMOJI, NOT_EMOJI))
             
 
-    #  ajout d'une réaction
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        with REACTION_LATENCY.time(event="add"):
+            await self._reaction_add(payload)
+
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        with REACTION_LATENCY.time(event="remove"):
+            await self._reaction_remove(payload)
+
+    #  ajout d'une réaction
+    async def _reaction_add(self, payload: discord.RawReactionActionEvent):
         if payload.guild_id != SERVER_ID:
             return
         if str(payload.emoji) not in ALLOWED_EMOJIS:
             return
         if payload.user_id == self.user.id:
             return
-        if not self.engine.existe(payload.message_id):
+        # index mémoire : les réactions hors évènements s'arrêtent ici
+        if self.engine.lookup_message(payload.message_id) is None:
             return
 
         guild   = self.get_guild(payload.guild_id)
         channel = self.get_channel(payload.channel_id)
         user    = guild.get_member(payload.user_id)
-        message = await channel.fetch_message(payload.message_id)
 
         # Participe a un event
         if str(payload.emoji) == OK_EMOJI:
 
             # ajoute le participant  la bdd
-            self.engine.add_participant(payload.message_id, user.display_name)
-
-
-            title = self.engine.get_event_info(payload.message_id)["title"]
+            ref = self.engine.toggle_participant(
+                payload.message_id, payload.user_id, maybe=False, add=True
+            )
 
             # ajoute au  groupe discord 
-            await add_member(guild, user, title, channel)
+            await add_member(guild, user, ref, channel)
 
             # Message notifié ajout
             #await channel.send(
-            #    f"ℹ️ {user.display_name} inscrit à : `{title}` {OK_EMOJI}",
+            #    f"ℹ️ {user.display_name} inscrit à : `{ref.title}` {OK_EMOJI}",
             #    delete_after=30,
             #)
         else:
-            self.engine.add_maybe_participant(payload.message_id, user.display_name)
-            title = self.engine.get_event_info(payload.message_id)["title"]
+            self.engine.toggle_participant(
+                payload.message_id, payload.user_id, maybe=True, add=True
+            )
             #await channel.send(
-            #    f"ℹ️ {user.display_name} participera peut-être à : `{title}` {MAYBE_EMOJI}",
+            #    f"ℹ️ {user.display_name} participera peut-être à : `{ref.title}` {MAYBE_EMOJI}",
             #    delete_after=30,
             #)
 
     # retire sa réaction
-    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+    async def _reaction_remove(self, payload: discord.RawReactionActionEvent):
         if payload.guild_id != SERVER_ID:
             return
         if str(payload.emoji) not in ALLOWED_EMOJIS:
             return
-        if not self.engine.existe(payload.message_id):
+        if self.engine.lookup_message(payload.message_id) is None:
             return
 
         guild   = self.get_guild(payload.guild_id)
@@ -130,14 +210,12 @@ async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
 
         if str(payload.emoji) == OK_EMOJI:
             # retire l'utilisateur e la bdd
-            self.engine.remove_participant(payload.message_id, user.display_name)
+            ref = self.engine.toggle_participant(
+                payload.message_id, payload.user_id, maybe=False, add=False
+            )
 
             # retire du groupe discord 
-
-            title = self.engine.get_event_info(payload.message_id)["title"]
-
-            # ajoute au  groupe discord 
-            await remove_member(guild, user, title, channel)
+            await remove_member(guild, user, ref, channel)
 
             # Message notifié 
             #await channel.send(
@@ -145,14 +223,26 @@ async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
             #    delete_after=30,
             #)
         else:
-            self.engine.remove_maybe_participant(payload.message_id, user.display_name)
+            self.engine.toggle_participant(
+                payload.message_id, payload.user_id, maybe=True, add=False
+            )
             #await channel.send(
             #    f"➖ **{user.display_name}** a retiré son « peut-être » {MAYBE_EMOJI}",
             #    delete_after=30,
             #)
 
 
+def create_bot() -> Bot:
+    """Construit le bot sans le démarrer (tests, scripts, autre boucle)."""
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    return Bot(command_prefix="/", intents=intents)
+
+
+def main() -> None:
+    create_bot().run(DISCORD_TOKEN)
 
-client = Bot(command_prefix="/",intents=intents)
 
-client.run(DISCORD_TOKEN)
+if __name__ == "__main__":
+    main()
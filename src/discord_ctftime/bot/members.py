@@ -0,0 +1,40 @@
+import asyncio
+from typing import Dict, Iterable, List
+
+import discord
+
+QUERY_BATCH = 100          # max d'ids par requête gateway (query_members)
+
+
+async def resolve_names(guild: discord.Guild | None, user_ids: Iterable[int]) -> Dict[int, str]:
+    """ids Discord → pseudo affiché, **en un lot** au moment du rendu.
+
+    Le cache des membres répond d'abord ; les absents sont demandés à la
+    gateway par paquets de ``QUERY_BATCH``. Un id introuvable est rendu en
+    mention (``<@id>``), que Discord affiche lui-même dans les embeds.
+    """
+    ids = set(user_ids)
+    names: Dict[int, str] = {}
+    missing: List[int] = []
+    for uid in ids:
+        member = guild.get_member(uid) if guild is not None else None
+        if member is not None:
+            names[uid] = member.display_name
+        else:
+            missing.append(uid)
+
+    for i in range(0, len(missing) if guild is not None else 0, QUERY_BATCH):
+        try:
+            found = await guild.query_members(user_ids=missing[i : i + QUERY_BATCH], cache=True)
+        except (discord.ClientException, asyncio.TimeoutError):
+            break
+        names.update((m.id, m.display_name) for m in found)
+
+    for uid in ids:
+        names.setdefault(uid, f"<@{uid}>")
+    return names
+
+
+def named(user_ids: Iterable[int], names: Dict[int, str]) -> List[str]:
+    """Pseudos des *user_ids*, triés par ordre alphabétique."""
+    return sorted((names.get(uid, f"<@{uid}>") for uid in user_ids), key=str.casefold)
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Dict, Iterable, List, Set, Tuple
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from src.discord_ctftime.bot.group import event_role
+from src.discord_ctftime.bot.scheduler import scheduler
+from src.discord_ctftime.event import AsyncEngine
+
+import os
+SERVER_ID   = int(os.getenv("SERVER_ID", 0))
+OK_EMOJI    = os.getenv("OK_EMOJI")
+MAYBE_EMOJI = os.getenv("MAYBE_EMOJI")
+
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", 3))   # messages traités en parallèle
+
+Change = Tuple[bool, str, int, bool]
+
+
+def diff_participants(ctftime_id: str, maybe: bool, in_db: Iterable[int], reacted: Iterable[int]) -> List[Change]:
+    """Changements ``(maybe, ctftime_id, user_id, add)`` pour aligner la base sur les réactions."""
+    in_db, reacted = set(in_db), set(reacted)
+    return [(maybe, ctftime_id, p, True) for p in sorted(reacted - in_db)] + [
+        (maybe, ctftime_id, p, False) for p in sorted(in_db - reacted)
+    ]
+
+
+def legacy_mapping(members: Iterable[discord.Member], names: Iterable[str]) -> Dict[str, int]:
+    """Pseudo → id pour les anciennes inscriptions ; les pseudos ambigus
+    (deux membres au même nom) sont écartés plutôt que mal attribués."""
+    wanted = set(names)
+    found: Dict[str, Set[int]] = {}
+    for member in members:
+        for name in {member.display_name, member.name, getattr(member, "global_name", None)}:
+            if name in wanted:
+                found.setdefault(name, set()).add(member.id)
+    return {name: ids.pop() for name, ids in found.items() if len(ids) == 1}
+
+
+class Reconcile(commands.Cog):
+    """Rattrape au démarrage les réactions ✅ / ❓ posées ou retirées pendant
+    que le bot était hors ligne."""
+
+    def __init__(self, bot: commands.Bot, engine: AsyncEngine):
+        self.bot    = bot
+        self.engine = engine
+        self._task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        self._task = asyncio.create_task(self._on_startup())
+
+    def cog_unload(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _on_startup(self):
+        await self.bot.wait_until_ready()
+        try:
+            await self.map_legacy()
+            fixed = await self.reconcile()
+        except Exception as exc:
+            print(f"⚠️  Réconciliation des réactions KO : {exc!r}")
+            return
+        print(f"🔁 Réactions réconciliées : {fixed} évènement(s) corrigé(s)")
+
+    async def map_legacy(self) -> int:
+        """Convertit les inscriptions d'avant le passage aux ids (stockées par pseudo)."""
+        names = await self.engine.legacy_names()
+        guild = self.bot.get_guild(SERVER_ID)
+        if not names or guild is None:
+            return 0
+        moved = await self.engine.map_legacy_participants(legacy_mapping(guild.members, names))
+        print(f"🪪 {moved} inscription(s) par pseudo convertie(s) en ids Discord")
+        return moved
+
+    async def reconcile(self) -> int:
+        """Aligne la base sur les réactions des évènements à venir. Retourne le
+        nombre d'évènements corrigés."""
+        guild = self.bot.get_guild(SERVER_ID)
+        if guild is None:
+            return 0
+        sem = asyncio.Semaphore(RECONCILE_CONCURRENCY)
+
+        async def one(event: Dict) -> bool:
+            async with sem:
+                return await self._reconcile_event(guild, event)
+
+        events = await self.engine.live_events()
+        results = await asyncio.gather(*(one(ev) for ev in events), return_exceptions=True)
+        for ev, res in zip(events, results):
+            if isinstance(res, Exception):
+                print(f"⚠️  Réconciliation {ev['title']!r} KO : {res!r}")
+        return sum(res is True for res in results)
+
+    async def _reconcile_event(self, guild: discord.Guild, event: Dict) -> bool:
+        channel = self.bot.channel
+        try:
+            message = await channel.get_partial_message(int(event["msg_id"])).fetch()
+        except discord.NotFound:
+            return False
+
+        lists = {False: event["participants"], True: event["maybe_participants"]}
+        reactions = {str(r.emoji): r for r in message.reactions}
+
+        changes: List[Change] = []
+        for maybe, emoji in ((False, OK_EMOJI), (True, MAYBE_EMOJI)):
+            reaction = reactions.get(emoji)
+            count = reaction.count - reaction.me if reaction is not None else 0
+            if count == len(lists[maybe]):
+                continue                                # rien de manqué : pas d'appel REST
+
+            reacted: Set[int] = set()
+            if reaction is not None:
+                async for user in reaction.users(limit=None):
+                    if not user.bot:
+                        reacted.add(user.id)
+            changes += diff_participants(event["ctftime_id"], maybe, lists[maybe], reacted)
+
+        if not changes:
+            return False
+
+        # une transaction par évènement
+        await self.engine.apply_participant_changes(changes)
+        self._sync_roles(guild, message.id, changes)
+        return True
+
+    def _sync_roles(self, guild: discord.Guild, msg_id: int, changes: List[Change]):
+        ref = self.engine.lookup_message(msg_id)
+        role = event_role(guild, ref) if ref is not None else None
+        if role is None:
+            return
+        for maybe, _, user_id, add in changes:
+            if maybe:
+                continue
+            member = guild.get_member(user_id)
+            if member is not None:
+                scheduler.set_role(member, role, add=add, channel=self.bot.channel)
+
+    @commands.hybrid_command(
+        name="reconcile",
+        description="Réaligne les inscriptions sur les réactions des évènements à venir (admin).",
+        with_app_command=True,
+    )
+    @commands.has_permissions(administrator=True)
+    @app_commands.default_permissions(administrator=True)
+    async def reconcile_cmd(self, ctx: commands.Context):
+        await ctx.defer(ephemeral=True)
+        fixed = await self.reconcile()
+        await ctx.reply(f"🔁 {fixed} évènement(s) corrigé(s).", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Reconcile(bot, bot.engine))
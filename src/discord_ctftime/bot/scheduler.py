@@ -0,0 +1,138 @@
+from __future__ import annotations
+import asyncio
+import os
+from functools import partial
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+import discord
+
+T = TypeVar("T")
+
+ROLE_FLUSH_DELAY = float(os.getenv("ROLE_FLUSH_DELAY", 1.0))   # secondes de regroupement par membre
+MAX_INFLIGHT     = 4                                           # appels REST simultanés, toutes routes
+
+
+class ActionScheduler:
+    """File d'actions Discord **par route** (salon, membre, guilde).
+
+    * les actions d'une même route passent une par une, dans l'ordre : on
+      ne presse pas un bucket de rate-limit déjà saturé ;
+    * au plus ``MAX_INFLIGHT`` routes travaillent en même temps ;
+    * les changements de rôles d'un membre sont regroupés pendant
+      ``role_delay`` puis appliqués en ne gardant que l'état final (ajout
+      puis retrait → rien) : un appel ``add_roles`` et / ou un appel
+      ``remove_roles`` avec le seul delta, sans toucher aux autres rôles
+      du membre (modifiés en parallèle par un admin ou un autre bot).
+    """
+
+    def __init__(self, role_delay: float = ROLE_FLUSH_DELAY, max_inflight: int = MAX_INFLIGHT):
+        self._role_delay = role_delay
+        self._sem: asyncio.Semaphore | None = None
+        self._max_inflight = max_inflight
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # (guild_id, member_id) → {role_id: True (ajout) / False (retrait)}
+        self._roles: Dict[Tuple[int, int], Dict[int, bool]] = {}
+        self._timers: Dict[Tuple[int, int], Tuple[asyncio.TimerHandle, discord.Guild]] = {}
+        # salon à prévenir si le bot n'a pas les permissions
+        self._channels: Dict[Tuple[int, int], discord.abc.Messageable] = {}
+
+    # ------------------------------------------------------------------ actions génériques
+    def submit(self, route: str, action: Callable[[], Awaitable[T]]) -> asyncio.Future[T]:
+        """Met *action* en file sur *route* ; le futur porte son résultat ou son exception."""
+        loop = asyncio.get_running_loop()
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self._max_inflight)
+        future = loop.create_future()
+        queue = self._queues.setdefault(route, asyncio.Queue())
+        queue.put_nowait((action, future))
+        if route not in self._workers:
+            self._workers[route] = loop.create_task(self._worker(route, queue))
+        return future
+
+    async def _worker(self, route: str, queue: asyncio.Queue) -> None:
+        try:
+            while not queue.empty():
+                action, future = queue.get_nowait()
+                async with self._sem:
+                    try:
+                        result = await action()
+                    except Exception as exc:
+                        if not future.cancelled():
+                            future.set_exception(exc)
+                            future.exception()       # pas d'avertissement si personne n'attend
+                        print(f"⚠️  Action Discord {route} KO : {exc!r}")
+                    else:
+                        if not future.cancelled():
+                            future.set_result(result)
+        finally:
+            # route vide : le worker s'arrête, il sera recréé à la prochaine action
+            self._workers.pop(route, None)
+            if queue.empty():
+                self._queues.pop(route, None)
+
+    def add_reactions(self, message: discord.Message, emojis) -> None:
+        """Ajoute les réactions dans l'ordre, sans faire attendre l'appelant."""
+        route = f"reactions:{message.channel.id}"
+        for emoji in emojis:
+            self.submit(route, partial(message.add_reaction, emoji))
+
+    # ------------------------------------------------------------------ rôles
+    def set_role(
+        self,
+        member: discord.Member,
+        role: discord.abc.Snowflake,
+        add: bool,
+        channel: discord.abc.Messageable | None = None,
+    ) -> None:
+        """Demande l'ajout / le retrait de *role* ; appliqué après regroupement.
+
+        En cas de ``discord.Forbidden``, *channel* (si fourni) est prévenu.
+        """
+        key = (member.guild.id, member.id)
+        self._roles.setdefault(key, {})[role.id] = add
+        if channel is not None:
+            self._channels[key] = channel
+        if key not in self._timers:
+            loop = asyncio.get_running_loop()
+            handle = loop.call_later(self._role_delay, self._schedule_roles, member.guild, member.id)
+            self._timers[key] = (handle, member.guild)
+
+    def _schedule_roles(self, guild: discord.Guild, member_id: int) -> None:
+        self._timers.pop((guild.id, member_id), None)
+        self.submit(f"member:{guild.id}:{member_id}", partial(self._apply_roles, guild, member_id))
+
+    async def _apply_roles(self, guild: discord.Guild, member_id: int) -> None:
+        wanted = self._roles.pop((guild.id, member_id), {})
+        channel = self._channels.pop((guild.id, member_id), None)
+        member = guild.get_member(member_id)
+        if member is None or not wanted:
+            return
+
+        current = {r.id for r in member.roles}
+        to_add = [discord.Object(id=rid) for rid, add in wanted.items() if add and rid not in current]
+        to_remove = [discord.Object(id=rid) for rid, add in wanted.items() if not add and rid in current]
+        try:
+            if to_add:
+                await member.add_roles(*to_add, reason="Inscriptions CTF")
+            if to_remove:
+                await member.remove_roles(*to_remove, reason="Inscriptions CTF")
+        except discord.Forbidden:
+            if channel is not None:
+                self.submit(
+                    f"messages:{channel.id}",
+                    partial(channel.send, "❌ Erreur perms BOT. Veuillez Contacter @lululufr", delete_after=30),
+                )
+            raise
+
+    # ------------------------------------------------------------------ arrêt
+    async def close(self) -> None:
+        """Applique tout de suite les rôles en attente puis attend la fin des files."""
+        for (_, member_id), (timer, guild) in list(self._timers.items()):
+            timer.cancel()
+            self._schedule_roles(guild, member_id)
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+
+scheduler = ActionScheduler()
@@ -0,0 +1,145 @@
+import discord
+import logging
+import time
+from discord import app_commands
+from discord.ext import commands
+
+from src.discord_ctftime.ctftime import cache_stats
+from src.discord_ctftime.metrics import (
+    COMMAND_ERRORS,
+    COMMAND_LATENCY,
+    CTFTIME_LATENCY,
+    DISCORD_RATE_LIMITED,
+    DISCORD_REST_LATENCY,
+    ENGINE_LATENCY,
+    ENGINE_QUERIES,
+    REACTION_LATENCY,
+    Histogram,
+)
+from src.discord_ctftime.metrics.server import start_server
+
+import os
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9108))     # 0 = pas d'endpoint HTTP
+
+TOP = 8                                                 # lignes max par section de /stats
+
+
+class _RateLimitCounter(logging.Handler):
+    """discord.py ne remonte les 429 que dans ses logs : on les compte au passage."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = record.getMessage()
+        if "responded with 429" in msg:
+            DISCORD_RATE_LIMITED.inc(scope="route")
+        elif "Global rate limit has been hit" in msg:
+            DISCORD_RATE_LIMITED.inc(scope="global")
+
+
+def _summary(hist: Histogram) -> str:
+    """Séries les plus sollicitées : appels, moyenne et p95 (borne de bucket)."""
+    rows = []
+    for labels, n, total in sorted(hist.snapshot(), key=lambda s: -s[1])[:TOP]:
+        p95 = hist.quantile(0.95, **labels)
+        rows.append(
+            f"`{' '.join(labels.values())}` ×{n} • moy {total / n * 1000:.0f} ms • p95 ≤ {p95 * 1000:.0f} ms"
+        )
+    return "\n".join(rows)[:1024] or "—"
+
+
+class Stats(commands.Cog):
+    """Métriques d'exécution : endpoint Prometheus local et commande /stats."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._runner = None
+        self._log_handler = _RateLimitCounter(logging.WARNING)
+        self._http_request = None
+
+    async def cog_load(self):
+        self._instrument_http()
+        logging.getLogger("discord.http").addHandler(self._log_handler)
+        if METRICS_PORT:
+            try:
+                self._runner = await start_server(METRICS_HOST, METRICS_PORT)
+            except OSError as exc:
+                print(f"⚠️  Endpoint métriques KO ({METRICS_HOST}:{METRICS_PORT}) : {exc!r}")
+
+    async def cog_unload(self):
+        logging.getLogger("discord.http").removeHandler(self._log_handler)
+        if self._http_request is not None:
+            self.bot.http.request = self._http_request
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def _instrument_http(self) -> None:
+        """Chronomètre chaque appel REST Discord, étiqueté par route (gabarit d'URL)."""
+        original = self._http_request = self.bot.http.request
+
+        async def request(route, **kwargs):
+            start, status = time.perf_counter(), "ok"
+            try:
+                return await original(route, **kwargs)
+            except discord.HTTPException as exc:
+                status = exc.status
+                raise
+            finally:
+                DISCORD_REST_LATENCY.observe(
+                    time.perf_counter() - start, method=route.method, route=route.path, status=status
+                )
+
+        self.bot.http.request = request
+
+    # ------------------------------------------------------------------ commandes hybrides
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context):
+        ctx._started_at = time.perf_counter()
+
+    def _observe(self, ctx: commands.Context) -> None:
+        started = getattr(ctx, "_started_at", None)
+        if started is not None and ctx.command is not None:
+            COMMAND_LATENCY.observe(time.perf_counter() - started, command=ctx.command.qualified_name)
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context):
+        self._observe(ctx)
+
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx: commands.Context, error: commands.CommandError):
+        self._observe(ctx)
+        if ctx.command is not None:
+            COMMAND_ERRORS.inc(command=ctx.command.qualified_name, error=type(error).__name__)
+
+    @commands.hybrid_command(
+        name="stats",
+        description="Métriques d'exécution du bot (admin).",
+        with_app_command=True,
+    )
+    @commands.has_permissions(administrator=True)
+    @app_commands.default_permissions(administrator=True)
+    async def stats_cmd(self, ctx: commands.Context):
+        embed = discord.Embed(title="📈 Métriques du bot", colour=discord.Colour.dark_teal())
+        embed.add_field(name="Commandes", value=_summary(COMMAND_LATENCY), inline=False)
+        embed.add_field(name="Réactions", value=_summary(REACTION_LATENCY), inline=False)
+        embed.add_field(name="Engine", value=_summary(ENGINE_LATENCY), inline=False)
+
+        queries = sorted(dict(ENGINE_QUERIES.values).items(), key=lambda kv: -kv[1])[:TOP]
+        embed.add_field(
+            name="Requêtes SQL",
+            value="\n".join(f"`{dict(k)['method']}` ×{v:.0f}" for k, v in queries) or "—",
+            inline=False,
+        )
+        embed.add_field(name="ctftime.org", value=_summary(CTFTIME_LATENCY), inline=False)
+        embed.add_field(name="API Discord", value=_summary(DISCORD_REST_LATENCY), inline=False)
+
+        cache = cache_stats()
+        limited = sum(dict(DISCORD_RATE_LIMITED.values).values())
+        embed.set_footer(
+            text=f"429 Discord : {limited:.0f} • cache ctftime : "
+                 f"{cache['hits']} hits / {cache['misses']} misses"
+        )
+        await ctx.reply(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Stats(bot))
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import discord
+from discord import app_commands
+
+TREE_HASH_PATH = Path(os.getenv("TREE_HASH_PATH", "data/command_tree.sha1"))
+
+
+def _payload(command, tree: app_commands.CommandTree) -> dict:
+    try:
+        return command.to_dict(tree)
+    except TypeError:                      # discord.py < 2.4 : to_dict() sans argument
+        return command.to_dict()
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    """Empreinte de ce que ``tree.sync(guild=...)`` enverrait à Discord."""
+    commands = sorted(
+        (_payload(cmd, tree) for cmd in tree.get_commands(guild=guild)),
+        key=lambda c: (c.get("type", 1), c["name"]),
+    )
+    blob = json.dumps({"guild": guild.id, "commands": commands}, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree, guild: discord.abc.Snowflake, path: Path = TREE_HASH_PATH
+) -> bool:
+    """Synchronise l'arbre de commandes seulement s'il a changé depuis le dernier
+    démarrage (empreinte conservée dans *path*). Retourne ``True`` si sync il y a eu.
+    """
+    digest = tree_hash(tree, guild)
+    try:
+        if path.read_text().strip() == digest:
+            return False
+    except OSError:
+        pass
+
+    await tree.sync(guild=guild)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(digest)
+    return True
@@ -1,4 +1,18 @@
 from .ctftime import CTFtime
+from .extract import EventAttributes, extract_attributes
+from .http import open_client, close_client, cache_stats
+from .bulk import CircuitOpenError, FetchResult, fetch_one, fetch_many
 
 
-__all__ = ["CTFtime"]
+__all__ = [
+    "CTFtime",
+    "EventAttributes",
+    "extract_attributes",
+    "open_client",
+    "close_client",
+    "cache_stats",
+    "CircuitOpenError",
+    "FetchResult",
+    "fetch_one",
+    "fetch_many",
+]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterable
+
+import httpx
+
+from .ctftime import CTFtime
+
+RATE_PER_SEC = float(os.getenv("CTFTIME_RATE", 2))     # requêtes / seconde vers ctftime.org
+BURST = int(os.getenv("CTFTIME_BURST", 5))
+CALL_COST = 2                                          # jetons par évènement : API + page HTML
+CONCURRENCY = int(os.getenv("CTFTIME_CONCURRENCY", 4))
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0                                     # secondes
+BREAKER_THRESHOLD = 5                                  # échecs consécutifs avant ouverture
+BREAKER_RESET = 60.0                                   # secondes avant nouvel essai
+
+# codes qui valent un nouvel essai (et comptent comme une panne de ctftime.org)
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """ctftime.org échoue en boucle : les appels sont suspendus un moment."""
+
+
+class TokenBucket:
+    """Limiteur de débit : *rate* jetons par seconde, au plus *capacity* d'avance."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        if tokens > self.capacity:
+            # le seau ne se remplirait jamais assez : attente infinie
+            raise ValueError(f"{tokens} jetons demandés pour une capacité de {self.capacity}")
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Disjoncteur : ouvert après *threshold* échecs consécutifs. Les appels
+    reprennent après *reset_after* secondes ; le moindre nouvel échec le rouvre
+    aussitôt, un succès le referme (« semi-ouvert »)."""
+
+    def __init__(self, threshold: int, reset_after: float):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_after
+
+    def check(self) -> None:
+        if self.is_open:
+            raise CircuitOpenError("ctftime.org indisponible, nouvel essai plus tard.")
+
+    def success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+
+bucket = TokenBucket(RATE_PER_SEC, max(BURST, CALL_COST))
+breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET)
+
+
+@dataclass
+class FetchResult:
+    ctftime_id: int | str
+    ctf: CTFtime | None = None
+    event: Any = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _retry_delay(attempt: int, exc: BaseException) -> float:
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    # backoff exponentiel avec « full jitter »
+    return random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+async def fetch_one(ctftime_id: int | str, retries: int = MAX_RETRIES) -> FetchResult:
+    """Récupère un évènement (API + page) via le limiteur, le disjoncteur et les nouveaux essais.
+
+    Ne lève pas : l'erreur éventuelle est portée par ``FetchResult.error``.
+    """
+    try:
+        ctf = CTFtime(ctftime_id)
+    except ValueError as exc:
+        return FetchResult(ctftime_id, error=exc)
+
+    for attempt in range(retries + 1):
+        try:
+            breaker.check()
+            await bucket.acquire(CALL_COST)
+            event = await ctf.fetch()
+        except CircuitOpenError as exc:
+            return FetchResult(ctf.ctftime_id, error=exc)
+        except Exception as exc:
+            if not _is_transient(exc):
+                # 404 & co : l'évènement n'existe pas, ctftime.org va bien
+                return FetchResult(ctf.ctftime_id, error=exc)
+            breaker.failure()
+            if attempt == retries:
+                return FetchResult(ctf.ctftime_id, error=exc)
+            await asyncio.sleep(_retry_delay(attempt, exc))
+        else:
+            breaker.success()
+            return FetchResult(ctf.ctftime_id, ctf=ctf, event=event)
+    raise AssertionError("unreachable")
+
+
+async def fetch_many(
+    ctftime_ids: Iterable[int | str], concurrency: int = CONCURRENCY
+) -> AsyncIterator[FetchResult]:
+    """Récupère de nombreux évènements avec une concurrence bornée.
+
+    Les résultats sont produits **au fil de l'eau**, dans l'ordre d'arrivée.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(cid: int | str) -> FetchResult:
+        async with sem:
+            return await fetch_one(cid)
+
+    tasks = [asyncio.ensure_future(one(cid)) for cid in dict.fromkeys(ctftime_ids)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Set
+
+import httpx
+
+from src.discord_ctftime.event.pool import ConnectionPool
+
+CACHE_PATH = Path(os.getenv("CTFTIME_CACHE_PATH", "data/ctftime_cache.sqlite"))
+CACHE_MAX_BYTES = int(os.getenv("CTFTIME_CACHE_MAX_MB", 50)) * 1024 * 1024
+
+# durée de fraîcheur par type de ressource (secondes)
+TTLS: Dict[str, int] = {
+    "api_event": 60 * 60,          # JSON de l'API : 1 h
+    "event_page": 6 * 60 * 60,     # page HTML : 6 h
+}
+# au-delà du TTL, on sert encore la copie périmée pendant ce délai en revalidant en fond
+STALE_FOR = 24 * 60 * 60
+
+# URL → (type, identifiant)
+_ROUTES = (
+    ("api_event", re.compile(r"^/api/v1/events/(\d+)/?$")),
+    ("event_page", re.compile(r"^/event/(\d+)/?$")),
+)
+
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+# le corps est déjà décodé par aread() : ces en-têtes ne s'appliquent plus
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class Entry:
+    body: bytes
+    headers: Dict[str, str]
+    fetched_at: float
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def route(url: httpx.URL) -> tuple[str, str] | None:
+    """Retourne ``(type, clé)`` pour une URL ctftime.org cachable, sinon ``None``."""
+    if url.host != "ctftime.org":
+        return None
+    for kind, pattern in _ROUTES:
+        m = pattern.match(url.path)
+        if m:
+            return kind, f"{kind}:{m.group(1)}"
+    return None
+
+
+class ResponseCache:
+    """Cache disque (SQLite) des réponses ctftime.org, évincé en LRU au-delà de *max_bytes*."""
+
+    _TABLE = "http_cache"
+
+    def __init__(self, db_path: Path | str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.stats: Counter[str] = Counter()
+        self._pool = ConnectionPool()
+        self._ready = False
+
+    def _conn(self):
+        # ouverture + schéma au premier accès, depuis le thread appelant
+        # (asyncio.to_thread) : rien de bloquant au démarrage sur la boucle
+        conn = self._pool.get(self.db_path)
+        if not self._ready:
+            with conn:
+                conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self._TABLE} (
+                        key         TEXT PRIMARY KEY,
+                        body        BLOB,
+                        headers     TEXT,
+                        fetched_at  REAL,
+                        accessed_at REAL,
+                        size        INTEGER
+                    )
+                    """
+                )
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self._TABLE}_lru ON {self._TABLE}(accessed_at)"
+                )
+            self._ready = True
+        return conn
+
+    def get(self, key: str) -> Entry | None:
+        with self._conn() as conn:
+            row = conn.execute(
+                f"SELECT body, headers, fetched_at FROM {self._TABLE} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE {self._TABLE} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return Entry(row["body"], json.loads(row["headers"]), row["fetched_at"])
+
+    def put(self, key: str, body: bytes, headers: Dict[str, str]) -> int:
+        """Enregistre la réponse ; retourne le nombre d'entrées évincées."""
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {self._TABLE}
+                    (key, body, headers, fetched_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, body, json.dumps(headers), now, now, len(body)),
+            )
+            return self._evict(conn)
+
+    def touch(self, key: str) -> None:
+        """Réponse 304 : la copie redevient fraîche."""
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                f"UPDATE {self._TABLE} SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def _evict(self, conn) -> int:
+        # tourne sur un thread : ``stats`` n'est touché que depuis la boucle
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self._TABLE}").fetchone()[0]
+        evicted = 0
+        if total <= self.max_bytes:
+            return evicted
+        for row in conn.execute(
+            f"SELECT key, size FROM {self._TABLE} ORDER BY accessed_at"
+        ).fetchall():
+            conn.execute(f"DELETE FROM {self._TABLE} WHERE key = ?", (row["key"],))
+            evicted += 1
+            total -= row["size"]
+            if total <= self.max_bytes:
+                break
+        return evicted
+
+    def close(self) -> None:
+        self._pool.close_all()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Transport httpx placé devant ctftime.org : TTL par type, revalidation
+    conditionnelle (ETag / If-Modified-Since) et *stale-while-revalidate*.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self._inner = inner
+        self.cache = cache
+        self._revalidating: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        routed = route(request.url) if request.method == "GET" else None
+        if routed is None:
+            return await self._inner.handle_async_request(request)
+
+        kind, key = routed
+        entry = await asyncio.to_thread(self.cache.get, key)
+        stats = self.cache.stats
+
+        if entry is not None:
+            if entry.age() < TTLS[kind]:
+                stats["hits"] += 1
+                return self._response(request, entry)
+            if entry.age() < TTLS[kind] + STALE_FOR:
+                stats["stale_hits"] += 1
+                self._revalidate_later(request, key, entry)
+                return self._response(request, entry)
+
+        stats["misses"] += 1
+        try:
+            return await self._fetch(request, key, entry)
+        except httpx.TransportError:
+            if entry is None:
+                raise
+            # ctftime.org injoignable : mieux vaut une copie ancienne que rien
+            stats["stale_on_error"] += 1
+            return self._response(request, entry)
+
+    async def _fetch(self, request: httpx.Request, key: str, entry: Entry | None) -> httpx.Response:
+        if entry is not None:
+            if "etag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["last-modified"]
+
+        resp = await self._inner.handle_async_request(request)
+        body = await resp.aread()
+        await resp.aclose()
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.stats["revalidated"] += 1
+            await asyncio.to_thread(self.cache.touch, key)
+            return self._response(request, entry)
+
+        if resp.status_code == 200:
+            headers = {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers}
+            self.cache.stats["evictions"] += await asyncio.to_thread(self.cache.put, key, body, headers)
+
+        headers = [(k, v) for k, v in resp.headers.multi_items() if k.lower() not in _DROPPED_HEADERS]
+        return httpx.Response(resp.status_code, headers=headers, content=body, request=request)
+
+    def _revalidate_later(self, request: httpx.Request, key: str, entry: Entry) -> None:
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        async def run():
+            try:
+                await self._fetch(httpx.Request("GET", request.url, headers=request.headers), key, entry)
+            except Exception as exc:
+                print(f"⚠️  Revalidation {key} KO : {exc!r}")
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _response(request: httpx.Request, entry: Entry) -> httpx.Response:
+        headers = {k: v for k, v in entry.headers.items() if k == "content-type"}
+        # servi depuis le disque : distingué dans les métriques de latence
+        return httpx.Response(
+            200, headers=headers, content=entry.body, request=request,
+            extensions={"ctftime_cache": "hit"},
+        )
+
+    async def aclose(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await self._inner.aclose()
+        await asyncio.to_thread(self.cache.close)
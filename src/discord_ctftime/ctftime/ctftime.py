@@ -1,66 +1,58 @@
+import asyncio
 
-from ctftime_api.client import CTFTimeClient
-
-import requests
-
-from bs4 import BeautifulSoup
+from .extract import EventAttributes, extract_attributes_async
+from .http import get_client
 
 class CTFtime:
     def __init__(self, ctftime_id: int):
         self.ctftime_id = int(ctftime_id)
 
         # pour les infos solo et online  ( non présent dansz l'api)
-        self.resp = requests.get(f"https://ctftime.org/event/{self.ctftime_id}", timeout=10)
+        # rempli par fetch() ; None si la page n'a pas pu être récupérée
+        self.page: str | None = None
+        self.attributes = EventAttributes()
+
 
+    async def _fetch_page(self) -> str:
+        resp = await get_client().get(f"https://ctftime.org/event/{self.ctftime_id}")
+        resp.raise_for_status()
+        return resp.text
 
     async def fetch(self):
-        client = CTFTimeClient()
-        try:
-            event = await client.get_event_information(self.ctftime_id)
-            return event
-        finally:
-            if hasattr(client, "aclose"):
-                await client.aclose()
-            else:
-                await client.close()
+        from ctftime_api.client import CTFTimeClient  # import paresseux (pydantic & co)
 
+        # le client API réutilise la session partagée : ne surtout pas le fermer ici
+        client = CTFTimeClient(client=get_client())
 
+        # API et page HTML en parallèle
+        event, page = await asyncio.gather(
+            client.get_event_information(self.ctftime_id),
+            self._fetch_page(),
+            return_exceptions=True,
+        )
+        if isinstance(event, BaseException):
+            raise event
 
-    # verifier si ces infos sont présente dans les infos de la lib
-    def solo(self):
-        TARGET_TEXT = "This event is limited to individual participation! No global rating points."
-        try:
-            self.resp.raise_for_status()          
-        except requests.RequestException:
+        if isinstance(page, BaseException):
             #TODO a gerer
-            return False
-
-        soup = BeautifulSoup(self.resp.text, "html.parser")
+            print(f"⚠️  Page CTFtime {self.ctftime_id} indisponible : {page!r}")
+            self.page = None
+        else:
+            self.page = page
+            # une seule analyse HTML, dans un thread de travail
+            self.attributes = await extract_attributes_async(page)
+        return event
 
-        for p in soup.find_all("p"):
-            b = p.find("b")
-            if b and TARGET_TEXT in b.get_text(strip=True):
-                return True
-        return False
 
-    def online(self):
-        TARGET_TEXT = "On-line"
-        try:
-            self.resp.raise_for_status()          
-        except requests.RequestException:
-            #TODO a gerer
-            return False
 
-        soup = BeautifulSoup(self.resp.text, "html.parser")
+    # infos absentes de l'API, extraites de la page (voir extract.py)
+    def solo(self):
+        return self.attributes.solo
 
-        for p in soup.find_all("p"):
-            b = p.find("b")
-            if b and TARGET_TEXT in b.get_text(strip=True):
-                return True
-        return False
+    def online(self):
+        return self.attributes.online
 
 
     @property
     def get(self):
         return self
-
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import asyncio
+import importlib.util
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict
+
+# lxml est nettement plus rapide que html.parser quand il est installé
+PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+SOLO_TEXT = "This event is limited to individual participation! No global rating points."
+ONLINE_TEXT = "On-line"
+
+
+@lru_cache(maxsize=1)
+def _only_p():
+    # seules les balises <p> portent les infos utiles de la page évènement
+    from bs4 import SoupStrainer
+    return SoupStrainer("p")
+
+
+@dataclass(frozen=True)
+class EventAttributes:
+    """Infos de la page CTFtime absentes de l'API."""
+    solo: bool = False
+    online: bool = False
+    format: str | None = None
+    location: str | None = None
+    rating_weight: float | None = None
+    official_url: str | None = None
+    # toutes les lignes « Libellé: valeur » trouvées, pour les besoins futurs
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+def extract_attributes(html: str) -> EventAttributes:
+    """Analyse la page évènement **une seule fois** et en extrait les attributs."""
+    from bs4 import BeautifulSoup  # import paresseux : inutile tant qu'aucune page n'est lue
+
+    soup = BeautifulSoup(html, PARSER, parse_only=_only_p())
+
+    solo = online = False
+    location: str | None = None
+    fields: Dict[str, str] = {}
+    official_url: str | None = None
+
+    for p in soup.find_all("p"):
+        b = p.find("b")
+        if b is not None:
+            bold = b.get_text(strip=True)
+            if SOLO_TEXT in bold:
+                solo = True
+            elif ONLINE_TEXT in bold:
+                online = True
+            elif location is None and p.get_text(strip=True) == bold:
+                # <p><b>Ville, Pays</b></p> : lieu des évènements présentiels
+                location = bold
+            continue
+
+        text = p.get_text(" ", strip=True)
+        label, sep, value = text.partition(":")
+        if sep and label and len(label) < 40:
+            fields[label.strip()] = value.strip()
+            if label.strip() == "Official URL":
+                a = p.find("a")
+                official_url = a.get("href") if a is not None else value.strip() or None
+
+    weight: float | None = None
+    raw_weight = fields.get("Rating weight", "").split(" ")[0]
+    try:
+        weight = float(raw_weight) if raw_weight else None
+    except ValueError:
+        weight = None
+
+    return EventAttributes(
+        solo=solo,
+        online=online,
+        format=fields.get("Format") or None,
+        location=None if online else location,
+        rating_weight=weight,
+        official_url=official_url,
+        fields=fields,
+    )
+
+
+async def extract_attributes_async(html: str) -> EventAttributes:
+    """Variante hors boucle d'évènements (thread de travail)."""
+    return await asyncio.to_thread(extract_attributes, html)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import time
+from collections import Counter
+
+import httpx
+
+from src.discord_ctftime.metrics import CTFTIME_CACHE, CTFTIME_LATENCY, register_collector
+
+from .cache import CachingTransport, ResponseCache, route
+
+# Session HTTP unique (keep-alive + pool de connexions) partagée par le client
+# de l'API CTFtime et la récupération des pages HTML.
+_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30)
+_TIMEOUT = httpx.Timeout(10.0)
+_HEADERS = {"User-Agent": "discord-ctftime (+https://github.com/lululufr/Discord_CTFtime_event)"}
+
+_client: httpx.AsyncClient | None = None
+_transport: CachingTransport | None = None
+
+
+async def _on_request(request: httpx.Request) -> None:
+    request.extensions["started_at"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    request = response.request
+    started = request.extensions.get("started_at")
+    if started is None:
+        return
+    routed = route(request.url)
+    CTFTIME_LATENCY.observe(
+        time.perf_counter() - started,
+        kind=routed[0] if routed else "other",
+        status=response.status_code,
+        cache=response.extensions.get("ctftime_cache", "miss"),
+    )
+
+
+def open_client() -> httpx.AsyncClient:
+    """Ouvre (si besoin) et retourne la session partagée, cache disque compris."""
+    global _client, _transport
+    if _client is None or _client.is_closed:
+        _transport = CachingTransport(httpx.AsyncHTTPTransport(limits=_LIMITS), ResponseCache())
+        _client = httpx.AsyncClient(
+            transport=_transport,
+            timeout=_TIMEOUT,
+            headers=_HEADERS,
+            follow_redirects=True,
+            event_hooks={"request": [_on_request], "response": [_on_response]},
+        )
+    return _client
+
+
+def get_client() -> httpx.AsyncClient:
+    return open_client()
+
+
+def cache_stats() -> Counter[str]:
+    """Compteurs du cache (hits, misses, stale_hits, revalidated, evictions…)."""
+    return _transport.cache.stats if _transport is not None else Counter()
+
+
+def _collect_cache_stats() -> None:
+    for name, value in cache_stats().items():
+        CTFTIME_CACHE.set(value, event=name)
+
+
+register_collector(_collect_cache_stats)
+
+
+async def close_client() -> None:
+    """Ferme la session partagée (arrêt du bot)."""
+    global _client, _transport
+    if _client is not None:
+        await _client.aclose()
+        _client = _transport = None
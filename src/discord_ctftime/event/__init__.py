@@ -1,2 +1,3 @@
-from .engine import Engine
-__all__ = ["Engine"]
+from .engine import Engine, EventRef
+from .async_engine import AsyncEngine
+__all__ = ["Engine", "EventRef", "AsyncEngine"]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, TypeVar
+
+from src.discord_ctftime.metrics import ENGINE_LATENCY, set_current_method
+
+from .engine import Engine, EventRef
+from .write_behind import ParticipantWriteBehind
+
+T = TypeVar("T")
+
+READ_WORKERS = int(os.getenv("DB_READ_WORKERS", 4))
+FLUSH_DELAY = float(os.getenv("PARTICIPANT_FLUSH_DELAY", 0.5))   # secondes
+
+
+def _traced(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # étiquette les requêtes SQL du thread avec la méthode Engine appelée
+    set_current_method(name)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        set_current_method(None)
+
+
+class AsyncEngine:
+    """Façade asynchrone d'``Engine`` pour la boucle d'évènements Discord.
+
+    * les lectures tournent sur un pool borné de ``READ_WORKERS`` threads ;
+    * les écritures sont sérialisées sur **un seul** thread écrivain
+      (SQLite n'accepte qu'un écrivain à la fois, inutile de se battre pour le verrou).
+
+    Chaque thread garde sa propre connexion grâce au pool d'``Engine``.
+
+    Les (dés)inscriptions issues des réactions passent par une file
+    d'écriture différée (``flush_delay``) ; toute lecture vide d'abord cette
+    file pour que les commandes voient leurs propres écritures.
+    """
+
+    def __init__(
+        self,
+        engine: type[Engine] = Engine,
+        read_workers: int = READ_WORKERS,
+        flush_delay: float = FLUSH_DELAY,
+    ):
+        self._engine = engine
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._pending = ParticipantWriteBehind(self._apply_changes, flush_delay)
+
+    async def _run(self, executor: ThreadPoolExecutor, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        name = getattr(fn, "__name__", "engine")
+        # attente du thread comprise : c'est la latence vue par le bot
+        with ENGINE_LATENCY.time(method=name):
+            return await loop.run_in_executor(executor, partial(_traced, name, fn, *args, **kwargs))
+
+    async def _read(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # toujours : le verrou attend aussi un lot déjà en cours d'écriture
+        await self._pending.flush()         # read-your-writes
+        return await self._run(self._readers, fn, *args, **kwargs)
+
+    async def _write(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        await self._pending.flush()         # conserve l'ordre des écritures
+        return await self._run(self._writer, fn, *args, **kwargs)
+
+    async def _apply_changes(self, changes) -> None:
+        await self._run(self._writer, self._engine.apply_participant_changes, changes)
+
+    async def flush(self) -> None:
+        """Force l'écriture des inscriptions en attente."""
+        await self._pending.flush()
+
+    # ------------------------------------------------------------------ schéma
+    async def migrate(self) -> int:
+        return await self._write(self._engine.migrate)
+
+    # ------------------------------------------------------------------ index mémoire
+    def lookup_message(self, msg_id: int | str) -> EventRef | None:
+        # pur dictionnaire : pas besoin de passer par un thread
+        return self._engine.lookup_message(msg_id)
+
+    async def load_index(self) -> int:
+        return await self._read(self._engine.load_index)
+
+    # ------------------------------------------------------------------ lectures
+    async def existe(self, identifier: str | int) -> bool:
+        return await self._read(self._engine.existe, identifier)
+
+    async def get_event_info(self, identifier: int | str) -> Dict[str, Any]:
+        return await self._read(self._engine.get_event_info, identifier)
+
+    async def next_event(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._read(self._engine.next_event, **kwargs)
+
+    async def calendar_next_30_days(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await self._read(self._engine.calendar_next_30_days, **kwargs)
+
+    async def agenda_page(self, after: tuple[int, str], until_ts: int, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._read(self._engine.agenda_page, after, until_ts, limit)
+
+    async def feed_state(self, url: str) -> tuple[str | None, str | None]:
+        return await self._read(self._engine.feed_state, url)
+
+    async def unseen_guids(self, guids: List[str]) -> List[str]:
+        return await self._read(self._engine.unseen_guids, guids)
+
+    async def existing_ids(self, ctftime_ids: List[str | int]) -> set[str]:
+        return await self._read(self._engine.existing_ids, ctftime_ids)
+
+    async def upcoming(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await self._read(self._engine.upcoming, **kwargs)
+
+    async def live_events(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await self._read(self._engine.live_events, **kwargs)
+
+    async def groups_to_clean(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return await self._read(self._engine.groups_to_clean, limit)
+
+    # ------------------------------------------------------------------ écritures
+    async def new_events(self, events: List[Dict[str, Any]]) -> int:
+        return await self._write(self._engine.new_events, events)
+
+    async def upsert_upcoming(self, rows: List[Dict[str, Any]]) -> int:
+        return await self._write(self._engine.upsert_upcoming, rows)
+
+    async def save_feed_state(self, url: str, etag: str | None, last_modified: str | None) -> None:
+        await self._write(self._engine.save_feed_state, url, etag, last_modified)
+
+    async def new_event(self, **kwargs: Any) -> Engine:
+        return await self._write(self._engine.new_event, **kwargs)
+
+    async def apply_participant_changes(self, changes: List[tuple[bool, str, int, bool]]) -> None:
+        """Lot de (dés)inscriptions écrit tout de suite, en une transaction."""
+        await self._write(self._engine.apply_participant_changes, changes)
+
+    async def legacy_names(self) -> set[str]:
+        return await self._read(self._engine.legacy_names)
+
+    async def map_legacy_participants(self, ids_by_name: Dict[str, int]) -> int:
+        return await self._write(self._engine.map_legacy_participants, ids_by_name)
+
+    async def set_group(self, ctftime_id: str | int, role_id: int | None, channel_id: int | None) -> None:
+        await self._write(self._engine.set_group, ctftime_id, role_id, channel_id)
+
+    async def archive_ended(self, before: datetime) -> int:
+        return await self._write(self._engine.archive_ended, before)
+
+    async def mark_groups_cleaned(self, ctftime_ids: List[str]) -> None:
+        await self._write(self._engine.mark_groups_cleaned, ctftime_ids)
+
+    def toggle_participant(
+        self, msg_id: int | str, user_id: int, maybe: bool, add: bool
+    ) -> EventRef | None:
+        """Met la (dés)inscription en file et rend la main immédiatement."""
+        ref = self._engine.lookup_message(msg_id)
+        if ref is not None:
+            self._pending.enqueue(ref.ctftime_id, user_id, maybe, add)
+        return ref
+
+    async def add_participant(self, identifier: int | str, user_id: int) -> None:
+        await self._write(self._engine.add_participant, identifier, user_id)
+
+    async def remove_participant(self, identifier: int | str, user_id: int) -> None:
+        await self._write(self._engine.remove_participant, identifier, user_id)
+
+    async def add_maybe_participant(self, identifier: int | str, user_id: int) -> None:
+        await self._write(self._engine.add_maybe_participant, identifier, user_id)
+
+    async def remove_maybe_participant(self, identifier: int | str, user_id: int) -> None:
+        await self._write(self._engine.remove_maybe_participant, identifier, user_id)
+
+    # ------------------------------------------------------------------ cycle de vie
+    def close(self) -> None:
+        """Attend la fin des écritures en cours puis ferme les connexions.
+
+        Penser à ``await flush()`` avant : la file différée vit dans la boucle asyncio.
+        """
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        self._engine.close()
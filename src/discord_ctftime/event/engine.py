@@ -1,70 +1,143 @@
 from __future__ import annotations
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Dict, Any, List, ClassVar
+from typing import Callable, Iterable, Dict, Any, List, ClassVar, NamedTuple, Optional
 
 import os
-from dotenv import load_dotenv
 
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from dateutil import parser
 
-import re
+from src.discord_ctftime.metrics import count_statement
+from src.discord_ctftime.utils.dates import to_timestamp
+
+from .migrations import NAMED_TABLES, create_legacy_table, migrate, table_exists
+from .pool import ConnectionPool
+
+
+TZ_PARIS = ZoneInfo("Europe/Paris")
+
+
+def _to_timestamp(value: datetime | str | None) -> int | None:
+    """Convertit une date (datetime ou texte CTFtime) en epoch UTC, ``None`` si inconnue."""
+    return to_timestamp(value, TZ_PARIS)
+
+
+class EventRef(NamedTuple):
+    """Entrée de l'index mémoire ``msg_id → évènement``."""
+    ctftime_id: str
+    title: str
+    role_id: int | None = None
 
-load_dotenv()
 
 class Engine:
 
+    # le dossier parent est créé par le pool à la première connexion
     DB_PATH: ClassVar[Path] = Path(os.getenv("DB_PATH", "data/events.sqlite"))
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     _TABLE_EVENTS = "events"
     _TABLE_PARTICIPANTS = "participants"
     _TABLE_MAYBE = "maybe_participants"
+    _TABLE_UPCOMING = "upcoming"
+    _TABLE_RSS_SEEN = "rss_seen"
+    _TABLE_FEED_STATE = "feed_state"
+    # évènements terminés, sortis des tables « chaudes » par archive_ended
+    _TABLE_EVENTS_ARCHIVE = "events_archive"
+    _TABLE_PARTICIPANTS_ARCHIVE = "participants_archive"
+    _TABLE_MAYBE_ARCHIVE = "maybe_participants_archive"
+
+    _pool: ClassVar[ConnectionPool] = ConnectionPool(trace=count_statement)
+    _db_path: Path | None = None
+
+    # index chaud msg_id → EventRef, chargé au démarrage (load_index)
+    _msg_index: ClassVar[Dict[int, EventRef]] = {}
+
+    # callbacks appelés après chaque écriture (depuis le thread écrivain)
+    _listeners: ClassVar[List[Callable[[], None]]] = []
 
 
     @staticmethod
     def _connection(db_path: Path | str | None = None) -> sqlite3.Connection:
-        conn = sqlite3.connect(db_path or Engine.DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Connexion partagée (une par thread) issue du pool.
+
+        ``with conn:`` gère la transaction (commit / rollback) mais ne ferme
+        pas la connexion : c'est ``Engine.close`` qui s'en charge.
+        """
+        return Engine._pool.get(db_path or Engine.DB_PATH)
 
     @classmethod
-    def _ensure_schema(cls) -> None:
+    def on_change(cls, callback: Callable[[], None]) -> None:
+        """Enregistre *callback*, appelé après chaque écriture en base.
+
+        Il peut être appelé depuis un autre thread : il doit rester trivial
+        (lever un drapeau) et ne pas toucher à la boucle asyncio.
+        """
+        cls._listeners.append(callback)
+
+    @classmethod
+    def _notify(cls) -> None:
+        for callback in cls._listeners:
+            callback()
+
+    @classmethod
+    def close(cls) -> None:
+        """Ferme toutes les connexions SQLite du pool (arrêt du bot)."""
+        cls._pool.close_all()
+
+    @classmethod
+    def migrate(cls) -> int:
+        """Met le schéma à jour (``migrations.MIGRATIONS``) ; à appeler une fois
+        au démarrage, avant toute autre requête. Retourne le nombre de migrations appliquées."""
         with cls._connection() as conn:
-            conn.executescript(
-                f"""
-                CREATE TABLE IF NOT EXISTS {cls._TABLE_EVENTS} (
-                    ctftime_id  TEXT PRIMARY KEY,
-                    msg_id      TEXT UNIQUE,
-                    title       TEXT,
-                    url         TEXT,
-                    start       TEXT,
-                    end         TEXT,
-                    description TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS {cls._TABLE_PARTICIPANTS} (
-                    ctftime_id  TEXT,
-                    participant TEXT,
-                    PRIMARY KEY (ctftime_id, participant),
-                    FOREIGN KEY (ctftime_id) REFERENCES {cls._TABLE_EVENTS}(ctftime_id)
-                        ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS {cls._TABLE_MAYBE} (
-                    ctftime_id  TEXT,
-                    participant TEXT,
-                    PRIMARY KEY (ctftime_id, participant),
-                    FOREIGN KEY (ctftime_id) REFERENCES {cls._TABLE_EVENTS}(ctftime_id)
-                        ON DELETE CASCADE
-                );
-                """
-            )
-            conn.commit()
+            return migrate(conn)
+
+    # tables d'inscrits et leur copie « par pseudo » d'avant le passage aux ids
+    _NAMED_TABLES = NAMED_TABLES
 
+    @classmethod
+    def legacy_names(cls) -> set[str]:
+        """Pseudos encore stockés dans les tables ``*_legacy`` (à convertir)."""
+        names: set[str] = set()
+        with cls._connection() as conn:
+            for _, legacy in cls._NAMED_TABLES:
+                if table_exists(conn, legacy):
+                    names.update(r[0] for r in conn.execute(f"SELECT DISTINCT participant FROM {legacy}"))
+        return names
+
+    @classmethod
+    def map_legacy_participants(cls, ids_by_name: Dict[str, int]) -> int:
+        """Convertit les inscriptions par pseudo en ids Discord, en une transaction.
 
+        Les lignes converties quittent les tables ``*_legacy`` ; les pseudos
+        inconnus y restent (on pourra réessayer). Retourne le nombre de lignes converties.
+        """
+        if not ids_by_name:
+            return 0
+        moved = 0
+        with cls._connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _names (name TEXT PRIMARY KEY, user_id INTEGER)")
+            conn.execute("DELETE FROM _names")
+            conn.executemany("INSERT OR REPLACE INTO _names VALUES (?, ?)", ids_by_name.items())
+            for table, legacy in cls._NAMED_TABLES:
+                if not table_exists(conn, legacy):
+                    continue
+                # tables chaudes : clé étrangère, on écarte les évènements disparus
+                live = (
+                    f"JOIN {cls._TABLE_EVENTS} e ON e.ctftime_id = l.ctftime_id"
+                    if "archive" not in table else ""
+                )
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {table} (ctftime_id, user_id) "
+                    f"SELECT l.ctftime_id, n.user_id FROM {legacy} l "
+                    f"JOIN _names n ON n.name = l.participant {live}"
+                )
+                moved += conn.execute(
+                    f"DELETE FROM {legacy} WHERE participant IN (SELECT name FROM _names)"
+                ).rowcount
+                if not conn.execute(f"SELECT 1 FROM {legacy} LIMIT 1").fetchone():
+                    conn.execute(f"DROP TABLE {legacy}")
+        cls._notify()
+        return moved
 
     @classmethod
     def _resolve_ctftime(cls, identifier: str) -> str:
@@ -92,10 +165,10 @@ def _resolve_ctftime(cls, identifier: str) -> str:
         )
 
     @classmethod
-    def _participants(cls, table: str, ctftime_id: str) -> List[str]:
+    def _participants(cls, table: str, ctftime_id: str) -> List[int]:
         with cls._connection() as conn:
             rows = conn.execute(
-                f"SELECT participant FROM {table} WHERE ctftime_id = ?",
+                f"SELECT user_id FROM {table} WHERE ctftime_id = ?",
                 (ctftime_id,),
             ).fetchall()
             return sorted(r[0] for r in rows)
@@ -105,6 +178,36 @@ def _participants(cls, table: str, ctftime_id: str) -> List[str]:
     def __init__(self):
         pass
 
+    _UPSERT_EVENT = f"""
+        INSERT INTO {_TABLE_EVENTS} (
+            ctftime_id, msg_id, title, url, start, end, description,
+            start_ts, end_ts
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(ctftime_id) DO UPDATE SET
+            msg_id      = excluded.msg_id,
+            title       = excluded.title,
+            url         = excluded.url,
+            start       = excluded.start,
+            end         = excluded.end,
+            description = excluded.description,
+            start_ts    = excluded.start_ts,
+            end_ts      = excluded.end_ts
+    """
+
+    @staticmethod
+    def _event_params(ctftime_id, msg_id, title, url, start, end, description) -> tuple:
+        return (
+            str(ctftime_id),
+            str(msg_id),
+            title,
+            url,
+            str(start),
+            str(end),
+            description,
+            _to_timestamp(start),
+            _to_timestamp(end),
+        )
+
     @classmethod
     def new_event(
         cls,
@@ -112,45 +215,87 @@ def new_event(
         msg_id: str | int,
         title: str,
         url: str,
-        start: str = "à venir",
-        end: str = "à venir",
+        start: datetime | str = "à venir",
+        end: datetime | str = "à venir",
         description: str = "",
         db_path: Path | str | None = None,
     ) -> "Engine":
 
-        cls._ensure_schema()
         db_path = Path(db_path) if db_path else cls.DB_PATH
 
         with cls._connection(db_path) as conn:
             conn.execute(
-                f"""
-                INSERT INTO {cls._TABLE_EVENTS} (
-                    ctftime_id, msg_id, title, url, start, end, description
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(ctftime_id) DO UPDATE SET
-                    msg_id      = excluded.msg_id,
-                    title       = excluded.title,
-                    url         = excluded.url,
-                    start       = excluded.start,
-                    end         = excluded.end,
-                    description = excluded.description
-                """,
-                (
-                    str(ctftime_id),
-                    str(msg_id),
-                    title,
-                    url,
-                    start,
-                    end,
-                    description,
-                ),
+                cls._UPSERT_EVENT,
+                cls._event_params(ctftime_id, msg_id, title, url, start, end, description),
             )
             conn.commit()
 
+        cls._index_event(msg_id, ctftime_id, title)
+        cls._notify()
+
         ev = cls.load(ctftime_id)
         ev._db_path = db_path
         return ev
 
+    @classmethod
+    def new_events(cls, events: Iterable[Dict[str, Any]]) -> int:
+        """Insère plusieurs évènements (mêmes clés que ``new_event``) en **une** transaction."""
+        events = list(events)
+        with cls._connection() as conn:
+            conn.executemany(
+                cls._UPSERT_EVENT,
+                [
+                    cls._event_params(
+                        ev["ctftime_id"], ev["msg_id"], ev["title"], ev["url"],
+                        ev.get("start", "à venir"), ev.get("end", "à venir"),
+                        ev.get("description", ""),
+                    )
+                    for ev in events
+                ],
+            )
+        for ev in events:
+            cls._index_event(ev["msg_id"], ev["ctftime_id"], ev["title"])
+        cls._notify()
+        return len(events)
+
+    @classmethod
+    def set_group(cls, ctftime_id: str | int, role_id: int | None, channel_id: int | None) -> None:
+        """Mémorise le rôle et le salon Discord créés pour l'évènement."""
+        with cls._connection() as conn:
+            conn.execute(
+                f"UPDATE {cls._TABLE_EVENTS} SET role_id = ?, channel_id = ? WHERE ctftime_id = ?",
+                (role_id, channel_id, str(ctftime_id)),
+            )
+        for msg_id, ref in cls._msg_index.items():
+            if ref.ctftime_id == str(ctftime_id):
+                cls._msg_index[msg_id] = ref._replace(role_id=role_id)
+                break
+        cls._notify()
+
+    @classmethod
+    def _index_event(cls, msg_id: int | str, ctftime_id: str | int, title: str) -> None:
+        # ré-enregistrement d'un évènement connu : on garde ce que l'entrée porte déjà (role_id)
+        key = int(msg_id)
+        ref = cls._msg_index.get(key)
+        if ref is None:
+            cls._msg_index[key] = EventRef(str(ctftime_id), title)
+        else:
+            cls._msg_index[key] = ref._replace(ctftime_id=str(ctftime_id), title=title)
+
+    @classmethod
+    def existing_ids(cls, ctftime_ids: Iterable[str | int]) -> set[str]:
+        """Sous-ensemble de *ctftime_ids* déjà en base, en une requête ``IN (...)``."""
+        ids = [str(i) for i in ctftime_ids]
+        if not ids:
+            return set()
+        with cls._connection() as conn:
+            rows = conn.execute(
+                f"SELECT ctftime_id FROM {cls._TABLE_EVENTS} "
+                f"WHERE ctftime_id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        return {r["ctftime_id"] for r in rows}
+
     @classmethod
     def load(cls, identifier: str | int) -> "Engine":
 
@@ -183,65 +328,299 @@ def info(self) -> Dict[str, Any]:
             return data
 
 
-    def _bulk(self, table: str, parts: Iterable[str], insert: bool):
+    def _bulk(self, table: str, parts: Iterable[int], insert: bool):
         sql = (
-            f"INSERT OR IGNORE INTO {table} (ctftime_id, participant) VALUES (?, ?)"
+            f"INSERT OR IGNORE INTO {table} (ctftime_id, user_id) VALUES (?, ?)"
             if insert
-            else f"DELETE FROM {table} WHERE ctftime_id = ? AND participant = ?"
+            else f"DELETE FROM {table} WHERE ctftime_id = ? AND user_id = ?"
         )
         with self._connection(self._db_path) as conn:
             conn.executemany(sql, [(self.ctftime_id, p) for p in parts])
             conn.commit()
+        self._notify()
 
-    def add_participants(self, participants: Iterable[str] | str):
-        parts = [participants] if isinstance(participants, str) else list(participants)
+    def add_participants(self, participants: Iterable[int] | int):
+        parts = [participants] if isinstance(participants, int) else list(participants)
         self._bulk(self._TABLE_PARTICIPANTS, parts, True)
 
-    def remove_participants(self, participants: Iterable[str] | str):
-        parts = [participants] if isinstance(participants, str) else list(participants)
+    def remove_participants(self, participants: Iterable[int] | int):
+        parts = [participants] if isinstance(participants, int) else list(participants)
         self._bulk(self._TABLE_PARTICIPANTS, parts, False)
 
-    def add_maybe_participants(self, participants: Iterable[str] | str):
-        parts = [participants] if isinstance(participants, str) else list(participants)
+    def add_maybe_participants(self, participants: Iterable[int] | int):
+        parts = [participants] if isinstance(participants, int) else list(participants)
         self._bulk(self._TABLE_MAYBE, parts, True)
 
-    def remove_maybe_participants(self, participants: Iterable[str] | str):
-        parts = [participants] if isinstance(participants, str) else list(participants)
+    def remove_maybe_participants(self, participants: Iterable[int] | int):
+        parts = [participants] if isinstance(participants, int) else list(participants)
         self._bulk(self._TABLE_MAYBE, parts, False)
 
 
     @classmethod
-    def _quick_part(cls, table: str, identifier: str, part: str, add: bool):
+    def _quick_part(cls, table: str, identifier: str, user_id: int, add: bool):
         ctftime_id = cls._resolve_ctftime(identifier)
         sql = (
-            f"INSERT OR IGNORE INTO {table} (ctftime_id, participant) VALUES (?, ?)"
+            f"INSERT OR IGNORE INTO {table} (ctftime_id, user_id) VALUES (?, ?)"
             if add
-            else f"DELETE FROM {table} WHERE ctftime_id = ? AND participant = ?"
+            else f"DELETE FROM {table} WHERE ctftime_id = ? AND user_id = ?"
         )
         with cls._connection() as conn:
-            conn.execute(sql, (ctftime_id, part))
+            conn.execute(sql, (ctftime_id, user_id))
             conn.commit()
+        cls._notify()
+
+    @classmethod
+    def add_participant(cls, identifier: int | str, user_id: int):
+        cls._quick_part(cls._TABLE_PARTICIPANTS, str(identifier), user_id, True)
+
+    @classmethod
+    def remove_participant(cls, identifier: int | str, user_id: int):
+        cls._quick_part(cls._TABLE_PARTICIPANTS, str(identifier), user_id, False)
+
+    @classmethod
+    def add_maybe_participant(cls, identifier: int | str, user_id: int):
+        cls._quick_part(cls._TABLE_MAYBE, str(identifier), user_id, True)
+
+    @classmethod
+    def remove_maybe_participant(cls, identifier: int | str, user_id: int):
+        cls._quick_part(cls._TABLE_MAYBE, str(identifier), user_id, False)
+
+    @classmethod
+    def load_index(cls) -> int:
+        """(Re)charge l'index mémoire des messages d'évènements. Retourne sa taille."""
+        with cls._connection() as conn:
+            rows = conn.execute(
+                f"SELECT msg_id, ctftime_id, title, role_id FROM {cls._TABLE_EVENTS} "
+                "WHERE msg_id IS NOT NULL"
+            ).fetchall()
+        cls._msg_index = {
+            int(r["msg_id"]): EventRef(r["ctftime_id"], r["title"], r["role_id"])
+            for r in rows
+            if str(r["msg_id"]).isdigit()
+        }
+        return len(cls._msg_index)
+
+    @classmethod
+    def lookup_message(cls, msg_id: int | str) -> EventRef | None:
+        """Recherche O(1) en mémoire : ``None`` si le message n'est pas un évènement."""
+        try:
+            return cls._msg_index.get(int(msg_id))
+        except ValueError:
+            return None
 
     @classmethod
-    def add_participant(cls, identifier: int | str, participant: str):
-        cls._quick_part(cls._TABLE_PARTICIPANTS, str(identifier), participant, True)
+    def apply_participant_changes(cls, changes: Iterable[tuple[bool, str, int, bool]]) -> int:
+        """Applique un lot ``(maybe, ctftime_id, user_id, add)`` en une transaction.
+
+        Les ajouts visant un évènement disparu (archivé, supprimé) sont écartés
+        d'avance ; si une ligne échoue quand même, le lot est rejoué ligne à
+        ligne et seules les lignes fautives sont abandonnées. Retourne le
+        nombre de lignes abandonnées.
+        """
+        changes = list(changes)
+        with cls._connection() as conn:
+            ids = sorted({cid for _, cid, _, _ in changes})
+            known = {
+                r[0]
+                for r in conn.execute(
+                    f"SELECT ctftime_id FROM {cls._TABLE_EVENTS} "
+                    f"WHERE ctftime_id IN ({','.join('?' * len(ids))})",
+                    ids,
+                )
+            } if ids else set()
+        kept = [c for c in changes if c[1] in known or not c[3]]
+        dropped = len(changes) - len(kept)
+
+        try:
+            with cls._connection() as conn:
+                cls._write_participant_changes(conn, kept)
+        except sqlite3.IntegrityError:
+            # une ligne fautive ne doit pas bloquer les autres
+            for change in kept:
+                try:
+                    with cls._connection() as conn:
+                        cls._write_participant_changes(conn, [change])
+                except sqlite3.IntegrityError as exc:
+                    dropped += 1
+                    print(f"⚠️  (Dés)inscription {change} rejetée : {exc}")
+
+        if dropped:
+            print(f"⚠️  {dropped} (dés)inscription(s) abandonnée(s)")
+        cls._notify()
+        return dropped
 
     @classmethod
-    def remove_participant(cls, identifier: int | str, participant: str):
-        cls._quick_part(cls._TABLE_PARTICIPANTS, str(identifier), participant, False)
+    def _write_participant_changes(cls, conn: sqlite3.Connection, changes: List[tuple[bool, str, int, bool]]) -> None:
+        batches: Dict[tuple[str, bool], List[tuple[str, int]]] = {}
+        for maybe, ctftime_id, user_id, add in changes:
+            table = cls._TABLE_MAYBE if maybe else cls._TABLE_PARTICIPANTS
+            batches.setdefault((table, add), []).append((ctftime_id, user_id))
+
+        for (table, add), rows in batches.items():
+            sql = (
+                f"INSERT OR IGNORE INTO {table} (ctftime_id, user_id) VALUES (?, ?)"
+                if add
+                else f"DELETE FROM {table} WHERE ctftime_id = ? AND user_id = ?"
+            )
+            conn.executemany(sql, rows)
+
+    # ------------------------------------------------------------------ archivage
+    _EVENT_COLUMNS = (
+        "ctftime_id, msg_id, title, url, start, end, description, start_ts, end_ts, role_id, channel_id"
+    )
 
     @classmethod
-    def add_maybe_participant(cls, identifier: int | str, participant: str):
-        cls._quick_part(cls._TABLE_MAYBE, str(identifier), participant, True)
+    def archive_ended(cls, before: datetime) -> int:
+        """Déplace les évènements terminés avant *before* (et leurs inscrits)
+        vers les tables d'archive, en une transaction. Retourne leur nombre.
+        """
+        cutoff = int(before.timestamp())
+        ended = f"SELECT ctftime_id FROM {cls._TABLE_EVENTS} WHERE end_ts < ?"
+
+        with cls._connection() as conn:
+            msg_ids = [
+                r["msg_id"]
+                for r in conn.execute(
+                    f"SELECT msg_id FROM {cls._TABLE_EVENTS} WHERE end_ts < ?", (cutoff,)
+                )
+            ]
+            if not msg_ids:
+                return 0
+
+            for src, dst in (
+                (cls._TABLE_PARTICIPANTS, cls._TABLE_PARTICIPANTS_ARCHIVE),
+                (cls._TABLE_MAYBE, cls._TABLE_MAYBE_ARCHIVE),
+            ):
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {dst} (ctftime_id, user_id) "
+                    f"SELECT ctftime_id, user_id FROM {src} WHERE ctftime_id IN ({ended})",
+                    (cutoff,),
+                )
+                conn.execute(f"DELETE FROM {src} WHERE ctftime_id IN ({ended})", (cutoff,))
+
+            # inscriptions par pseudo pas encore converties : suivent l'évènement
+            for (_, legacy), (_, legacy_archive) in zip(cls._NAMED_TABLES[:2], cls._NAMED_TABLES[2:]):
+                if not table_exists(conn, legacy):
+                    continue
+                create_legacy_table(conn, legacy_archive)
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {legacy_archive} SELECT ctftime_id, participant FROM {legacy} "
+                    f"WHERE ctftime_id IN ({ended})",
+                    (cutoff,),
+                )
+                conn.execute(f"DELETE FROM {legacy} WHERE ctftime_id IN ({ended})", (cutoff,))
+
+            conn.execute(
+                f"INSERT OR REPLACE INTO {cls._TABLE_EVENTS_ARCHIVE} "
+                f"({cls._EVENT_COLUMNS}, archived_at) "
+                f"SELECT {cls._EVENT_COLUMNS}, ? FROM {cls._TABLE_EVENTS} WHERE end_ts < ?",
+                (int(datetime.now().timestamp()), cutoff),
+            )
+            conn.execute(f"DELETE FROM {cls._TABLE_EVENTS} WHERE end_ts < ?", (cutoff,))
+
+        for msg_id in msg_ids:
+            if str(msg_id).isdigit():
+                cls._msg_index.pop(int(msg_id), None)
+        cls._notify()
+        return len(msg_ids)
 
     @classmethod
-    def remove_maybe_participant(cls, identifier: int | str, participant: str):
-        cls._quick_part(cls._TABLE_MAYBE, str(identifier), participant, False)
+    def groups_to_clean(cls, limit: int = 50) -> List[Dict[str, Any]]:
+        """Évènements archivés dont le rôle et le salon Discord n'ont pas encore été supprimés."""
+        with cls._connection() as conn:
+            rows = conn.execute(
+                f"SELECT ctftime_id, title, role_id, channel_id FROM {cls._TABLE_EVENTS_ARCHIVE} "
+                "WHERE group_cleaned = 0 ORDER BY end_ts LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    @classmethod
+    def mark_groups_cleaned(cls, ctftime_ids: Iterable[str]) -> None:
+        with cls._connection() as conn:
+            conn.executemany(
+                f"UPDATE {cls._TABLE_EVENTS_ARCHIVE} SET group_cleaned = 1 WHERE ctftime_id = ?",
+                [(str(i),) for i in ctftime_ids],
+            )
+
+    # ------------------------------------------------------------------ flux RSS
+    @classmethod
+    def feed_state(cls, url: str) -> tuple[str | None, str | None]:
+        """``(etag, last_modified)`` du dernier passage sur *url*."""
+        with cls._connection() as conn:
+            row = conn.execute(
+                f"SELECT etag, last_modified FROM {cls._TABLE_FEED_STATE} WHERE url = ?", (url,)
+            ).fetchone()
+        return (row["etag"], row["last_modified"]) if row else (None, None)
+
+    @classmethod
+    def save_feed_state(cls, url: str, etag: str | None, last_modified: str | None) -> None:
+        with cls._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {cls._TABLE_FEED_STATE} (url, etag, last_modified) "
+                "VALUES (?, ?, ?)",
+                (url, etag, last_modified),
+            )
+
+    @classmethod
+    def unseen_guids(cls, guids: Iterable[str]) -> List[str]:
+        """Filtre *guids* en ne gardant que ceux jamais ingérés (ordre conservé)."""
+        guids = list(guids)
+        if not guids:
+            return []
+        with cls._connection() as conn:
+            seen = {
+                r["guid"]
+                for r in conn.execute(
+                    f"SELECT guid FROM {cls._TABLE_RSS_SEEN} "
+                    f"WHERE guid IN ({','.join('?' * len(guids))})",
+                    guids,
+                )
+            }
+        return [g for g in guids if g not in seen]
+
+    @classmethod
+    def upsert_upcoming(cls, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insère / met à jour des entrées du flux et marque leur GUID comme vu."""
+        rows = list(rows)
+        with cls._connection() as conn:
+            conn.executemany(
+                f"""
+                INSERT INTO {cls._TABLE_UPCOMING} (
+                    ctftime_id, title, url, format, weight, onsite, start_ts, end_ts
+                ) VALUES (:ctftime_id, :title, :url, :format, :weight, :onsite, :start_ts, :end_ts)
+                ON CONFLICT(ctftime_id) DO UPDATE SET
+                    title    = excluded.title,
+                    url      = excluded.url,
+                    format   = excluded.format,
+                    weight   = excluded.weight,
+                    onsite   = excluded.onsite,
+                    start_ts = excluded.start_ts,
+                    end_ts   = excluded.end_ts
+                """,
+                rows,
+            )
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {cls._TABLE_RSS_SEEN} (guid) VALUES (?)",
+                [(r["guid"],) for r in rows],
+            )
+        return len(rows)
+
+    @classmethod
+    def upcoming(cls, now: datetime | None = None, limit: int = 15) -> List[Dict[str, Any]]:
+        """Prochains évènements CTFtime depuis le miroir local, triés par date."""
+        now = now or datetime.now(tz=TZ_PARIS)
+        with cls._connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM {cls._TABLE_UPCOMING} WHERE start_ts >= ? "
+                "ORDER BY start_ts LIMIT ?",
+                (int(now.timestamp()), limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
 
     @classmethod
     def existe(cls, identifier: str | int) -> bool:
 
-        cls._ensure_schema()
         with cls._connection() as conn:
             row = conn.execute(
                 f"SELECT 1 FROM {cls._TABLE_EVENTS} WHERE ctftime_id = ? OR msg_id = ? LIMIT 1",
@@ -250,24 +629,69 @@ def existe(cls, identifier: str | int) -> bool:
             return row is not None
 
 
+    # Séparateur des listes agrégées (ASCII « unit separator »)
+    _SEP = "\x1f"
+
+    # Évènement + listes d'inscrits en une seule requête
+    _SELECT_FULL = f"""
+        SELECT e.*,
+               (SELECT group_concat(p.user_id, char(31))
+                  FROM {_TABLE_PARTICIPANTS} p WHERE p.ctftime_id = e.ctftime_id) AS _participants,
+               (SELECT group_concat(m.user_id, char(31))
+                  FROM {_TABLE_MAYBE} m WHERE m.ctftime_id = e.ctftime_id) AS _maybe
+        FROM {_TABLE_EVENTS} e
+    """
+
     @classmethod
-    def get_event_info(cls, identifier: int | str) -> Dict[str, Any]:
-        """Infos complètes via *ctftime_id* ou *msg_id*."""
-        ctftime_id = cls._resolve_ctftime(str(identifier))
+    def _row_to_info(cls, row: sqlite3.Row) -> Dict[str, Any]:
+        info = dict(row)                                # sqlite3.Row → dict
+        parts = info.pop("_participants")
+        maybe = info.pop("_maybe")
+        info["participants"]       = sorted(map(int, parts.split(cls._SEP))) if parts else []
+        info["maybe_participants"] = sorted(map(int, maybe.split(cls._SEP))) if maybe else []
+        return info
+
+    @classmethod
+    def get_events(cls, where: str = "1", params: tuple = (), suffix: str = "") -> List[Dict[str, Any]]:
+        """Récupère en **une requête** les évènements filtrés par *where*
+        (alias ``e``) avec leurs participants et « peut-être ».
 
+        *suffix* est ajouté tel quel (``ORDER BY``, ``LIMIT``…).
+        """
         with cls._connection() as conn:
-            ev = conn.execute(
-                f"SELECT * FROM {cls._TABLE_EVENTS} WHERE ctftime_id = ?",
-                (ctftime_id,),
-            ).fetchone()
+            rows = conn.execute(f"{cls._SELECT_FULL} WHERE {where} {suffix}", params).fetchall()
+        return [cls._row_to_info(r) for r in rows]
 
-            if ev is None:                              # ← personne trouvé ?
-                raise KeyError(ctftime_id)
+    @classmethod
+    def get_event_info(cls, identifier: int | str) -> Dict[str, Any]:
+        """Infos complètes via *ctftime_id* ou *msg_id*."""
+        identifier = str(identifier)
+        events = cls.get_events(
+            "e.ctftime_id = ? OR e.msg_id = ?",
+            (identifier, identifier, identifier),
+            "ORDER BY e.ctftime_id = ? DESC LIMIT 1",   # ctftime_id prioritaire
+        )
+        if not events:                                  # ← personne trouvé ?
+            raise KeyError(
+                f"Aucun évènement avec l'identifiant {identifier!r} (ctftime_id ou msg_id) dans la base."
+            )
+        return events[0]
 
-            info = dict(ev)                             # sqlite3.Row → dict
-            info["participants"]       = cls._participants(cls._TABLE_PARTICIPANTS, ctftime_id)
-            info["maybe_participants"] = cls._participants(cls._TABLE_MAYBE, ctftime_id)
-            return info
+    @classmethod
+    def live_events(cls, now: datetime | None = None) -> List[Dict[str, Any]]:
+        """Évènements publiés et pas encore terminés, avec leurs inscrits (réconciliation)."""
+        now = now or datetime.now(tz=TZ_PARIS)
+        return cls.get_events(
+            "e.msg_id IS NOT NULL AND (e.end_ts IS NULL OR e.end_ts >= ?)",
+            (int(now.timestamp()),),
+            "ORDER BY e.start_ts",
+        )
+
+    # Au moins un inscrit (participant ou peut-être)
+    _HAS_ANY = f"""(
+        EXISTS (SELECT 1 FROM {_TABLE_PARTICIPANTS} p WHERE p.ctftime_id = e.ctftime_id)
+        OR EXISTS (SELECT 1 FROM {_TABLE_MAYBE} m WHERE m.ctftime_id = e.ctftime_id)
+    )"""
 
     @classmethod
     def next_event(cls, now: Optional[datetime] = None) -> Dict[str, Any]:
@@ -277,70 +701,18 @@ def next_event(cls, now: Optional[datetime] = None) -> Dict[str, Any]:
 
         Si rien n’est trouvé → LookupError.
         """
-        now = now or datetime.now(tz=ZoneInfo("Europe/Paris"))
-        cls._ensure_schema()
-
-        best_id: Optional[int] = None
-        best_dt: Optional[datetime] = None
-
-        SQL = f"""
-            SELECT
-                e.ctftime_id,
-                e.start,
-                COALESCE(
-                    (SELECT COUNT(*) FROM {cls._TABLE_PARTICIPANTS} p
-                    WHERE p.ctftime_id = e.ctftime_id), 0)
-                +
-                COALESCE(
-                    (SELECT COUNT(*) FROM {cls._TABLE_MAYBE} m
-                    WHERE m.ctftime_id = e.ctftime_id), 0)
-                AS nb_any
-            FROM {cls._TABLE_EVENTS} e
-        """
-
-        tz_paris = ZoneInfo("Europe/Paris")
-
-        with cls._connection() as conn:
-            for row in conn.execute(SQL):
-                # 1) Assez de participants ?
-                if row["nb_any"] == 0:
-                    continue
-
-                raw: str = row["start"] or ""
-                if not raw or "à venir" in raw.lower():
-                    continue
-
-                # 2) Normaliser les AM/PM français / anglais
-                clean = re.sub(
-                    r"\b([ap])\.?m\.?",
-                    lambda m: {"a": "AM", "p": "PM"}[m.group(1).lower()],
-                    raw,
-                    flags=re.IGNORECASE,
-                )
-
-                # 3) Parser la date
-                try:
-                    dt = parser.parse(clean, dayfirst=True, fuzzy=True)
-                except (ValueError, OverflowError):
-                    # log facultatif
-                    print(f"⚠️  Parse KO : {raw!r}")
-                    continue
-
-                # 4) Forcer le fuseau / convertir
-                dt = dt.replace(tzinfo=tz_paris) if dt.tzinfo is None else dt.astimezone(tz_paris)
-
-                # 5) Futur ?
-                if dt < now:
-                    continue
+        now = now or datetime.now(tz=TZ_PARIS)
 
-                # 6) Plus proche trouvé
-                if best_dt is None or dt < best_dt:
-                    best_dt, best_id = dt, row["ctftime_id"]
+        events = cls.get_events(
+            f"e.start_ts >= ? AND {cls._HAS_ANY}",
+            (int(now.timestamp()),),
+            "ORDER BY e.start_ts LIMIT 1",
+        )
 
-        if best_id is None:                       # ← aucun candidat
+        if not events:                            # ← aucun candidat
             raise LookupError("Aucun évènement futur avec des inscrits trouvé.")
 
-        return cls.get_event_info(best_id)
+        return events[0]
 
 
     @classmethod
@@ -356,71 +728,53 @@ def calendar_next_30_days(
 
         La liste est triée du plus proche au plus lointain.
         """
-        tz_paris = ZoneInfo("Europe/Paris")
-        now = now or datetime.now(tz=tz_paris)
+        now = now or datetime.now(tz=TZ_PARIS)
         horizon = now + timedelta(days=span_days)
 
-        cls._ensure_schema()
-
-        candidates: list[tuple[datetime, int]] = []
-
-        with cls._connection() as conn:
-            rows = conn.execute(
-                f"""
-                SELECT e.ctftime_id,
-                       e.start,
-                       (
-                         SELECT COUNT(*) FROM {cls._TABLE_PARTICIPANTS} p
-                         WHERE p.ctftime_id = e.ctftime_id
-                       ) +
-                       (
-                         SELECT COUNT(*) FROM {cls._TABLE_MAYBE} m
-                         WHERE m.ctftime_id = e.ctftime_id
-                       ) AS nb_any
-                FROM {cls._TABLE_EVENTS} e
-                """
-            )
 
-            for row in rows:
-                raw = row["start"] or ""
-                if not raw or "à venir" in raw.lower():
-                    continue
-                if row["nb_any"] == 0:
-                    continue  # pas d’inscrits
-
-                # Normalisation « AM/PM » éventuelle
-                clean = re.sub(
-                    r"\b([ap])\\.?m\\.?\\b",
-                    lambda m: {"a": "AM", "p": "PM"}[m.group(1).lower()],
-                    raw,
-                    flags=re.IGNORECASE,
-                )
-
-                try:
-                    dt = parser.parse(clean, dayfirst=True, fuzzy=True)
-                except (ValueError, OverflowError):
-                    print("⚠️  Parse KO :", raw)
-                    continue
-
-
-                dt = (
-                    dt.replace(tzinfo=tz_paris)
-                    if dt.tzinfo is None
-                    else dt.astimezone(tz_paris)
-                )
-
-                if not (now <= dt <= horizon):
-                    continue
-
-                candidates.append((dt, row["ctftime_id"]))
+        events = cls.get_events(
+            f"e.start_ts BETWEEN ? AND ? AND {cls._HAS_ANY}",
+            (int(now.timestamp()), int(horizon.timestamp())),
+            "ORDER BY e.start_ts",
+        )
 
-        if not candidates:
+        if not events:
             raise LookupError(
                 f"Aucun évènement avec des inscrits trouvé dans les {span_days} prochains jours."
             )
 
-        # Trie par date proche
-        candidates.sort(key=lambda t: t[0])
+        return events
 
-        # Retourne la liste d’objets/dicts fournis par get_event_info
-        return [cls.get_event_info(eid) for _, eid in candidates]
+    @classmethod
+    def agenda_page(
+        cls,
+        after: tuple[int, str],
+        until_ts: int,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Page d'agenda : jusqu'à *limit* évènements avec inscrits qui suivent
+        le curseur *after* = ``(start_ts, ctftime_id)`` et commencent avant *until_ts*.
+
+        Pagination par clé (pas d'``OFFSET``) : chaque page est une descente
+        dans l'index ``start_ts``, quelle que soit sa position. Le ctftime_id
+        départage les évènements qui commencent à la même seconde. Seuls les
+        **nombres** d'inscrits sont remontés, pas les listes.
+        """
+        start_ts, ctftime_id = after
+        with cls._connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT e.ctftime_id, e.msg_id, e.title, e.url, e.start_ts, e.end_ts,
+                       (SELECT COUNT(*) FROM {cls._TABLE_PARTICIPANTS} p
+                         WHERE p.ctftime_id = e.ctftime_id) AS n_participants,
+                       (SELECT COUNT(*) FROM {cls._TABLE_MAYBE} m
+                         WHERE m.ctftime_id = e.ctftime_id) AS n_maybe
+                FROM {cls._TABLE_EVENTS} e
+                WHERE e.start_ts >= ? AND (e.start_ts, e.ctftime_id) > (?, ?)
+                  AND e.start_ts <= ? AND {cls._HAS_ANY}
+                ORDER BY e.start_ts, e.ctftime_id
+                LIMIT ?
+                """,
+                (start_ts, start_ts, ctftime_id, until_ts, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
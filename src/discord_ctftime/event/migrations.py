@@ -0,0 +1,248 @@
+"""Migrations du schéma SQLite, versionnées par ``PRAGMA user_version``.
+
+Chaque migration amène la base de la version ``n - 1`` à ``n`` ; elles sont
+appliquées dans l'ordre, une fois, au démarrage (``Engine.migrate``). Les
+noms de tables y sont écrits en dur : une migration décrit l'état de la base
+*à son époque* et ne doit plus bouger une fois livrée.
+
+Les bases créées avant ce module sont en version 0 mais déjà partiellement
+à jour : chaque migration vérifie donc ce qui existe avant d'agir.
+
+Pour faire évoluer le schéma : ajouter une fonction en fin de ``MIGRATIONS``,
+jamais modifier une migration existante.
+"""
+from __future__ import annotations
+import sqlite3
+from typing import Callable, List, Tuple
+
+from src.discord_ctftime.utils.dates import TZ_PARIS, to_timestamp
+
+Migration = Callable[[sqlite3.Connection], None]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, *columns: str) -> None:
+    cols = _columns(conn, table)
+    for col in columns:
+        if col not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} INTEGER")
+
+
+# ---------------------------------------------------------------------- 1 → 6
+def _v1_events(conn: sqlite3.Connection) -> None:
+    """Schéma d'origine : évènements et inscrits (par pseudo)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            ctftime_id  TEXT PRIMARY KEY,
+            msg_id      TEXT UNIQUE,
+            title       TEXT,
+            url         TEXT,
+            start       TEXT,
+            end         TEXT,
+            description TEXT
+        )
+        """
+    )
+    for table in ("participants", "maybe_participants"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                ctftime_id  TEXT,
+                participant TEXT,
+                PRIMARY KEY (ctftime_id, participant),
+                FOREIGN KEY (ctftime_id) REFERENCES events(ctftime_id)
+                    ON DELETE CASCADE
+            )
+            """
+        )
+
+
+def _v2_timestamps(conn: sqlite3.Connection) -> None:
+    """Dates en epoch UTC (``start_ts``/``end_ts``), remplies depuis le texte."""
+    if not {"start_ts", "end_ts"} <= _columns(conn, "events"):
+        _add_columns(conn, "events", "start_ts", "end_ts")
+        rows = conn.execute("SELECT ctftime_id, start, end FROM events").fetchall()
+        conn.executemany(
+            "UPDATE events SET start_ts = ?, end_ts = ? WHERE ctftime_id = ?",
+            [(to_timestamp(s, TZ_PARIS), to_timestamp(e, TZ_PARIS), i) for i, s, e in rows],
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_start_ts ON events(start_ts)")
+
+
+def _v3_feed(conn: sqlite3.Connection) -> None:
+    """Miroir local du flux RSS « upcoming » de CTFtime."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS upcoming (
+            ctftime_id  TEXT PRIMARY KEY,
+            title       TEXT,
+            url         TEXT,
+            format      TEXT,
+            weight      REAL,
+            onsite      INTEGER,
+            start_ts    INTEGER,
+            end_ts      INTEGER
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_upcoming_start_ts ON upcoming(start_ts)")
+    conn.execute("CREATE TABLE IF NOT EXISTS rss_seen (guid TEXT PRIMARY KEY) WITHOUT ROWID")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_state (
+            url           TEXT PRIMARY KEY,
+            etag          TEXT,
+            last_modified TEXT
+        )
+        """
+    )
+
+
+def _v4_archive(conn: sqlite3.Connection) -> None:
+    """Tables d'archive des évènements terminés (sans contrainte, lecture rare)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events_archive (
+            ctftime_id    TEXT PRIMARY KEY,
+            msg_id        TEXT,
+            title         TEXT,
+            url           TEXT,
+            start         TEXT,
+            end           TEXT,
+            description   TEXT,
+            start_ts      INTEGER,
+            end_ts        INTEGER,
+            archived_at   INTEGER,
+            group_cleaned INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    for table in ("participants_archive", "maybe_participants_archive"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                ctftime_id  TEXT,
+                participant TEXT,
+                PRIMARY KEY (ctftime_id, participant)
+            ) WITHOUT ROWID
+            """
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_end_ts ON events(end_ts)")
+
+
+def _v5_group_ids(conn: sqlite3.Connection) -> None:
+    """Ids du rôle et du salon Discord de l'évènement."""
+    for table in ("events", "events_archive"):
+        _add_columns(conn, table, "role_id", "channel_id")
+
+
+# tables d'inscrits et leur copie « par pseudo » (convertie par Engine.map_legacy_participants)
+NAMED_TABLES: Tuple[Tuple[str, str], ...] = tuple(
+    (table, f"{table}_legacy")
+    for table in ("participants", "maybe_participants",
+                  "participants_archive", "maybe_participants_archive")
+)
+
+
+def create_legacy_table(conn: sqlite3.Connection, legacy: str) -> None:
+    """Table d'inscrits par pseudo en attente de conversion : **sans** clé
+    étrangère, pour que la suppression / l'archivage d'un évènement ne les
+    efface pas avant que ``Engine.map_legacy_participants`` ne passe."""
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {legacy} (
+            ctftime_id  TEXT,
+            participant TEXT,
+            PRIMARY KEY (ctftime_id, participant)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _v6_user_ids(conn: sqlite3.Connection) -> None:
+    """Inscrits indexés par id Discord (INTEGER) au lieu du pseudo.
+
+    Les anciennes lignes sont copiées dans ``*_legacy`` (les tables vides
+    sont simplement supprimées).
+    """
+    for table, legacy in NAMED_TABLES:
+        if "participant" not in _columns(conn, table):
+            continue
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None:
+            create_legacy_table(conn, legacy)
+            conn.execute(f"INSERT OR IGNORE INTO {legacy} SELECT ctftime_id, participant FROM {table}")
+        conn.execute(f"DROP TABLE {table}")
+
+    for table in ("participants", "maybe_participants"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                ctftime_id  TEXT,
+                user_id     INTEGER,
+                PRIMARY KEY (ctftime_id, user_id),
+                FOREIGN KEY (ctftime_id) REFERENCES events(ctftime_id)
+                    ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """
+        )
+    for table in ("participants_archive", "maybe_participants_archive"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                ctftime_id  TEXT,
+                user_id     INTEGER,
+                PRIMARY KEY (ctftime_id, user_id)
+            ) WITHOUT ROWID
+            """
+        )
+
+
+MIGRATIONS: List[Migration] = [
+    _v1_events,
+    _v2_timestamps,
+    _v3_feed,
+    _v4_archive,
+    _v5_group_ids,
+    _v6_user_ids,
+]
+
+
+# ---------------------------------------------------------------------- exécution
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS) -> int:
+    """Applique les migrations manquantes ; retourne le nombre appliqué.
+
+    Chaque migration tourne dans sa propre transaction, avec la mise à jour
+    de ``user_version`` : une migration qui échoue est annulée entièrement
+    et la base reste à la version précédente.
+    """
+    current = schema_version(conn)
+    if current > len(migrations):
+        raise RuntimeError(
+            f"Base en version {current}, ce code ne connaît que {len(migrations)} migration(s)."
+        )
+
+    conn.commit()
+    for version, migration in enumerate(migrations[current:], start=current + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    return len(migrations) - current
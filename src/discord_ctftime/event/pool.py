@@ -0,0 +1,75 @@
+from __future__ import annotations
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+# Profil PRAGMA appliqué à chaque nouvelle connexion
+PRAGMAS: Tuple[Tuple[str, str | int], ...] = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("foreign_keys", "ON"),
+    ("temp_store", "MEMORY"),
+    ("mmap_size", 256 * 1024 * 1024),    # 256 Mo
+    ("cache_size", -16 * 1024),          # 16 Mo (valeur négative = Kio)
+    ("busy_timeout", 5000),              # ms
+)
+
+
+class ConnectionPool:
+    """Pool de connexions SQLite : **une connexion par thread et par base**.
+
+    Les connexions sont ouvertes à la demande, réglées avec ``PRAGMAS`` puis
+    réutilisées pour tous les appels suivants du même thread. ``close_all``
+    ferme l’ensemble des connexions (à appeler à l’arrêt du bot).
+
+    *trace*, si fourni, est branché sur chaque connexion
+    (``set_trace_callback``) et reçoit le texte de chaque requête exécutée.
+    """
+
+    def __init__(self, trace: Callable[[str], None] | None = None) -> None:
+        self._trace = trace
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+
+    def _open(self, db_path: Path) -> sqlite3.Connection:
+        if str(db_path) != ":memory:":
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False uniquement pour pouvoir fermer depuis close_all ;
+        # une connexion n'est utilisée que par le thread qui l'a ouverte.
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name} = {value}")
+        if self._trace is not None:
+            conn.set_trace_callback(self._trace)
+        return conn
+
+    def get(self, db_path: Path | str) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant pour *db_path*."""
+        conns: Dict[str, sqlite3.Connection] | None = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+
+        key = str(db_path)
+        conn = conns.get(key)
+        if conn is None:
+            conn = self._open(Path(db_path))
+            conns[key] = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def close_all(self) -> None:
+        """Ferme toutes les connexions ouvertes, tous threads confondus."""
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        # les threads encore vivants rouvriront une connexion au besoin
+        self._local = threading.local()
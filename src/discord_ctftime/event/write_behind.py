@@ -0,0 +1,68 @@
+from __future__ import annotations
+import asyncio
+import sqlite3
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+# (maybe, ctftime_id, user_id) → True = ajout, False = retrait
+Key = Tuple[bool, str, int]
+Change = Tuple[bool, str, int, bool]
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Base verrouillée / occupée : ça passera au prochain essai."""
+    msg = str(exc).lower()
+    return isinstance(exc, sqlite3.OperationalError) and ("locked" in msg or "busy" in msg)
+
+
+class ParticipantWriteBehind:
+    """File d'écritures différées pour les (dés)inscriptions.
+
+    Les mutations sont accumulées pendant *delay* secondes puis écrites en une
+    seule transaction par *apply*. Pour un même couple (évènement, membre) seule
+    la dernière opération est conservée : un ajout suivi d'un retrait (réaction
+    cliquée puis retirée) ne produit qu'une écriture au lieu de deux.
+
+    Un échec passager (base verrouillée) remet le lot en file et reprogramme
+    l'écriture ; tout autre échec est journalisé et le lot abandonné, pour
+    qu'une ligne invalide ne bloque pas les lectures qui vident la file.
+    """
+
+    def __init__(self, apply: Callable[[List[Change]], Awaitable[None]], delay: float):
+        self._apply = apply
+        self._delay = delay
+        self._pending: Dict[Key, bool] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, ctftime_id: str, user_id: int, maybe: bool, add: bool) -> None:
+        self._pending[(maybe, ctftime_id, user_id)] = add
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self._delay, lambda: loop.create_task(self.flush()))
+
+    async def flush(self) -> None:
+        """Écrit immédiatement tout ce qui est en attente."""
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                await self._apply([(maybe, cid, part, add) for (maybe, cid, part), add in pending.items()])
+            except Exception as exc:
+                if not _is_transient(exc):
+                    print(f"⚠️  Écriture différée des inscriptions KO, lot abandonné : {exc!r}")
+                    return
+                # on remet les changements en file, sans écraser les plus récents
+                for key, add in pending.items():
+                    self._pending.setdefault(key, add)
+                self._schedule()
+                print(f"⚠️  Écriture différée des inscriptions reportée : {exc}")
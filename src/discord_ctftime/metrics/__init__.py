@@ -0,0 +1,39 @@
+from .metrics import (
+    COMMAND_ERRORS,
+    COMMAND_LATENCY,
+    CTFTIME_CACHE,
+    CTFTIME_LATENCY,
+    DISCORD_RATE_LIMITED,
+    DISCORD_REST_LATENCY,
+    ENGINE_LATENCY,
+    ENGINE_QUERIES,
+    REACTION_LATENCY,
+    STARTUP,
+    Counter,
+    Gauge,
+    Histogram,
+    count_statement,
+    register_collector,
+    render,
+    set_current_method,
+)
+
+__all__ = [
+    "COMMAND_ERRORS",
+    "COMMAND_LATENCY",
+    "CTFTIME_CACHE",
+    "CTFTIME_LATENCY",
+    "DISCORD_RATE_LIMITED",
+    "DISCORD_REST_LATENCY",
+    "ENGINE_LATENCY",
+    "ENGINE_QUERIES",
+    "REACTION_LATENCY",
+    "STARTUP",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "count_statement",
+    "register_collector",
+    "render",
+    "set_current_method",
+]
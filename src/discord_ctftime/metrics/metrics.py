@@ -0,0 +1,169 @@
+from __future__ import annotations
+import abc
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# bornes (secondes) adaptées à des appels de quelques µs à quelques s
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(kwargs: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in kwargs.items()))
+
+
+def _fmt_labels(labels: Labels, extra: Labels = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in items)
+    return "{" + inner + "}"
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    @abc.abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_fmt_labels(k)} {v}" for k, v in sorted(self.values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self.values[_labels(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = buckets
+        # labels → [compteurs par bucket (+Inf inclus), somme, nombre]
+        self.series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            serie = self.series.get(key)
+            if serie is None:
+                serie = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][bisect.bisect_left(self.buckets, value)] += 1
+            serie[1] += value
+            serie[2] += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def quantile(self, q: float, **labels: object) -> float | None:
+        """Approximation par la borne haute du bucket atteint."""
+        with self._lock:
+            serie = self.series.get(_labels(labels))
+            if not serie or not serie[2]:
+                return None
+            target, seen = q * serie[2], 0
+            for bound, count in zip(self.buckets + (float("inf"),), serie[0]):
+                seen += count
+                if seen >= target:
+                    return bound
+        return float("inf")
+
+    def snapshot(self) -> List[Tuple[Dict[str, str], int, float]]:
+        """``(labels, nombre, somme)`` par série, pour affichage."""
+        with self._lock:
+            return [(dict(key), n, total) for key, (_, total, n) in self.series.items()]
+
+    def samples(self) -> List[str]:
+        out = []
+        with self._lock:
+            for key, (counts, total, n) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    out.append(f"{self.name}_bucket{_fmt_labels(key, (('le', le),))} {cumulative}")
+                out.append(f"{self.name}_sum{_fmt_labels(key)} {total}")
+                out.append(f"{self.name}_count{_fmt_labels(key)} {n}")
+        return out
+
+
+REGISTRY: List[_Metric] = []
+# fonctions appelées au rendu pour rafraîchir des jauges (ex. compteurs du cache)
+_COLLECTORS: List[Callable[[], None]] = []
+
+
+def register_collector(fn: Callable[[], None]) -> None:
+    _COLLECTORS.append(fn)
+
+
+def render() -> str:
+    """Toutes les métriques au format texte Prometheus."""
+    for collect in _COLLECTORS:
+        collect()
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ---------------------------------------------------------------------------- métriques du bot
+COMMAND_LATENCY = Histogram("bot_command_duration_seconds", "Durée des commandes hybrides.")
+COMMAND_ERRORS = Counter("bot_command_errors_total", "Commandes terminées en erreur.")
+REACTION_LATENCY = Histogram("bot_reaction_duration_seconds", "Durée de traitement des réactions.")
+STARTUP = Gauge("bot_startup_seconds", "Durée de chaque phase du démarrage (ready = total).")
+
+ENGINE_LATENCY = Histogram("engine_call_duration_seconds", "Durée des appels Engine (thread compris).")
+ENGINE_QUERIES = Counter("engine_sql_statements_total", "Requêtes SQL exécutées, par méthode Engine.")
+
+CTFTIME_LATENCY = Histogram("ctftime_request_duration_seconds", "Durée des requêtes vers ctftime.org.")
+CTFTIME_CACHE = Gauge("ctftime_cache_events", "Compteurs du cache disque ctftime.org.")
+
+DISCORD_REST_LATENCY = Histogram("discord_rest_duration_seconds", "Durée des appels REST Discord.")
+DISCORD_RATE_LIMITED = Counter("discord_rate_limited_total", "Réponses 429 / rate-limits rencontrés.")
+
+# méthode Engine en cours dans le thread courant, pour attribuer les requêtes SQL
+_current = threading.local()
+
+
+def set_current_method(name: str | None) -> None:
+    _current.method = name
+
+
+def count_statement(_sql: str) -> None:
+    """Callback ``sqlite3.Connection.set_trace_callback``."""
+    ENGINE_QUERIES.inc(method=getattr(_current, "method", None) or "direct")
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from aiohttp import web
+
+from .metrics import render
+
+
+async def _metrics(_request: web.Request) -> web.Response:
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+
+async def start_server(host: str, port: int) -> web.AppRunner:
+    """Expose ``/metrics`` (format texte Prometheus) sur *host*:*port*."""
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
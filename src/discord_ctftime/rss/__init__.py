@@ -0,0 +1,3 @@
+from .rss import RSSException, parse_feed, poll_feed
+
+__all__ = ["RSSException", "parse_feed", "poll_feed"]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import asyncio
+import re
+from typing import Any, Dict, List
+
+from src.discord_ctftime.ctftime.http import get_client
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.utils.dates import to_timestamp
+
+_EVENT_ID = re.compile(r"/event/(\d+)")
+
+
+class RSSException(RuntimeError):
+    """Erreur générique du parseur RSS."""
+
+
+def _to_row(entry: Any) -> Dict[str, Any] | None:
+    m = _EVENT_ID.search(entry.get("ctftime_url") or entry.get("link") or "")
+    if m is None:
+        return None
+    try:
+        weight = float(entry.get("weight") or 0)
+    except ValueError:
+        weight = None
+    return {
+        "guid": entry.get("id") or entry.get("link"),
+        "ctftime_id": m.group(1),
+        "title": entry.get("title", ""),
+        "url": entry.get("link"),
+        "format": entry.get("format_text"),
+        "weight": weight,
+        "onsite": int(str(entry.get("onsite", "")).lower() == "true"),
+        "start_ts": to_timestamp(entry.get("start_date")),
+        "end_ts": to_timestamp(entry.get("finish_date")),
+    }
+
+
+def parse_feed(content: bytes) -> List[Any]:
+    """Parse le flux et renvoie ses entrées. Lève RSSException si le XML est invalide."""
+    import feedparser  # import paresseux : premier passage du flux seulement
+
+    flux = feedparser.parse(content)
+    # un simple conflit d'encodage déclaré/réel n'empêche pas la lecture
+    if flux.bozo and not isinstance(flux.bozo_exception, feedparser.CharacterEncodingOverride):
+        raise RSSException(f"Flux invalide : {flux.bozo_exception}")
+    return list(flux.entries)
+
+
+async def poll_feed(url: str, engine: AsyncEngine) -> int:
+    """Un passage sur le flux : GET conditionnel, puis ingestion des seules
+    entrées jamais vues. Retourne le nombre d'entrées ajoutées.
+    """
+    etag, last_modified = await engine.feed_state(url)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    resp = await get_client().get(url, headers=headers)
+    if resp.status_code == 304:
+        return 0
+    if resp.status_code != 200:
+        raise RSSException(f"HTTP {resp.status_code} sur {url}")
+
+    entries = await asyncio.to_thread(parse_feed, resp.content)
+    by_guid = {}
+    for entry in entries:
+        guid = entry.get("id") or entry.get("link")
+        if guid:
+            by_guid[guid] = entry
+
+    new_guids = await engine.unseen_guids(list(by_guid))
+    rows = [row for row in (_to_row(by_guid[g]) for g in new_guids) if row is not None]
+    if rows:
+        await engine.upsert_upcoming(rows)
+
+    await engine.save_feed_state(url, resp.headers.get("etag"), resp.headers.get("last-modified"))
+    return len(rows)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+TZ_PARIS = ZoneInfo("Europe/Paris")
+
+# Formats CTFtime connus, essayés avant tout parsing « flou ».
+# (format strptime, fuseau à appliquer si la chaîne n'en porte pas)
+_KNOWN_FORMATS: tuple[tuple[str, timezone | None], ...] = (
+    ("%Y%m%dT%H%M%S", timezone.utc),          # flux RSS : 20250104T100000
+    ("%a, %d %b. %Y, %H:%M UTC", timezone.utc),  # page évènement : Sat, 04 Jan. 2025, 10:00 UTC
+    ("%a, %d %b %Y, %H:%M UTC", timezone.utc),   # idem, mois court sans point (May)
+    ("%d/%m/%Y %H:%M", None),
+    ("%d/%m/%Y", None),
+)
+
+_AMPM = re.compile(r"\b([ap])\.?m\.?(?!\w)", re.IGNORECASE)
+
+CACHE_SIZE = 4096
+
+
+def _fast(raw: str) -> datetime | None:
+    # le format RSS d'abord : fromisoformat l'accepte aussi (3.11+) mais sans fuseau
+    for fmt, tz in _KNOWN_FORMATS[:1]:
+        try:
+            return datetime.strptime(raw, fmt).replace(tzinfo=tz)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        pass
+    for fmt, tz in _KNOWN_FORMATS[1:]:
+        try:
+            dt = datetime.strptime(raw, fmt)
+        except ValueError:
+            continue
+        return dt.replace(tzinfo=tz) if tz is not None else dt
+    return None
+
+
+def _fuzzy(raw: str) -> datetime | None:
+    from dateutil import parser  # import paresseux : chemin rare
+
+    # Normaliser les AM/PM français / anglais
+    clean = _AMPM.sub(lambda m: {"a": "AM", "p": "PM"}[m.group(1).lower()], raw)
+    try:
+        return parser.parse(clean, dayfirst=True, fuzzy=True)
+    except (ValueError, OverflowError):
+        print(f"⚠️  Parse KO : {raw!r}")
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_cached(raw: str, tz_key: str) -> datetime | None:
+    dt = _fast(raw) or _fuzzy(raw)
+    if dt is None:
+        return None
+    tz = ZoneInfo(tz_key)
+    return dt.replace(tzinfo=tz) if dt.tzinfo is None else dt.astimezone(tz)
+
+
+def parse_datetime(raw: str | None, tz: ZoneInfo = TZ_PARIS) -> datetime | None:
+    """Texte CTFtime → datetime(tz), ou ``None`` si vide / « à venir » / illisible.
+
+    Formats exacts d'abord (ISO-8601, RSS, page CTFtime), ``dateutil`` en
+    dernier recours ; résultat mémorisé par (chaîne, fuseau).
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    if not raw or "à venir" in raw.lower():
+        return None
+    return _parse_cached(raw, tz.key)
+
+
+def to_timestamp(value: datetime | str | None, tz: ZoneInfo = TZ_PARIS) -> int | None:
+    """datetime ou texte → epoch UTC (les dates sans fuseau sont lues dans *tz*)."""
+    if isinstance(value, datetime):
+        dt = value if value.tzinfo else value.replace(tzinfo=tz)
+    else:
+        dt = parse_datetime(value, tz)
+    return int(dt.timestamp()) if dt is not None else None
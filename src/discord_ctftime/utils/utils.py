@@ -1,7 +1,7 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Any, Dict, List
-from dateutil import parser  #  ← ajouté
+from .dates import parse_datetime
 
 def _to_datetime(obj: Any, tz: ZoneInfo) -> datetime | None:
     """Convertit str/int/datetime → datetime(tz) ou None si impossible."""
@@ -13,11 +13,8 @@ def _to_datetime(obj: Any, tz: ZoneInfo) -> datetime | None:
         # timestamp (secondes)
         return datetime.fromtimestamp(obj, tz)
     if isinstance(obj, str):
-        try:
-            dt = parser.parse(obj, dayfirst=True, fuzzy=True)
-            return dt.astimezone(tz) if dt.tzinfo else dt.replace(tzinfo=tz)
-        except (ValueError, OverflowError):
-            return None
+        # parsing mémorisé : mêmes chaînes relues à chaque /agenda
+        return parse_datetime(obj, tz)
     return None
 
 def normalize_channel_name(name: str) -> str:
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.discord_ctftime.bot.agenda import AgendaView
+from src.discord_ctftime.event import Engine
+
+NOW = datetime(2030, 6, 1, tzinfo=timezone.utc)
+ALICE = 111111111111111111
+
+
+@pytest.fixture
+def db(engine_db):
+    # 23 évènements avec inscrits, deux par deux à la même heure (départage par id)
+    for i in range(23):
+        start = NOW + timedelta(hours=1 + i // 2)
+        Engine.new_event(100 + i, 1000 + i, f"CTF {i}", "u", start, start + timedelta(hours=8))
+        Engine.add_participant(100 + i, ALICE)
+    # sans inscrit / hors période : jamais affichés
+    Engine.new_event(900, 9000, "Vide", "u", NOW + timedelta(hours=2), NOW + timedelta(hours=3))
+    Engine.new_event(901, 9001, "Trop loin", "u", NOW + timedelta(days=60), NOW + timedelta(days=61))
+    Engine.add_participant(901, ALICE)
+
+
+# ---------- pagination par clé ----------
+def test_pages_chain_without_gaps_or_duplicates(db):
+    until = int((NOW + timedelta(days=30)).timestamp())
+    cursor, seen = (int(NOW.timestamp()), ""), []
+    while page := Engine.agenda_page(cursor, until, limit=10):
+        seen += [ev["ctftime_id"] for ev in page]
+        cursor = (page[-1]["start_ts"], page[-1]["ctftime_id"])
+    assert seen == [str(100 + i) for i in range(23)]
+    assert Engine.agenda_page((int(NOW.timestamp()), ""), until, 1)[0]["n_participants"] == 1
+
+
+# ---------- vue ----------
+class CountingEngine:
+    def __init__(self):
+        self.calls = 0
+
+    async def agenda_page(self, after, until_ts, limit):
+        self.calls += 1
+        return Engine.agenda_page(after, until_ts, limit)
+
+
+def test_view_navigates_and_caches_pages(db):
+    engine = CountingEngine()
+
+    async def scenario():
+        view = AgendaView(engine, now=NOW, timeout=None)
+        first = await view.render()
+        assert len(first.fields) == 10
+        assert view.previous_page.disabled and not view.next_page.disabled
+
+        view.index = 1
+        await view.render()
+        view.index = 2
+        last = await view.render()
+        assert [f.name for f in last.fields] == ["**CTF 20**", "**CTF 21**", "**CTF 22**"]
+        assert view.next_page.disabled
+
+        view.index = 0
+        await view.render()                     # déjà en cache
+        return view
+
+    view = asyncio.run(scenario())
+    assert engine.calls == 3
+    assert view.message is None
+
+
+def test_empty_range_is_not_an_error(db):
+    async def scenario():
+        view = AgendaView(CountingEngine(), span_days=1, now=NOW + timedelta(days=40), timeout=None)
+        embed = await view.render()
+        return embed, view
+
+    embed, view = asyncio.run(scenario())
+    assert "Aucun évènement" in embed.description
+    assert view.previous_page.disabled and view.next_page.disabled
+
+
+def test_timeout_disables_buttons(db):
+    async def scenario():
+        view = AgendaView(CountingEngine(), now=NOW, timeout=None)
+        await view.render()
+        await view.on_timeout()
+        return view
+
+    view = asyncio.run(scenario())
+    assert all(item.disabled for item in view.children)
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.discord_ctftime.bot import command
+from src.discord_ctftime.bot.command import _publish_events
+from src.discord_ctftime.bot.scheduler import ActionScheduler
+from src.discord_ctftime.event import AsyncEngine, Engine
+
+
+def fetched(i):
+    event = SimpleNamespace(
+        id=i, title=f"CTF {i}", ctftime_url=f"https://ctftime.org/event/{i}",
+        start=f"2099-01-0{i} 10:00", finish=f"2099-01-0{i} 20:00", description="",
+    )
+    return SimpleNamespace(ctftime_id=i, ctf=None, event=event)
+
+
+class FakeMessage:
+    def __init__(self, channel, msg_id):
+        self.channel, self.id = channel, msg_id
+
+    async def delete(self):
+        self.channel.deleted.append(self.id)
+
+
+class FakeChannel:
+    id = 42
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent, self.deleted = [], []
+
+    async def send(self, embed):
+        n = len(self.sent) + 1
+        self.sent.append(n)
+        if n in self.failing:
+            raise asyncio.TimeoutError()
+        return FakeMessage(self, 1000 + n)
+
+
+class FakeBot:
+    def __init__(self):
+        self.reacted = []
+
+    async def add_default_reactions(self, msg):
+        self.reacted.append(msg.id)
+
+
+@pytest.fixture
+def db(engine_db, monkeypatch):
+    monkeypatch.setattr(command, "_event_embed", lambda ctf, event: None)
+    monkeypatch.setattr(command, "scheduler", ActionScheduler())
+
+
+# ---------- échec partiel ----------
+def test_failure_midway_keeps_going_and_leaves_no_orphan(db):
+    bot, channel, report = FakeBot(), FakeChannel(failing={2}), {}
+
+    rows = asyncio.run(_publish_events(bot, AsyncEngine(), channel, [fetched(i) for i in (1, 2, 3)], report))
+
+    assert [r["ctftime_id"] for r in rows] == [1, 3]
+    assert report["2"] == "❌ publication : TimeoutError"
+    assert Engine.existing_ids([1, 2, 3]) == {"1", "3"}
+    # chaque message publié a sa ligne en base et ses réactions
+    assert bot.reacted == [1001, 1003]
+    assert Engine.lookup_message(1003).ctftime_id == "3"
+
+
+def test_rows_are_written_in_one_transaction(db):
+    calls = []
+
+    class CountingEngine(AsyncEngine):
+        async def new_events(self, rows):
+            calls.append([r["ctftime_id"] for r in rows])
+            return await super().new_events(rows)
+
+    bot, channel, report = FakeBot(), FakeChannel(), {}
+    rows = asyncio.run(_publish_events(bot, CountingEngine(), channel, [fetched(i) for i in (3, 1, 2)], report))
+
+    assert calls == [[1, 2, 3]] and len(rows) == 3
+    assert bot.reacted == [1001, 1002, 1003]
+
+
+def test_messages_are_removed_when_the_rows_cannot_be_written(db):
+    class BrokenEngine:
+        async def new_events(self, rows):
+            raise KeyError("description")
+
+    bot, channel, report = FakeBot(), FakeChannel(), {}
+    rows = asyncio.run(_publish_events(bot, BrokenEngine(), channel, [fetched(1), fetched(2)], report))
+
+    assert rows == [] and channel.deleted == [1001, 1002] and bot.reacted == []
+    assert report == {"1": "❌ publication : KeyError", "2": "❌ publication : KeyError"}
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+# ---------- import sans configuration ----------
+def test_create_bot_without_env():
+    env = {k: v for k, v in os.environ.items() if k not in ("CHANNEL_ID", "SERVER_ID")}
+    code = "from src.discord_ctftime.bot.main import create_bot; create_bot()"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
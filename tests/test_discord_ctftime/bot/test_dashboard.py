@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from src.discord_ctftime.bot.dashboard import Dashboard, Shard
+
+MONDAY = datetime(2030, 6, 3, 12, tzinfo=timezone.utc)     # lundi, semaine ISO 23
+
+
+def event(i, day):
+    start = MONDAY + timedelta(days=day)
+    return {
+        "ctftime_id": str(i), "title": f"CTF {i}", "url": "u",
+        "start": str(start), "end": str(start), "start_ts": int(start.timestamp()),
+        "participants": [1], "maybe_participants": [],
+    }
+
+
+EVENTS = [event(i, day) for i, day in enumerate((0, 1, 8, 9, 15, 16, 22))]
+
+
+class FakeMessage:
+    def __init__(self, log, n):
+        self.log, self.n = log, n
+
+    async def edit(self, embed):
+        self.log.append(("edit", self.n))
+
+    async def delete(self):
+        self.log.append(("delete", self.n))
+
+
+def dashboard(log):
+    dash = Dashboard.__new__(Dashboard)          # sans boucle de rafraîchissement
+    dash._shards = []
+    dash._events = []
+
+    async def make():
+        return Dashboard._week_embeds(dash._events, {})
+
+    async def send(embed):
+        log.append(("send", len(dash._shards)))
+        return Shard(FakeMessage(log, len(dash._shards)))
+
+    dash._make_calendar_embeds = make
+    dash._send_shard = send
+    return dash
+
+
+# ---------- découpage par semaine ----------
+def test_one_shard_per_iso_week():
+    keys = [key for key, _ in Dashboard._week_embeds(EVENTS, {})]
+    assert keys == [(2030, 23, 0), (2030, 24, 0), (2030, 25, 0), (2030, 26, 0)]
+
+
+# ---------- éditions minimales ----------
+def test_inserted_event_dirties_only_its_week():
+    log = []
+    dash = dashboard(log)
+
+    async def scenario():
+        dash._events = EVENTS
+        await dash.refresh()
+        log.clear()
+        dash._events = sorted(EVENTS + [event(99, 9)], key=lambda e: e["start_ts"])
+        return await dash.refresh()
+
+    assert asyncio.run(scenario()) == 1
+    assert log == [("edit", 1)]
+
+
+def test_past_week_is_deleted_without_shifting_the_others():
+    log = []
+    dash = dashboard(log)
+
+    async def scenario():
+        dash._events = EVENTS
+        await dash.refresh()
+        log.clear()
+        dash._events = EVENTS[2:]
+        return await dash.refresh()
+
+    assert asyncio.run(scenario()) == 1
+    assert log == [("delete", 0)]
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from src.discord_ctftime.bot.group import GuildIndex, event_role
+from src.discord_ctftime.event import Engine, EventRef
+
+
+class FakeGuild:
+    def __init__(self, roles):
+        self.roles = roles
+        self.text_channels = []
+
+    def get_role(self, role_id):
+        return next((r for r in self.roles if r.id == role_id), None)
+
+
+def role(id, name):
+    return SimpleNamespace(id=id, name=name)
+
+
+# ---------- index nom → id ----------
+def test_index_follows_renames():
+    alpha = role(1, "Alpha CTF")
+    guild = FakeGuild([alpha])
+    index = GuildIndex()
+    index.load(guild)
+    assert index.role(guild, "Alpha CTF") is alpha
+
+    renamed = role(1, "Alpha CTF 2099")
+    index.remove_role(alpha)
+    index.add_role(renamed)
+    assert index.role(guild, "Alpha CTF") is None
+    assert index.roles == {"Alpha CTF 2099": 1}
+
+
+def test_event_role_prefers_id():
+    alpha = role(1, "Renommé")
+    guild = FakeGuild([alpha])
+    assert event_role(guild, EventRef("42", "Alpha CTF", 1)) is alpha
+
+
+# ---------- ids mémorisés en base ----------
+def test_set_group_updates_index(engine_db):
+    Engine.new_event(42, 4200, "Alpha CTF", "https://ctftime.org/event/42")
+    Engine.set_group(42, 7, 8)
+    assert Engine.lookup_message(4200) == EventRef("42", "Alpha CTF", 7)
+
+    Engine._msg_index = {}
+    Engine.load_index()
+    assert Engine.lookup_message(4200).role_id == 7
+    assert Engine.get_event_info(42)["channel_id"] == 8
+
+
+def test_new_event_keeps_role_id_in_index(engine_db):
+    Engine.new_event(42, 4200, "Alpha CTF", "https://ctftime.org/event/42")
+    Engine.set_group(42, 7, 8)
+    Engine.new_event(42, 4200, "Alpha CTF 2030", "https://ctftime.org/event/42")   # ré-import
+    assert Engine.lookup_message(4200) == EventRef("42", "Alpha CTF 2030", 7)
+
+
+def test_set_group_notifies_listeners(engine_db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(Engine, "_listeners", [lambda: calls.append(1)])
+    Engine.new_event(42, 4200, "Alpha CTF", "https://ctftime.org/event/42")
+    calls.clear()
+    Engine.set_group(42, 7, 8)
+    assert calls == [1]
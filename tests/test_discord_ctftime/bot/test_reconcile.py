@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from src.discord_ctftime.bot.reconcile import diff_participants, legacy_mapping
+from src.discord_ctftime.event import Engine
+
+NOW = datetime(2030, 6, 1, tzinfo=timezone.utc)
+ALICE, BOB, CAROL = 111, 222, 333
+
+
+# ---------- diff réactions / base ----------
+def test_diff_only_missing_changes():
+    changes = diff_participants("42", False, [ALICE, BOB], [BOB, CAROL])
+    assert changes == [(False, "42", CAROL, True), (False, "42", ALICE, False)]
+
+
+def test_diff_nothing_when_in_sync():
+    assert diff_participants("42", True, [ALICE], [ALICE]) == []
+
+
+# ---------- évènements à réconcilier ----------
+def test_live_events_skips_ended(engine_db):
+    Engine.new_event(1, 101, "Fini", "u", NOW - timedelta(days=3), NOW - timedelta(days=2))
+    Engine.new_event(2, 102, "En cours", "u", NOW - timedelta(hours=1), NOW + timedelta(days=1))
+    Engine.add_participant(2, ALICE)
+
+    events = Engine.live_events(now=NOW)
+    assert [e["ctftime_id"] for e in events] == ["2"]
+    assert events[0]["participants"] == [ALICE]
+
+    Engine.apply_participant_changes(diff_participants("2", False, [ALICE], [BOB]))
+    assert Engine.get_event_info(2)["participants"] == [BOB]
+
+
+# ---------- anciennes inscriptions par pseudo ----------
+def test_legacy_mapping_skips_ambiguous_names():
+    members = [
+        SimpleNamespace(id=ALICE, display_name="alice", name="alice_", global_name=None),
+        SimpleNamespace(id=BOB, display_name="bob", name="bob", global_name="Bob"),
+        SimpleNamespace(id=CAROL, display_name="bob", name="carol", global_name=None),
+    ]
+    assert legacy_mapping(members, ["alice", "bob", "Bob", "zoe"]) == {"alice": ALICE, "Bob": BOB}
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from src.discord_ctftime.bot.scheduler import ActionScheduler
+
+
+class FakeMember:
+    def __init__(self, guild, roles):
+        self.id = 10
+        self.guild = guild
+        self.roles = [SimpleNamespace(id=0)] + [SimpleNamespace(id=r) for r in roles]   # @everyone en tête
+        self.edits = []
+        self.forbidden = False
+
+    async def add_roles(self, *roles, reason=None):
+        if self.forbidden:
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Permissions")
+        self.edits.append(("add", sorted(r.id for r in roles)))
+        self.roles += list(roles)
+
+    async def remove_roles(self, *roles, reason=None):
+        ids = {r.id for r in roles}
+        self.edits.append(("remove", sorted(ids)))
+        self.roles = [r for r in self.roles if r.id not in ids]
+
+
+class FakeGuild:
+    id = 1
+
+    def __init__(self):
+        self.member = None
+
+    def get_member(self, member_id):
+        return self.member
+
+
+def member_with(roles):
+    guild = FakeGuild()
+    guild.member = FakeMember(guild, roles)
+    return guild.member
+
+
+# ---------- rôles regroupés ----------
+def test_opposite_role_ops_cancel_out():
+    member = member_with([])
+
+    async def scenario():
+        sched = ActionScheduler(role_delay=0.01)
+        sched.set_role(member, SimpleNamespace(id=5), add=True)
+        sched.set_role(member, SimpleNamespace(id=5), add=False)
+        await asyncio.sleep(0.05)
+        await sched.close()
+
+    asyncio.run(scenario())
+    assert member.edits == []
+
+
+def test_role_ops_batched_in_one_call():
+    member = member_with([7])
+
+    async def scenario():
+        sched = ActionScheduler(role_delay=0.01)
+        sched.set_role(member, SimpleNamespace(id=5), add=True)
+        sched.set_role(member, SimpleNamespace(id=6), add=True)
+        sched.set_role(member, SimpleNamespace(id=7), add=False)
+        await sched.close()
+
+    asyncio.run(scenario())
+    assert member.edits == [("add", [5, 6]), ("remove", [7])]
+
+
+def test_only_the_delta_is_sent():
+    member = member_with([7])
+
+    async def scenario():
+        sched = ActionScheduler(role_delay=0.01)
+        sched.set_role(member, SimpleNamespace(id=5), add=True)
+        member.roles.append(SimpleNamespace(id=9))        # ajouté par un admin entre-temps
+        await sched.close()
+
+    asyncio.run(scenario())
+    assert member.edits == [("add", [5])]
+    assert {r.id for r in member.roles} == {0, 5, 7, 9}
+
+
+def test_forbidden_is_reported_in_channel():
+    member = member_with([])
+    member.forbidden = True
+    sent = []
+
+    class Channel:
+        id = 3
+
+        async def send(self, text, delete_after=None):
+            sent.append(text)
+
+    async def scenario():
+        sched = ActionScheduler(role_delay=0.01)
+        sched.set_role(member, SimpleNamespace(id=5), add=True, channel=Channel())
+        await sched.close()
+
+    asyncio.run(scenario())
+    assert sent == ["❌ Erreur perms BOT. Veuillez Contacter @lululufr"]
+
+
+# ---------- files par route ----------
+def test_route_preserves_order_and_results():
+    seen = []
+
+    async def action(i):
+        await asyncio.sleep(0.001 * (3 - i))
+        seen.append(i)
+        return i * 10
+
+    async def scenario():
+        sched = ActionScheduler()
+        futures = [sched.submit("reactions:1", lambda i=i: action(i)) for i in range(3)]
+        return await asyncio.gather(*futures)
+
+    assert asyncio.run(scenario()) == [0, 10, 20]
+    assert seen == [0, 1, 2]
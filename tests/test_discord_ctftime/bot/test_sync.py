@@ -0,0 +1,46 @@
+import asyncio
+
+import discord
+from discord import app_commands
+
+from src.discord_ctftime.bot.sync import sync_if_changed, tree_hash
+
+GUILD = discord.Object(id=1234)
+
+
+def make_tree(description="Ping"):
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+
+    @tree.command(name="ping", description=description)
+    async def ping(interaction: discord.Interaction):
+        pass
+
+    tree.copy_global_to(guild=GUILD)
+    calls = []
+
+    async def fake_sync(*, guild=None):
+        calls.append(guild.id)
+        return []
+
+    tree.sync = fake_sync
+    return tree, calls
+
+
+# ---------- empreinte stable ----------
+def test_hash_changes_with_commands():
+    assert tree_hash(make_tree()[0], GUILD) == tree_hash(make_tree()[0], GUILD)
+    assert tree_hash(make_tree()[0], GUILD) != tree_hash(make_tree("Pong")[0], GUILD)
+
+
+# ---------- sync seulement si changement ----------
+def test_sync_skipped_when_unchanged(tmp_path):
+    path = tmp_path / "tree.sha1"
+    tree, calls = make_tree()
+
+    assert asyncio.run(sync_if_changed(tree, GUILD, path)) is True
+    assert asyncio.run(sync_if_changed(tree, GUILD, path)) is False
+    assert calls == [1234]
+
+    changed, calls = make_tree("Pong")
+    assert asyncio.run(sync_if_changed(changed, GUILD, path)) is True
+    assert calls == [1234]
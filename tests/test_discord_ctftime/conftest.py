@@ -0,0 +1,20 @@
+import pytest
+
+from src.discord_ctftime.event import Engine
+
+
+@pytest.fixture
+def engine_path(tmp_path, monkeypatch):
+    """``Engine`` pointé sur une base jetable (pas encore migrée) ; fermé en fin de test."""
+    path = tmp_path / "events.sqlite"
+    monkeypatch.setattr(Engine, "DB_PATH", path)
+    monkeypatch.setattr(Engine, "_msg_index", {})
+    yield path
+    Engine.close()
+
+
+@pytest.fixture
+def engine_db(engine_path):
+    """Base jetable au schéma courant."""
+    Engine.migrate()
+    return engine_path
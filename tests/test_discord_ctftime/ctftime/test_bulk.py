@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.discord_ctftime.ctftime import bulk
+from src.discord_ctftime.ctftime.bulk import CircuitBreaker, CircuitOpenError, TokenBucket, fetch_one
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge factice : ``asyncio.sleep`` avance le temps au lieu d'attendre."""
+    clock = SimpleNamespace(t=0.0, sleeps=[])
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        clock.sleeps.append(delay)
+        clock.t += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr(bulk, "time", SimpleNamespace(monotonic=lambda: clock.t))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return clock
+
+
+# ---------- limiteur ----------
+def test_bucket_allows_burst_then_refills_at_rate(clock):
+    async def scenario():
+        bucket = TokenBucket(rate=4, capacity=2)
+        for _ in range(4):
+            await bucket.acquire()
+
+    asyncio.run(scenario())
+    # 2 jetons d'avance, puis 1 jeton toutes les 0,25 s
+    assert clock.sleeps == [pytest.approx(0.25), pytest.approx(0.25)]
+    assert clock.t == pytest.approx(0.5)
+
+
+def test_bucket_refuses_more_than_its_capacity(clock):
+    with pytest.raises(ValueError):
+        asyncio.run(TokenBucket(rate=4, capacity=1).acquire(bulk.CALL_COST))
+    assert bulk.bucket.capacity >= bulk.CALL_COST
+
+
+# ---------- disjoncteur ----------
+def test_breaker_open_half_open_closed(clock):
+    breaker = CircuitBreaker(threshold=2, reset_after=10)
+    breaker.failure()
+    assert not breaker.is_open
+    breaker.failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.t += 10                       # semi-ouvert : un essai passe…
+    breaker.check()
+    breaker.failure()                   # …et un échec le rouvre aussitôt
+    assert breaker.is_open
+
+    clock.t += 10
+    breaker.check()
+    breaker.success()                   # refermé : il faut de nouveau *threshold* échecs
+    breaker.failure()
+    assert not breaker.is_open
+
+
+# ---------- nouveaux essais ----------
+@pytest.fixture
+def upstream(monkeypatch, clock):
+    """``CTFtime.fetch`` branché sur un faux ctftime.org (httpx.MockTransport)."""
+    responses = []
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return responses.pop(0)
+
+    async def fetch(self):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            resp = await client.get(f"https://ctftime.org/api/v1/events/{self.ctftime_id}/")
+            resp.raise_for_status()
+            return resp.json()
+
+    monkeypatch.setattr(bulk.CTFtime, "fetch", fetch)
+    monkeypatch.setattr(bulk, "bucket", TokenBucket(rate=100, capacity=100))
+    monkeypatch.setattr(bulk, "breaker", CircuitBreaker(threshold=3, reset_after=60))
+    monkeypatch.setattr(bulk, "random", SimpleNamespace(uniform=lambda low, high: high))
+    return SimpleNamespace(responses=responses, calls=calls)
+
+
+def test_429_honours_retry_after(upstream, clock):
+    upstream.responses += [
+        httpx.Response(429, headers={"Retry-After": "7"}),
+        httpx.Response(200, json={"id": 42}),
+    ]
+    result = asyncio.run(fetch_one(42))
+    assert result.ok and result.event == {"id": 42}
+    assert clock.sleeps == [7.0]
+
+
+def test_5xx_backs_off_exponentially(upstream, clock):
+    upstream.responses += [httpx.Response(503), httpx.Response(502), httpx.Response(200, json={})]
+    assert asyncio.run(fetch_one(42)).ok
+    assert clock.sleeps == [1.0, 2.0]           # BACKOFF_BASE * 2**attempt (jitter au max)
+    assert not bulk.breaker.is_open
+
+
+def test_404_is_not_retried(upstream, clock):
+    upstream.responses += [httpx.Response(404)]
+    result = asyncio.run(fetch_one(42))
+    assert isinstance(result.error, httpx.HTTPStatusError)
+    assert len(upstream.calls) == 1 and clock.sleeps == []
+
+
+def test_repeated_failures_open_the_breaker(upstream, clock):
+    upstream.responses += [httpx.Response(500)] * 4
+    result = asyncio.run(fetch_one(42, retries=3))
+    # 3 échecs : disjoncteur ouvert, le 4e essai est refusé sans appel réseau
+    assert isinstance(result.error, CircuitOpenError)
+    assert len(upstream.calls) == 3
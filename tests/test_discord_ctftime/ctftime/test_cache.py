@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.discord_ctftime.ctftime import cache as cache_module
+from src.discord_ctftime.ctftime.cache import STALE_FOR, TTLS, CachingTransport, ResponseCache
+
+URL = "https://ctftime.org/api/v1/events/42/"
+TTL = TTLS["api_event"]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(t=1_000_000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: now.t))
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    yield cache
+    cache.close()
+
+
+class Upstream:
+    """Faux ctftime.org : compte les appels, répond 304 si l'ETag correspond."""
+
+    def __init__(self):
+        self.requests = []
+        self.version = 1
+        self.fail = False
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.fail:
+            raise httpx.ConnectError("ctftime.org injoignable", request=request)
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"version": self.version}, headers={"ETag": etag})
+
+
+def get(upstream, cache, *urls):
+    async def scenario():
+        transport = CachingTransport(httpx.MockTransport(upstream), cache)
+        async with httpx.AsyncClient(transport=transport) as client:
+            bodies = [(await client.get(url)).json() for url in urls]
+            await asyncio.gather(*transport._tasks)
+        return bodies
+
+    return asyncio.run(scenario())
+
+
+# ---------- fraîcheur ----------
+def test_fresh_entry_is_served_from_disk(clock, cache):
+    upstream = Upstream()
+    assert get(upstream, cache, URL, URL) == [{"version": 1}] * 2
+    assert len(upstream.requests) == 1
+    assert cache.stats["misses"] == 1 and cache.stats["hits"] == 1
+
+
+def test_non_ctftime_urls_bypass_the_cache(clock, cache):
+    upstream = Upstream()
+    get(upstream, cache, "https://example.org/x", "https://example.org/x")
+    assert len(upstream.requests) == 2 and not cache.stats
+
+
+# ---------- expiration / revalidation ----------
+def test_expired_entry_is_revalidated_with_etag(clock, cache):
+    upstream = Upstream()
+    get(upstream, cache, URL)
+    clock.t += TTL + STALE_FOR + 1
+
+    assert get(upstream, cache, URL) == [{"version": 1}]
+    assert upstream.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats["revalidated"] == 1
+    # 304 : la copie redevient fraîche
+    get(upstream, cache, URL)
+    assert len(upstream.requests) == 2
+
+
+def test_stale_entry_is_served_while_revalidating(clock, cache):
+    upstream = Upstream()
+    get(upstream, cache, URL)
+    clock.t += TTL + 1
+    upstream.version = 2
+
+    assert get(upstream, cache, URL) == [{"version": 1}]        # copie périmée tout de suite
+    assert cache.stats["stale_hits"] == 1
+    assert get(upstream, cache, URL) == [{"version": 2}]        # rafraîchie en fond
+
+
+def test_stale_copy_served_when_upstream_is_down(clock, cache):
+    upstream = Upstream()
+    get(upstream, cache, URL)
+    clock.t += TTL + STALE_FOR + 1
+    upstream.fail = True
+
+    assert get(upstream, cache, URL) == [{"version": 1}]
+    assert cache.stats["stale_on_error"] == 1
+
+
+# ---------- éviction ----------
+def test_lru_eviction_keeps_recently_used(clock, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=25)
+    for key in ("a", "b"):
+        cache.put(key, b"x" * 10, {})
+        clock.t += 1
+    cache.get("a")                  # « b » devient le moins récemment utilisé
+    clock.t += 1
+    assert cache.put("c", b"x" * 10, {}) == 1
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.close()
+
+
+def test_evictions_are_counted_by_the_transport(clock, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=20)
+    get(Upstream(), cache, URL, "https://ctftime.org/api/v1/events/43/")
+    assert cache.stats["evictions"] == 1
+    cache.close()
+
+
+def test_cache_is_opened_lazily(tmp_path):
+    ResponseCache(tmp_path / "sub" / "cache.sqlite")
+    assert not (tmp_path / "sub").exists()
@@ -0,0 +1,40 @@
+from src.discord_ctftime.ctftime.extract import extract_attributes
+
+
+def page(*paragraphs: str) -> str:
+    return "<html><body><div class='span10'>" + "".join(paragraphs) + "</div></body></html>"
+
+
+# ---------- en ligne / équipe -------------------------------------------------
+def test_online_team():
+    attrs = extract_attributes(page(
+        "<p>Sat, 04 May 2024, 10:00 UTC &mdash; Sun, 05 May 2024, 10:00 UTC</p>",
+        "<p><b>On-line</b></p>",
+        "<p>Format: Jeopardy</p>",
+        "<p>Official URL: <a href='https://ctf.example'>https://ctf.example</a></p>",
+        "<p>Rating weight: 24.37 </p>",
+    ))
+    assert attrs.online and not attrs.solo
+    assert attrs.format == "Jeopardy"
+    assert attrs.official_url == "https://ctf.example"
+    assert attrs.rating_weight == 24.37
+    assert attrs.location is None
+
+
+# ---------- individuel / présentiel -------------------------------------------
+def test_solo_onsite():
+    attrs = extract_attributes(page(
+        "<p><b>Paris, France</b></p>",
+        "<p><b>This event is limited to individual participation! No global rating points.</b></p>",
+        "<p>Format: Attack-Defense</p>",
+    ))
+    assert attrs.solo and not attrs.online
+    assert attrs.location == "Paris, France"
+    assert attrs.format == "Attack-Defense"
+
+
+# ---------- page vide ---------------------------------------------------------
+def test_page_vide():
+    attrs = extract_attributes("<html></html>")
+    assert not attrs.solo and not attrs.online
+    assert attrs.format is None and attrs.rating_weight is None
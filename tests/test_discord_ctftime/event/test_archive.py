@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.discord_ctftime.event import Engine
+
+NOW = datetime(2030, 6, 1, tzinfo=timezone.utc)
+ALICE, BOB = 111111111111111111, 222222222222222222
+
+
+@pytest.fixture
+def db(engine_db):
+    Engine.new_event(1, 101, "Vieux CTF", "https://ctftime.org/event/1",
+                     NOW - timedelta(days=20), NOW - timedelta(days=19))
+    Engine.new_event(2, 102, "CTF en cours", "https://ctftime.org/event/2",
+                     NOW - timedelta(days=1), NOW + timedelta(days=1))
+    Engine.add_participant(1, ALICE)
+    Engine.add_maybe_participant(1, BOB)
+    Engine.add_participant(2, ALICE)
+
+
+# ---------- cas OK ----------
+def test_archive_moves_ended_events(db):
+    assert Engine.archive_ended(NOW - timedelta(days=7)) == 1
+
+    assert not Engine.existe(1)
+    assert Engine.existe(2)
+    assert Engine.lookup_message(101) is None
+    assert Engine.lookup_message(102) is not None
+
+    with Engine._connection() as conn:
+        archived = conn.execute(f"SELECT * FROM {Engine._TABLE_EVENTS_ARCHIVE}").fetchall()
+        parts = conn.execute(f"SELECT * FROM {Engine._TABLE_PARTICIPANTS_ARCHIVE}").fetchall()
+        maybe = conn.execute(f"SELECT * FROM {Engine._TABLE_MAYBE_ARCHIVE}").fetchall()
+        hot = conn.execute(
+            f"SELECT COUNT(*) FROM {Engine._TABLE_PARTICIPANTS} WHERE ctftime_id = '1'"
+        ).fetchone()[0]
+    assert [r["title"] for r in archived] == ["Vieux CTF"]
+    assert [(r["ctftime_id"], r["user_id"]) for r in parts] == [("1", ALICE)]
+    assert [(r["ctftime_id"], r["user_id"]) for r in maybe] == [("1", BOB)]
+    assert hot == 0
+
+
+def test_groups_to_clean(db):
+    Engine.archive_ended(NOW - timedelta(days=7))
+    assert Engine.groups_to_clean() == [
+        {"ctftime_id": "1", "title": "Vieux CTF", "role_id": None, "channel_id": None}
+    ]
+    Engine.mark_groups_cleaned(["1"])
+    assert Engine.groups_to_clean() == []
+
+
+# ---------- rien à faire ----------
+def test_archive_nothing(db):
+    assert Engine.archive_ended(NOW - timedelta(days=30)) == 0
+    assert Engine.existe(1)
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+from src.discord_ctftime.event import AsyncEngine
+
+
+class Probe:
+    """Faux ``Engine`` : note le thread de chaque appel et le nombre d'appels simultanés."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.max_active = 0
+        self.threads = set()
+
+    def _call(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+
+    def existe(self, identifier):
+        self._call()
+        return True
+
+    def new_event(self, **kwargs):
+        self._call()
+
+    def close(self):
+        pass
+
+
+def run(probe, calls):
+    async def scenario():
+        engine = AsyncEngine(engine=probe, read_workers=4)
+        try:
+            await asyncio.gather(*(calls(engine) for _ in range(4)))
+        finally:
+            engine.close()
+
+    asyncio.run(scenario())
+
+
+# ---------- lectures ----------
+def test_reads_run_concurrently():
+    probe = Probe()
+    run(probe, lambda engine: engine.existe(1))
+    assert probe.max_active > 1
+    assert all(name.startswith("db-read") for name in probe.threads)
+
+
+# ---------- écritures ----------
+def test_writes_are_serialised_on_one_thread():
+    probe = Probe()
+    run(probe, lambda engine: engine.new_event(ctftime_id=1))
+    assert probe.max_active == 1
+    assert len(probe.threads) == 1 and next(iter(probe.threads)).startswith("db-write")
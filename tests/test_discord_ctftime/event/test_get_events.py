@@ -0,0 +1,47 @@
+import pytest
+
+from src.discord_ctftime.event import Engine
+
+ALICE, BOB, CAROL = 111111111111111111, 222222222222222222, 2**62
+
+
+@pytest.fixture
+def db(engine_db):
+    Engine.new_event(1, 101, "Vide", "u", "2099-01-01 10:00", "2099-01-01 20:00")
+    Engine.new_event(2, 102, "Solo", "u", "2099-01-02 10:00", "2099-01-02 20:00")
+    Engine.new_event(3, 103, "A\x1fB", "u\x1fv", "2099-01-03 10:00", "2099-01-03 20:00", "d\x1fe")
+    Engine.add_participant(2, ALICE)
+    Engine.add_maybe_participant(2, BOB)
+    for user in (CAROL, ALICE, BOB):
+        Engine.add_participant(3, user)
+    Engine.add_maybe_participant(3, ALICE)
+    Engine.add_maybe_participant(3, CAROL)
+
+
+# ---------- listes d'inscrits ----------
+def test_zero_one_and_many_participants(db):
+    events = {e["ctftime_id"]: e for e in Engine.get_events(suffix="ORDER BY e.ctftime_id")}
+    assert [(e["participants"], e["maybe_participants"]) for e in events.values()] == [
+        ([], []),
+        ([ALICE], [BOB]),
+        ([ALICE, BOB, CAROL], [ALICE, CAROL]),
+    ]
+
+
+def test_separator_in_text_columns_is_left_alone(db):
+    info = Engine.get_event_info(3)
+    assert (info["title"], info["url"], info["description"]) == ("A\x1fB", "u\x1fv", "d\x1fe")
+    assert info["participants"] == [ALICE, BOB, CAROL]
+
+
+# ---------- get_event_info ----------
+def test_event_info_by_ctftime_id_or_msg_id(db):
+    assert Engine.get_event_info(2) == Engine.get_event_info(102)
+    assert Engine.get_event_info("2")["participants"] == [ALICE]
+    with pytest.raises(KeyError):
+        Engine.get_event_info(404)
+
+
+def test_where_filters_and_keeps_lists(db):
+    events = Engine.get_events("e.title = ?", ("Solo",))
+    assert len(events) == 1 and events[0]["maybe_participants"] == [BOB]
@@ -1,2 +1,15 @@
-from src.discord_ctftime.event import Event
+from src.discord_ctftime.event import Engine
 
+from benchmarks.bench_engine import run_dataset
+
+
+# ---------- la suite de benchmarks reste exécutable ---------------------------
+def test_bench_engine_smoke(tmp_path, monkeypatch):
+    monkeypatch.setattr(Engine, "DB_PATH", tmp_path / "unused.sqlite")
+    results = run_dataset(50, participants=3, ops=5, tmp=tmp_path)
+
+    ops = {r["op"] for r in results}
+    assert {"existe", "add_participant", "get_event_info", "next_event",
+            "calendar_next_30_days", "new_event"} <= ops
+    for r in results:
+        assert r["n"] == 5 and r["ops_per_sec"] > 0 and r["p99_us"] >= r["p50_us"]
@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+from src.discord_ctftime.event.migrations import MIGRATIONS, migrate, schema_version
+from src.discord_ctftime.utils.dates import TZ_PARIS, to_timestamp
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "events.sqlite")
+    yield conn
+    conn.close()
+
+
+def tables(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def columns(conn, table):
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+# ---------- base neuve ----------
+def test_fresh_database_reaches_latest_version(conn):
+    assert migrate(conn) == len(MIGRATIONS)
+    assert schema_version(conn) == len(MIGRATIONS)
+    assert {"events", "participants", "maybe_participants", "upcoming", "rss_seen",
+            "feed_state", "events_archive", "participants_archive"} <= tables(conn)
+    assert {"start_ts", "end_ts", "role_id", "channel_id"} <= columns(conn, "events")
+    assert "user_id" in columns(conn, "participants")
+    # tables par pseudo vides : supprimées, pas de *_legacy à convertir
+    assert not any(t.endswith("_legacy") for t in tables(conn))
+
+
+def test_second_run_is_a_noop(conn):
+    migrate(conn)
+    assert migrate(conn) == 0
+
+
+# ---------- base existante ----------
+def test_baseline_database_is_upgraded(conn):
+    conn.executescript(
+        """
+        CREATE TABLE events (ctftime_id TEXT PRIMARY KEY, msg_id TEXT UNIQUE, title TEXT,
+                             url TEXT, start TEXT, end TEXT, description TEXT);
+        INSERT INTO events VALUES ('1', '101', 'Alpha', 'u', '2099-01-01 10:00', '2099-01-02 10:00', '');
+        """
+    )
+    migrate(conn)
+    start_ts, end_ts = conn.execute("SELECT start_ts, end_ts FROM events").fetchone()
+    assert start_ts == to_timestamp("2099-01-01 10:00", TZ_PARIS)
+    assert end_ts == to_timestamp("2099-01-02 10:00", TZ_PARIS)
+
+
+# ---------- échecs ----------
+def test_failed_migration_is_rolled_back(conn):
+    def broken(c):
+        c.execute("CREATE TABLE half_done (x INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(conn, MIGRATIONS + [broken])
+    assert schema_version(conn) == len(MIGRATIONS)
+    assert "half_done" not in tables(conn)
+
+
+def test_newer_database_is_refused(conn):
+    conn.execute(f"PRAGMA user_version = {len(MIGRATIONS) + 1}")
+    with pytest.raises(RuntimeError):
+        migrate(conn)
+
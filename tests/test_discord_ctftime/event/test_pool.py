@@ -0,0 +1,60 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.discord_ctftime.event.pool import ConnectionPool
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool()
+    yield pool
+    pool.close_all()
+
+
+# ---------- une connexion par thread ----------
+def test_same_thread_reuses_its_connection(pool, tmp_path):
+    db = tmp_path / "a.sqlite"
+    assert pool.get(db) is pool.get(db)
+    assert pool.get(db) is not pool.get(tmp_path / "b.sqlite")
+
+
+def test_each_thread_gets_its_own_connection(pool, tmp_path):
+    db = tmp_path / "a.sqlite"
+    conns = []
+    threads = [threading.Thread(target=lambda: conns.append(pool.get(db))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in conns + [pool.get(db)]}) == 4
+
+
+# ---------- PRAGMAs ----------
+def test_pragmas_are_applied(pool, tmp_path):
+    conn = pool.get(tmp_path / "sub" / "a.sqlite")            # dossier parent créé au besoin
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1     # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert isinstance(conn.execute("SELECT 1 AS x").fetchone(), sqlite3.Row)
+
+
+def test_trace_callback_sees_statements(tmp_path):
+    seen = []
+    pool = ConnectionPool(trace=seen.append)
+    pool.get(tmp_path / "a.sqlite").execute("SELECT 42")
+    pool.close_all()
+    assert "SELECT 42" in seen
+
+
+# ---------- fermeture ----------
+def test_close_all_closes_and_reopens(pool, tmp_path):
+    db = tmp_path / "a.sqlite"
+    first = pool.get(db)
+    pool.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    second = pool.get(db)
+    assert second is not first and second.execute("SELECT 1").fetchone()[0] == 1
@@ -0,0 +1,67 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from src.discord_ctftime.event import Engine
+
+ALICE, BOB = 111111111111111111, 222222222222222222
+
+
+@pytest.fixture
+def legacy_db(engine_path):
+    """Base d'avant le passage aux ids : inscrits stockés par pseudo."""
+    conn = sqlite3.connect(engine_path)
+    conn.executescript(
+        """
+        CREATE TABLE events (ctftime_id TEXT PRIMARY KEY, msg_id TEXT UNIQUE, title TEXT,
+                             url TEXT, start TEXT, end TEXT, description TEXT);
+        CREATE TABLE participants (ctftime_id TEXT, participant TEXT,
+                                   PRIMARY KEY (ctftime_id, participant));
+        CREATE TABLE maybe_participants (ctftime_id TEXT, participant TEXT,
+                                         PRIMARY KEY (ctftime_id, participant));
+        INSERT INTO events VALUES ('1', '101', 'Alpha', 'u', '2099-01-01 10:00', '2099-01-02 10:00', '');
+        INSERT INTO participants VALUES ('1', 'alice'), ('1', 'fantome');
+        INSERT INTO maybe_participants VALUES ('1', 'bob');
+        """
+    )
+    conn.close()
+    Engine.migrate()
+
+
+# ---------- migration ----------
+def test_named_rows_are_set_aside_then_mapped(legacy_db):
+    assert Engine.get_event_info(1)["participants"] == []
+    assert Engine.legacy_names() == {"alice", "bob", "fantome"}
+
+    assert Engine.map_legacy_participants({"alice": ALICE, "bob": BOB}) == 2
+    info = Engine.get_event_info(1)
+    assert info["participants"] == [ALICE]
+    assert info["maybe_participants"] == [BOB]
+    # pseudo inconnu : gardé de côté pour un prochain essai
+    assert Engine.legacy_names() == {"fantome"}
+
+
+# ---------- clé entière ----------
+def test_participants_keyed_by_id(legacy_db):
+    Engine.add_participant(1, ALICE)
+    Engine.add_participant(1, ALICE)
+    Engine.remove_maybe_participant(1, BOB)
+    assert Engine.get_event_info(1)["participants"] == [ALICE]
+    with Engine._connection() as conn:
+        sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'participants'"
+        ).fetchone()[0]
+    assert "WITHOUT ROWID" in sql and "user_id" in sql
+
+
+# ---------- archivage avant conversion ----------
+def test_archiving_keeps_unmapped_legacy_rows(legacy_db):
+    assert Engine.archive_ended(datetime(2100, 1, 1, tzinfo=timezone.utc)) == 1
+    # pas de cascade : les pseudos suivent l'évènement dans l'archive
+    assert Engine.legacy_names() == {"alice", "bob", "fantome"}
+
+    assert Engine.map_legacy_participants({"alice": ALICE}) == 1
+    with Engine._connection() as conn:
+        rows = conn.execute("SELECT ctftime_id, user_id FROM participants_archive").fetchall()
+    assert [tuple(r) for r in rows] == [("1", ALICE)]
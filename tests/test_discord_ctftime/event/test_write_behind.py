@@ -0,0 +1,121 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.discord_ctftime.event import AsyncEngine, Engine
+from src.discord_ctftime.event.write_behind import ParticipantWriteBehind
+
+START = datetime(2099, 1, 1, tzinfo=timezone.utc)
+ALICE, BOB = 111111111111111111, 222222222222222222
+
+
+@pytest.fixture
+def db(engine_db):
+    Engine.new_event(1, 101, "Alpha", "u", START, START + timedelta(days=1))
+
+
+# ---------- regroupement ----------
+def test_last_operation_wins():
+    batches = []
+
+    async def apply(changes):
+        batches.append(sorted(changes))
+
+    async def scenario():
+        wb = ParticipantWriteBehind(apply, delay=0.01)
+        wb.enqueue("1", ALICE, maybe=False, add=True)
+        wb.enqueue("1", ALICE, maybe=False, add=False)
+        wb.enqueue("1", BOB, maybe=True, add=True)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert batches == [[(False, "1", ALICE, False), (True, "1", BOB, True)]]
+
+
+# ---------- lecture de ses propres écritures / arrêt ----------
+def test_reads_see_pending_writes(db):
+    async def scenario():
+        engine = AsyncEngine(flush_delay=60)
+        engine.toggle_participant(101, ALICE, maybe=False, add=True)
+        return await engine.get_event_info(1)
+
+    assert asyncio.run(scenario())["participants"] == [ALICE]
+
+
+def test_reads_wait_for_a_flush_in_progress(db, monkeypatch):
+    apply = Engine.apply_participant_changes
+
+    def slow_apply(changes):
+        time.sleep(0.1)
+        return apply(changes)
+
+    monkeypatch.setattr(Engine, "apply_participant_changes", slow_apply)
+
+    async def scenario():
+        engine = AsyncEngine(flush_delay=0.01)
+        engine.toggle_participant(101, ALICE, maybe=False, add=True)
+        await asyncio.sleep(0.05)                   # flush du minuteur en plein écriture
+        assert len(engine._pending) == 0
+        return await engine.get_event_info(1)
+
+    assert asyncio.run(scenario())["participants"] == [ALICE]
+
+
+def test_flush_on_shutdown_writes_pending(db):
+    async def scenario():
+        engine = AsyncEngine(flush_delay=60)
+        engine.toggle_participant(101, BOB, maybe=True, add=True)
+        await engine.flush()
+
+    asyncio.run(scenario())
+    assert Engine.get_event_info(1)["maybe_participants"] == [BOB]
+
+
+# ---------- échecs ----------
+def test_missing_event_does_not_jam_the_queue(db):
+    async def scenario():
+        engine = AsyncEngine(flush_delay=60)
+        engine.toggle_participant(101, ALICE, maybe=False, add=True)
+        engine._pending.enqueue("999", BOB, maybe=False, add=True)    # évènement disparu
+        first = await engine.get_event_info(1)
+        assert len(engine._pending) == 0
+        return first, await engine.existe(1)
+
+    info, still_reads = asyncio.run(scenario())
+    assert info["participants"] == [ALICE] and still_reads
+
+
+def test_transient_error_requeues_and_retries():
+    attempts = []
+
+    async def apply(changes):
+        attempts.append(changes)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+
+    async def scenario():
+        wb = ParticipantWriteBehind(apply, delay=0.01)
+        wb.enqueue("1", ALICE, maybe=False, add=True)
+        await wb.flush()
+        assert len(wb) == 1                         # remis en file, sans lever
+        await asyncio.sleep(0.05)                   # nouvel essai programmé
+        return len(wb)
+
+    assert asyncio.run(scenario()) == 0
+    assert len(attempts) == 2
+
+
+def test_permanent_error_drops_batch():
+    async def apply(changes):
+        raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+
+    async def scenario():
+        wb = ParticipantWriteBehind(apply, delay=60)
+        wb.enqueue("1", ALICE, maybe=False, add=True)
+        await wb.flush()
+        return len(wb)
+
+    assert asyncio.run(scenario()) == 0
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.metrics import ENGINE_LATENCY, ENGINE_QUERIES, Counter, Histogram, render
+from src.discord_ctftime.metrics.metrics import REGISTRY
+
+
+@pytest.fixture
+def local_metrics():
+    # métriques jetables : retirées du registre global en fin de test
+    before = list(REGISTRY)
+    yield
+    REGISTRY[:] = before
+
+
+# ---------- format Prometheus ----------
+def test_histogram_render(local_metrics):
+    hist = Histogram("test_duration_seconds", "Durée de test.", buckets=(0.1, 1.0))
+    hist.observe(0.05, op="a")
+    hist.observe(0.5, op="a")
+    hist.observe(5.0, op="a")
+
+    text = render()
+    assert "# TYPE test_duration_seconds histogram" in text
+    assert 'test_duration_seconds_bucket{op="a",le="0.1"} 1' in text
+    assert 'test_duration_seconds_bucket{op="a",le="1.0"} 2' in text
+    assert 'test_duration_seconds_bucket{op="a",le="+Inf"} 3' in text
+    assert 'test_duration_seconds_count{op="a"} 3' in text
+
+
+def test_histogram_quantile(local_metrics):
+    hist = Histogram("test_q_seconds", "Quantiles.", buckets=(0.1, 1.0))
+    assert hist.quantile(0.5, op="a") is None
+    for _ in range(9):
+        hist.observe(0.01, op="a")
+    hist.observe(0.5, op="a")
+    assert hist.quantile(0.5, op="a") == 0.1
+    assert hist.quantile(1.0, op="a") == 1.0
+
+
+def test_counter_labels(local_metrics):
+    counter = Counter("test_total", "Compteur.")
+    counter.inc(route="/a")
+    counter.inc(2, route="/a")
+    assert 'test_total{route="/a"} 3.0' in render()
+
+
+# ---------- instrumentation Engine ----------
+def test_engine_calls_are_counted(engine_db):
+    engine = AsyncEngine()
+
+    def queries():
+        return ENGINE_QUERIES.values.get((("method", "existe"),), 0)
+
+    async def scenario():
+        await engine.existe(123)
+        before = queries()
+        await engine.existe(123)
+        return queries() - before
+
+    try:
+        assert asyncio.run(scenario()) >= 1
+        assert any(labels == {"method": "existe"} for labels, _, _ in ENGINE_LATENCY.snapshot())
+    finally:
+        engine.close()
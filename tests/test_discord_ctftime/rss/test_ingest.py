@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.discord_ctftime.ctftime import http
+from src.discord_ctftime.event import AsyncEngine
+from src.discord_ctftime.rss import RSSException, poll_feed
+from src.discord_ctftime.rss.rss import parse_feed
+
+FEED_URL = "https://ctftime.org/event/list/upcoming/rss/"
+
+FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>CTFtime upcoming</title>
+<item>
+  <title>Alpha CTF 2099</title>
+  <link>https://ctftime.org/event/9001/</link>
+  <guid>https://ctftime.org/event/9001/</guid>
+  <start_date>20990104T100000</start_date>
+  <finish_date>20990105T100000</finish_date>
+  <format_text>Jeopardy</format_text>
+  <weight>24.50</weight>
+  <onsite>False</onsite>
+</item>
+<item>
+  <title>Beta CTF 2099</title>
+  <link>https://ctftime.org/event/9002/</link>
+  <guid>https://ctftime.org/event/9002/</guid>
+  <start_date>20990201T090000</start_date>
+  <finish_date>20990202T090000</finish_date>
+  <format_text>Attack-Defense</format_text>
+  <weight>0</weight>
+  <onsite>True</onsite>
+</item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def engine(engine_db):
+    return AsyncEngine()
+
+
+def serve(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http, "_client", client)
+    return client
+
+
+# ---------- ingestion + GET conditionnel --------------------------------------
+def test_poll_ingests_then_revalidates(engine, monkeypatch):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"etag": '"v1"'}, content=FEED)
+
+    serve(monkeypatch, handler)
+
+    async def scenario():
+        first = await poll_feed(FEED_URL, engine)
+        second = await poll_feed(FEED_URL, engine)
+        return first, second, await engine.upcoming(limit=10)
+
+    first, second, upcoming = asyncio.run(scenario())
+    assert (first, second) == (2, 0)
+    assert seen_headers == [None, '"v1"']
+    assert [ev["ctftime_id"] for ev in upcoming] == ["9001", "9002"]
+    assert upcoming[1]["onsite"] == 1 and upcoming[1]["format"] == "Attack-Defense"
+
+
+# ---------- entrées déjà vues -------------------------------------------------
+def test_seen_entries_are_skipped(engine, monkeypatch):
+    serve(monkeypatch, lambda request: httpx.Response(200, content=FEED))
+
+    async def scenario():
+        return await poll_feed(FEED_URL, engine), await poll_feed(FEED_URL, engine)
+
+    assert asyncio.run(scenario()) == (2, 0)
+
+
+# ---------- erreurs -----------------------------------------------------------
+def test_http_error(engine, monkeypatch):
+    serve(monkeypatch, lambda request: httpx.Response(500))
+    with pytest.raises(RSSException):
+        asyncio.run(poll_feed(FEED_URL, engine))
+
+
+def test_xml_invalide():
+    with pytest.raises(RSSException):
+        parse_feed(b"<rss><channel><item>")
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.discord_ctftime.utils.dates import _parse_cached, parse_datetime, to_timestamp
+
+UTC_10H = datetime(2025, 1, 4, 10, 0, tzinfo=timezone.utc)
+
+
+# ---------- formats CTFtime exacts --------------------------------------------
+@pytest.mark.parametrize("raw", [
+    "2025-01-04T10:00:00+00:00",      # API JSON
+    "2025-01-04 10:00:00+00:00",      # str(datetime) stocké en base
+    "20250104T100000",                # flux RSS (UTC)
+    "Sat, 04 Jan. 2025, 10:00 UTC",   # page évènement
+])
+def test_formats_connus(raw):
+    assert parse_datetime(raw) == UTC_10H
+
+
+def test_iso_pas_inverse():
+    # dayfirst ne doit pas s'appliquer aux dates ISO (02-03 = 3 février)
+    assert parse_datetime("2031-02-03 10:00:00+00:00").month == 2
+
+
+def test_fuseau_par_defaut():
+    dt = parse_datetime("04/01/2025 10:00")
+    assert dt.tzinfo == ZoneInfo("Europe/Paris") and dt.hour == 10
+
+
+# ---------- repli dateutil ----------------------------------------------------
+def test_ampm_fuzzy():
+    dt = parse_datetime("January 4, 2025 at 10 p.m.", ZoneInfo("UTC"))
+    assert (dt.day, dt.hour) == (4, 22)
+
+
+# ---------- valeurs vides / inconnues -----------------------------------------
+@pytest.mark.parametrize("raw", [None, "", "à venir", "n'importe quoi"])
+def test_inconnu(raw):
+    assert parse_datetime(raw) is None
+    assert to_timestamp(raw) is None
+
+
+# ---------- mémoïsation -------------------------------------------------------
+def test_cache():
+    _parse_cached.cache_clear()
+    parse_datetime("20250104T100000")
+    parse_datetime("20250104T100000")
+    assert _parse_cached.cache_info().hits == 1